@@ -0,0 +1,49 @@
+"""
+Helpers shared by the benchmark scripts of this directory, which run against
+the models of ``graphene_django.tests`` in an in-memory SQLite database:
+
+    python benchmarks/<script>.py
+"""
+import os
+import sys
+import timeit
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_django(**settings):
+    """ Configure Django from ``django_test_settings`` with an in-memory
+        database and create the tables of the test models
+    """
+    sys.path.insert(0, ROOT_PATH)
+    import django
+    from django.conf import settings as django_settings
+    from django.core.management import call_command
+
+    import django_test_settings
+
+    options = {
+        name: getattr(django_test_settings, name)
+        for name in dir(django_test_settings)
+        if name.isupper()
+    }
+    options["DATABASES"] = {
+        "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+    }
+    options.update(settings)
+    django_settings.configure(**options)
+    django.setup()
+    call_command("migrate", run_syncdb=True, verbosity=0)
+
+
+def best_of(function, repeat=5, number=1):
+    """ Best wall time of ``function`` in milliseconds """
+    return min(timeit.repeat(function, repeat=repeat, number=number)) / number * 1000
+
+
+def print_table(headers, rows):
+    widths = [
+        max(len(str(value)) for value in column) for column in zip(headers, *rows)
+    ]
+    for row in [headers] + rows:
+        print("  ".join(str(value).rjust(width) for value, width in zip(row, widths)))
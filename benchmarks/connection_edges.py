@@ -0,0 +1,102 @@
+"""
+Building the edges of a 1000 pet connection with:
+
+- ``relay``: ``graphql_relay``'s ``connection_from_list_slice``, a graphene
+  ``Edge`` and a base64 cursor per row
+- ``slots``: ``graphene_django.utils.connection``, ``SlotEdge`` edges whose
+  cursors are only encoded when read
+
+for the connection alone, and for a whole query with and without the
+cursors selected.
+"""
+from common import best_of, print_table, setup_django
+
+PETS = 1000
+
+
+def main():
+    setup_django()
+    import graphene
+    from graphene.relay import Connection, Node, PageInfo
+    from graphql_relay.connection import arrayconnection
+
+    from graphene_django import DjangoConnectionField, DjangoObjectType
+    from graphene_django import fields
+    from graphene_django.settings import graphene_settings
+    from graphene_django.tests.models import Pet
+    from graphene_django.utils import connection as slot_connection
+
+    graphene_settings.RELAY_CONNECTION_MAX_LIMIT = None
+    Pet.objects.bulk_create(Pet(name="pet {}".format(i), age=i % 20) for i in range(PETS))
+
+    class PetPermission(object):
+        def viewable(self, user, info=None):
+            return Pet.objects.all()
+
+    class PetNode(DjangoObjectType):
+        class Meta:
+            model = Pet
+            interfaces = (Node,)
+            permission_class = PetPermission
+            filter_fields = ["name"]
+
+    class PetConnection(Connection):
+        class Meta:
+            node = PetNode
+
+    class PetType(DjangoObjectType):
+        class Meta:
+            model = Pet
+            permission_class = PetPermission
+            filter_fields = ["name"]
+            connection = PetConnection
+            skip_registry = True
+
+    class Query(graphene.ObjectType):
+        pets = DjangoConnectionField(PetType)
+
+    schema = graphene.Schema(query=Query)
+    pets = list(Pet.objects.all())
+    builders = {
+        "relay": arrayconnection.connection_from_list_slice,
+        "slots": slot_connection.connection_from_list_slice,
+    }
+
+    def build(builder):
+        return builder(
+            pets,
+            {"first": PETS},
+            connection_type=PetConnection,
+            edge_type=PetConnection.Edge,
+            pageinfo_type=PageInfo,
+            list_length=PETS,
+        )
+
+    def execute(builder, cursors):
+        fields.connection_from_list_slice = builder
+        result = schema.execute(
+            "query { pets(first: %d) { edges { %s node { name } } } }"
+            % (PETS, "cursor" if cursors else "")
+        )
+        assert not result.errors, result.errors
+        return result
+
+    rows = [
+        ["connection"] + [
+            "{:.2f}".format(best_of(lambda: build(builder), repeat=20))
+            for builder in builders.values()
+        ],
+        ["query"] + [
+            "{:.1f}".format(best_of(lambda: execute(builder, False), repeat=10))
+            for builder in builders.values()
+        ],
+        ["query with cursors"] + [
+            "{:.1f}".format(best_of(lambda: execute(builder, True), repeat=10))
+            for builder in builders.values()
+        ],
+    ]
+    print_table(["{} edges".format(PETS), "relay (ms)", "slots (ms)"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Requesting the ``last`` 10 and 1000 pets of a connection over a table of
+10M rows (or the number given on the command line), through the same schema
+with:
+
+- ``offset``: the path of ``resolve_connection``, counting the table and
+  slicing from ``count - last``
+- ``reverse``: the last page path, a ``LIMIT last + 1`` in reverse order
+
+without cursors selected, then with them, which makes the reverse path count
+the table as well since the cursors are offsets from its start.
+"""
+import sys
+
+from common import best_of, print_table, setup_django
+
+ROWS = 10 ** 7
+SIZES = (10, 1000)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    setup_django()
+    import graphene
+    from django.db import connection
+    from graphene.relay import Connection, Node
+
+    from graphene_django import DjangoConnectionField, DjangoObjectType
+    from graphene_django.settings import graphene_settings
+    from graphene_django.tests.models import Pet
+
+    graphene_settings.RELAY_CONNECTION_MAX_LIMIT = None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "WITH RECURSIVE numbers(n) AS "
+            "(SELECT 1 UNION ALL SELECT n + 1 FROM numbers WHERE n < %s) "
+            "INSERT INTO {} (name, age) SELECT 'pet ' || n, n % 20 FROM numbers".format(
+                Pet._meta.db_table
+            ),
+            [rows],
+        )
+
+    class PetPermission(object):
+        def viewable(self, user, info=None):
+            return Pet.objects.all()
+
+    class PetNode(DjangoObjectType):
+        class Meta:
+            model = Pet
+            interfaces = (Node,)
+            permission_class = PetPermission
+            filter_fields = ["name"]
+
+    class PetConnection(Connection):
+        class Meta:
+            node = PetNode
+
+    class PetType(DjangoObjectType):
+        class Meta:
+            model = Pet
+            permission_class = PetPermission
+            filter_fields = ["name"]
+            connection = PetConnection
+            skip_registry = True
+
+    class Query(graphene.ObjectType):
+        pets = DjangoConnectionField(PetType)
+
+        def resolve_pets(self, info, **args):
+            # Only ordered querysets are fetched in reverse
+            return Pet.objects.order_by("pk")
+
+    schema = graphene.Schema(query=Query)
+    is_last_page = DjangoConnectionField.is_last_page
+
+    def run_query(last, cursors, reverse):
+        # Without the reverse path, resolve_connection counts and slices
+        DjangoConnectionField.is_last_page = (
+            is_last_page if reverse else classmethod(lambda cls, args: False)
+        )
+        query = "query { pets(last: %d) { pageInfo { hasPreviousPage } edges { %s node { name } } } }"
+        result = schema.execute(query % (last, "cursor" if cursors else ""))
+        assert not result.errors, result.errors
+        return result
+
+    table = []
+    for last in SIZES:
+        row = [last]
+        for cursors in (False, True):
+            for reverse in (False, True):
+                row.append(
+                    "{:.1f}".format(
+                        best_of(lambda: run_query(last, cursors, reverse), repeat=3)
+                    )
+                )
+        table.append(row)
+    DjangoConnectionField.is_last_page = is_last_page
+    print("{} rows".format(rows))
+    print_table(
+        [
+            "last",
+            "offset (ms)",
+            "reverse (ms)",
+            "offset + cursors (ms)",
+            "reverse + cursors (ms)",
+        ],
+        table,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Filtering a to-many relation by 10, 1k and 50k IDs with:
+
+- ``or``: one ``OR``-ed predicate per ID, what ``MultipleChoiceFilter`` does.
+  SQLite rejects it from 1k IDs on ("Expression tree is too large") and
+  building it for 50k takes minutes, so it is skipped above ``OR_MAX_SIZE``
+- ``in``: a plain ``IN (...)`` of bind parameters
+- ``expanded``: a single parameter expanded with ``json_each``, what
+  ``GlobalIDMultipleChoiceFilter`` sends above ``ID_LIST_FILTER_THRESHOLD``
+"""
+from common import best_of, print_table, setup_django
+
+SIZES = (10, 1000, 50000)
+OR_MAX_SIZE = 1000
+REPORTERS = 5000
+
+
+def main():
+    setup_django()
+    from django_filters import MultipleChoiceFilter
+
+    from graphene_django.filter.filterset import custom_filterset_factory
+    from graphene_django.settings import graphene_settings
+    from graphene_django.tests.models import Reporter
+
+    Reporter.objects.bulk_create(
+        Reporter(first_name=str(i), last_name="", email="") for i in range(REPORTERS)
+    )
+    pks = list(Reporter.objects.values_list("pk", flat=True))
+    Through = Reporter.pets.through
+    Through.objects.bulk_create(
+        Through(from_reporter_id=pk, to_reporter_id=pks[(i + 1) % len(pks)])
+        for i, pk in enumerate(pks)
+    )
+
+    filterset_class = custom_filterset_factory(Reporter, fields=["pets"])
+    pets_filter = filterset_class.base_filters["pets"]
+
+    def run(ids, strategy):
+        qs = Reporter.objects.all()
+        if strategy == "or":
+            qs = MultipleChoiceFilter.filter(pets_filter, qs, ids)
+        else:
+            graphene_settings.ID_LIST_FILTER_THRESHOLD = (
+                None if strategy == "in" else 1
+            )
+            qs = pets_filter.filter(qs, ids)
+        return len(qs)
+
+    rows = []
+    for size in SIZES:
+        # Half of the IDs match, the other half do not exist
+        ids = [str(pk) for pk in pks[: size // 2]]
+        ids += [str(10 ** 7 + i) for i in range(size - len(ids))]
+        row = [size]
+        for strategy in ("or", "in", "expanded"):
+            if strategy == "or" and size > OR_MAX_SIZE:
+                row.append("-")
+                continue
+            try:
+                row.append("{:.1f}".format(best_of(lambda: run(ids, strategy), repeat=3)))
+            except Exception as error:  # e.g. too many SQL variables
+                row.append(type(error).__name__)
+        rows.append(row)
+    print_table(["ids", "or (ms)", "in (ms)", "expanded (ms)"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Peak memory, measured with ``tracemalloc``, and time of a query listing
+200k pets (or the number given on the command line) through a
+``DjangoListField``:
+
+- ``whole``: the queryset loaded into its result cache at once
+- ``chunk_size=N``: the rows streamed with ``.iterator(chunk_size=N)``
+
+The serialized result is part of the peak in both cases, only the model
+instances held at once differ. The times include the overhead of tracing.
+"""
+import sys
+import time
+import tracemalloc
+
+from common import print_table, setup_django
+
+ROWS = 200000
+CHUNK_SIZES = (None, 100, 2000)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    setup_django()
+    import graphene
+
+    from graphene_django import DjangoListField, DjangoObjectType
+    from graphene_django.tests.models import Pet
+
+    Pet.objects.bulk_create(
+        (Pet(name="pet {}".format(i), age=i % 20) for i in range(rows)), batch_size=10000
+    )
+
+    class PetPermission(object):
+        def viewable(self, user, info=None):
+            return Pet.objects.all()
+
+    class PetType(DjangoObjectType):
+        class Meta:
+            model = Pet
+            permission_class = PetPermission
+            filter_fields = ["name"]
+
+    fields = {}
+    for chunk_size in CHUNK_SIZES:
+        fields["pets_{}".format(chunk_size or "whole")] = DjangoListField(
+            PetType, chunk_size=chunk_size
+        )
+    schema = graphene.Schema(query=type("Query", (graphene.ObjectType,), fields))
+
+    table = []
+    for chunk_size in CHUNK_SIZES:
+        name = "pets{}".format(chunk_size or "Whole")
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = schema.execute("query { %s { id name age } }" % name)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert not result.errors, result.errors
+        assert len(result.data[name]) == rows
+        del result
+        table.append(
+            [
+                "chunk_size={}".format(chunk_size) if chunk_size else "whole",
+                "{:.1f}".format(peak / 2 ** 20),
+                "{:.0f}".format(elapsed * 1000),
+            ]
+        )
+    print("{} rows".format(rows))
+    print_table(["list", "peak (MiB)", "time (ms)"], table)
+
+
+if __name__ == "__main__":
+    main()
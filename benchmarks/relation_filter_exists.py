@@ -0,0 +1,55 @@
+"""
+Counting and paging films filtered by their reporters when every film has
+1000 reporters (a 1:1000 many-to-many fan-out), with:
+
+- ``join``: a JOIN on the relation and ``DISTINCT``, the default
+- ``exists``: a correlated ``EXISTS`` subquery (``RELATION_FILTER_EXISTS``)
+"""
+from common import best_of, print_table, setup_django
+
+FILMS = 200
+FAN_OUT = 1000
+PAGE = 20
+
+
+def main():
+    setup_django()
+    from graphene_django.filter.filterset import custom_filterset_factory
+    from graphene_django.settings import graphene_settings
+    from graphene_django.tests.models import Film, Reporter
+
+    Reporter.objects.bulk_create(
+        Reporter(first_name=str(i), last_name="", email="") for i in range(FAN_OUT)
+    )
+    Film.objects.bulk_create(Film() for _ in range(FILMS))
+    reporter_pks = list(Reporter.objects.values_list("pk", flat=True))
+    Through = Film.reporters.through
+    Through.objects.bulk_create(
+        Through(film_id=film_pk, reporter_id=reporter_pk)
+        for film_pk in Film.objects.values_list("pk", flat=True)
+        for reporter_pk in reporter_pks
+    )
+
+    filterset_class = custom_filterset_factory(Film, fields=["reporters"])
+
+    def get_queryset(ids, strategy):
+        graphene_settings.RELATION_FILTER_EXISTS = strategy == "exists"
+        filterset = filterset_class(
+            data={"reporters": ids}, queryset=Film.objects.order_by("pk")
+        )
+        return filterset.qs
+
+    rows = []
+    for size in (1, 10, 100):
+        ids = [str(pk) for pk in reporter_pks[:size]]
+        for strategy in ("join", "exists"):
+            count = best_of(lambda: get_queryset(ids, strategy).count())
+            page = best_of(lambda: list(get_queryset(ids, strategy)[:PAGE]))
+            rows.append(
+                [size, strategy, "{:.1f}".format(count), "{:.1f}".format(page)]
+            )
+    print_table(["reporter ids", "strategy", "count (ms)", "page (ms)"], rows)
+
+
+if __name__ == "__main__":
+    main()
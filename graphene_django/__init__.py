@@ -3,6 +3,8 @@ from .types import DjangoObjectType
 
 __version__ = "2.12.1"
 
+default_app_config = "graphene_django.apps.GrapheneDjangoConfig"
+
 __all__ = [
     "__version__",
     "DjangoObjectType",
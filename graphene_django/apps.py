@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class GrapheneDjangoConfig(AppConfig):
+    name = "graphene_django"
+    verbose_name = "Graphene Django"
+
+    def ready(self):
+        from django.core import checks
+
+        from .checks import check_order_fields_indexes
+
+        checks.register(check_order_fields_indexes, checks.Tags.models)
@@ -0,0 +1,59 @@
+from django.core import checks
+
+from .registry import get_global_registry
+from .settings import graphene_settings
+
+
+def has_leading_index(model, name):
+    """ Whether an index declared on ``model`` starts with the field ``name`` """
+    opts = model._meta
+    field = opts.get_field(name)
+    if field.primary_key or field.unique or field.db_index:
+        return True
+    leading = [fields[0] for fields in list(opts.unique_together) + list(opts.index_together)]
+    leading += [index.fields[0].lstrip("-") for index in opts.indexes if index.fields]
+    return name in leading
+
+
+def check_order_fields_indexes(app_configs=None, **kwargs):
+    """ Warn about ``order_fields`` the database has to sort without an index """
+    try:
+        # The types are registered while the schema module is imported
+        graphene_settings.SCHEMA
+    except Exception as e:
+        # Left to the schema's own users to fail, migrate has to run anyway
+        return [
+            checks.Warning(
+                "The order_fields indexes were not checked, the schema could "
+                "not be imported: {}".format(e),
+                hint="Fix the GRAPHENE['SCHEMA'] module, or run the check once "
+                "the database it reads at import time is migrated.",
+                id="graphene_django.W002",
+            )
+        ]
+    errors = []
+    registry = get_global_registry()
+    for model, _type in registry._registry.items():
+        if app_configs is not None and model._meta.app_config not in app_configs:
+            continue
+        for name in getattr(_type._meta, "order_fields", None) or ():
+            try:
+                field = model._meta.get_field(name)
+            except Exception:
+                continue
+            if not field.concrete or has_leading_index(model, field.name):
+                continue
+            errors.append(
+                checks.Warning(
+                    "`{}` can be ordered by `{}`, which no index of {} starts "
+                    "with.".format(_type.__name__, name, model._meta.label),
+                    hint=(
+                        "Add db_index=True or an index starting with `{}` to the "
+                        "model, the graphene_filter_indexes command reports the "
+                        "indexes the sampled queries miss."
+                    ).format(name),
+                    obj=_type,
+                    id="graphene_django.W001",
+                )
+            )
+    return errors
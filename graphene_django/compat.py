@@ -1,3 +1,8 @@
+import sqlite3
+from contextlib import closing
+from functools import lru_cache
+
+
 class MissingType(object):
     pass
 
@@ -13,3 +18,29 @@ try:
     )
 except ImportError:
     ArrayField, HStoreField, JSONField, RangeField = (MissingType,) * 4
+
+try:
+    # Window functions are only available from Django 2.0
+    from django.db.models import Window
+    from django.db.models.functions import RowNumber
+except ImportError:
+    Window = RowNumber = None
+
+
+def supports_window_functions(connection):
+    return Window is not None and getattr(
+        connection.features, "supports_over_clause", False
+    )
+
+
+@lru_cache(maxsize=None)
+def sqlite_has_json1():
+    """ Whether the SQLite library was built with the JSON1 functions, which
+        Django before 3.1 does not tell
+    """
+    with closing(sqlite3.connect(":memory:")) as connection:
+        try:
+            connection.execute("SELECT json('[]')")
+        except sqlite3.OperationalError:
+            return False
+    return True
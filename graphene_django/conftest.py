@@ -1,4 +1,5 @@
 import pytest
+from django.db import connection
 
 from graphene_django.settings import graphene_settings as gsettings
 
@@ -16,3 +17,17 @@ def graphene_settings():
     settings = dict(gsettings.__dict__)
     yield gsettings
     gsettings.__dict__ = settings
+
+
+@pytest.fixture()
+def commit():
+    """ Run the ``transaction.on_commit`` callbacks of the test transaction,
+        which is never committed
+    """
+
+    def run_on_commit():
+        while connection.run_on_commit:
+            callback = connection.run_on_commit.pop(0)
+            callback[1]()
+
+    return run_on_commit
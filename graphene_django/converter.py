@@ -205,6 +205,8 @@ def convert_onetoone_field_to_djangomodel(field, registry=None):
 @convert_django_field.register(models.ManyToOneRel)
 def convert_field_to_list_or_connection(field, registry=None):
     model = field.related_model
+    # The schema and the queryset optimizer must resolve to the same field
+    inner_list_fields = {}
 
     def dynamic_type():
         _type = registry.get_type_for_model(model)
@@ -215,7 +217,9 @@ def convert_field_to_list_or_connection(field, registry=None):
         #     return _type.django_filter_field
 
         # return DjangoListField(_type)
-        return DjangoInnerListField(_type, inner_field=field)
+        if _type not in inner_list_fields:
+            inner_list_fields[_type] = DjangoInnerListField(_type, inner_field=field)
+        return inner_list_fields[_type]
         
         # conflicted code:
                     # description = (
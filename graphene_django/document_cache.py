@@ -0,0 +1,123 @@
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+from functools import partial
+
+from graphql.backend.base import GraphQLDocument
+from graphql.backend.core import GraphQLCoreBackend
+from graphql.error import GraphQLError
+from graphql.execution import ExecutionResult
+from graphql.validation import validate
+
+from .settings import graphene_settings
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+_document_cache = None
+
+
+def return_validation_errors(errors, *args, **kwargs):
+    return ExecutionResult(errors=errors, invalid=True)
+
+
+def copy_error(error):
+    """ A fresh instance of a cached error to raise, raising the cached one
+        again would keep the frames of every request raising it
+    """
+    if isinstance(error, GraphQLError):
+        return GraphQLError(
+            error.message,
+            source=error.source,
+            positions=error.positions,
+            extensions=error.extensions,
+        )
+    return error.with_traceback(None)
+
+
+class DocumentCache(object):
+    """ LRU cache of the documents parsed and validated from query strings,
+        keyed by backend, schema and a hash of the query.
+
+    Queries failing to parse keep raising an equal error and queries failing
+    validation keep returning the same errors, without being parsed and
+    validated again. Documents of ``GraphQLCoreBackend`` are executed
+    without being validated again, the documents of other backends only skip
+    the parsing.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_key(self, backend, schema, query):
+        digest = hashlib.sha256(query.encode("utf-8")).hexdigest()
+        return backend, schema, digest
+
+    def get_document(self, backend, schema, query):
+        key = self.get_key(backend, schema, query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if entry is None:
+            entry = self.load(backend, schema, query)
+            with self._lock:
+                self._entries[key] = entry
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+        document, error = entry
+        if error is not None:
+            raise copy_error(error)
+        return document
+
+    def load(self, backend, schema, query):
+        """ The ``(document, error)`` pair to cache for ``query`` """
+        try:
+            document = backend.document_from_string(schema, query)
+        except Exception as error:
+            return None, error.with_traceback(None)
+
+        errors = validate(schema, document.document_ast)
+        if errors:
+            execute = partial(return_validation_errors, errors)
+        elif isinstance(backend, GraphQLCoreBackend):
+            execute = partial(document.execute, validate=False)
+        else:
+            return document, None
+        return (
+            GraphQLDocument(
+                schema=document.schema,
+                document_string=document.document_string,
+                document_ast=document.document_ast,
+                execute=execute,
+            ),
+            None,
+        )
+
+    def cache_info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+def get_document_cache():
+    """ The document cache shared by the views, None when disabled """
+    global _document_cache
+    maxsize = graphene_settings.DOCUMENT_CACHE_SIZE
+    if not maxsize:
+        return None
+    if _document_cache is None or _document_cache.maxsize != maxsize:
+        _document_cache = DocumentCache(maxsize)
+    return _document_cache
@@ -0,0 +1,45 @@
+from graphql.error import GraphQLError
+
+EXPORT_WINDOW_ATTR = "_graphene_export_window"
+
+
+class ExportWindow(object):
+    """ The chunk of rows a ``DjangoFilterField`` returns while its result is
+        exported by ``GraphQLExportView``: ``chunk_size`` rows after
+        ``cursor``, whatever the requested page
+    """
+
+    def __init__(self, chunk_size):
+        self.chunk_size = chunk_size
+        self.cursor = None
+        self.page = None
+        self.cursor_aliases = ()
+
+    def set_page(self, page, cursor_aliases):
+        self.page = page
+        self.cursor_aliases = cursor_aliases
+
+    def advance(self):
+        """ Move past the rows of the last chunk, False when it was the last
+            one. Raises a ``GraphQLError`` rather than fetching the same chunk
+            again when its last row has the cursor of the previous one.
+        """
+        from .filter.cursor import encode_cursor
+
+        page, self.page = self.page, None
+        if page is None or not page.has_next_page or not page.rows:
+            return False
+        cursor = encode_cursor(page.rows[-1], self.cursor_aliases)
+        if cursor == self.cursor:
+            raise GraphQLError("The export did not advance past `{}`".format(cursor))
+        self.cursor = cursor
+        return True
+
+
+def get_export_window(info):
+    """ The export window of the field being resolved, only top level fields
+        are exported
+    """
+    if len(info.path) != 1:
+        return None
+    return getattr(info.context, EXPORT_WINDOW_ATTR, None)
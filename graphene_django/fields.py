@@ -2,10 +2,7 @@ from functools import partial
 
 import six
 from django.db.models.query import QuerySet
-from graphql_relay.connection.arrayconnection import (
-    connection_from_list_slice,
-    get_offset_with_default,
-)
+from graphql_relay.connection.arrayconnection import get_offset_with_default
 from promise import Promise
 
 from graphene import NonNull
@@ -14,12 +11,20 @@ from graphene.types import Field, List
 
 from .settings import graphene_settings
 from .utils import maybe_queryset
+from .utils.connection import connection_from_list_slice
+from .utils.selection import get_sub_fields, is_field_selected
+
+# Connection fields that never read the length of the list
+CONNECTION_UNCOUNTED_FIELDS = {"edges", "pageInfo", "__typename"}
 
 
 class DjangoListField(Field):
     def __init__(self, _type, *args, **kwargs):
         from .types import DjangoObjectType
 
+        # Stream the rows from the database this many at a time
+        self.chunk_size = kwargs.pop("chunk_size", None)
+
         if isinstance(_type, NonNull):
             _type = _type.of_type
 
@@ -63,12 +68,30 @@ class DjangoListField(Field):
         if isinstance(_type, NonNull):
             _type = _type.of_type
         django_object_type = _type.of_type.of_type
-        return partial(
+        resolver = partial(
             self.list_resolver,
             django_object_type,
             parent_resolver,
             self.get_default_queryset(),
         )
+        if self.chunk_size:
+            return partial(self.chunked_resolver, resolver, self.chunk_size)
+        return resolver
+
+    @staticmethod
+    def chunked_resolver(resolver, chunk_size, root, info, **args):
+        """ Iterate over the queryset instead of loading it whole, only one
+            chunk of instances is held while the list is serialized.
+            Prefetches need the whole queryset and keep it loaded.
+        """
+        queryset = resolver(root, info, **args)
+        if (
+            isinstance(queryset, QuerySet)
+            and queryset._result_cache is None
+            and not queryset._prefetch_related_lookups
+        ):
+            return queryset.iterator(chunk_size=chunk_size)
+        return queryset
 
 
 class DjangoConnectionField(ConnectionField):
@@ -130,9 +153,55 @@ class DjangoConnectionField(ConnectionField):
         return connection._meta.node.get_queryset(queryset, info)
 
     @classmethod
-    def resolve_connection(cls, connection, args, iterable, max_limit=None):
+    def needs_count(cls, info, args):
+        """ Whether the connection has to count the whole list: the pages of
+            ``first`` records only have to know whether a next record exists,
+            unless a field other than the edges and the page info could read
+            the length
+        """
+        if info is None or not isinstance(args.get("first"), int):
+            return True
+        if args.get("last") is not None or args.get("before") is not None:
+            return True
+        return cls.selects_length(info)
+
+    @classmethod
+    def selects_length(cls, info):
+        """ Whether a field other than the edges and the page info is selected
+            on the connection, which could read its length
+        """
+        selected = {
+            sub_field.name.value
+            for sub_fields in get_sub_fields(info.field_asts, info.fragments).values()
+            for sub_field in sub_fields
+        }
+        return not selected <= CONNECTION_UNCOUNTED_FIELDS
+
+    @classmethod
+    def is_last_page(cls, args):
+        """ Whether only the ``last`` records of the whole list are requested """
+        return isinstance(args.get("last"), int) and not any(
+            args.get(name) is not None for name in ("first", "after", "before")
+        )
+
+    @classmethod
+    def resolve_connection(cls, connection, args, iterable, max_limit=None, info=None):
         iterable = maybe_queryset(iterable)
 
+        if (
+            max_limit is None
+            and isinstance(iterable, QuerySet)
+            and iterable.ordered
+            and cls.is_last_page(args)
+        ):
+            return cls.resolve_last_page_connection(connection, args, iterable, info)
+
+        if max_limit is not None and "first" not in args:
+            args["first"] = max_limit
+
+        if isinstance(iterable, QuerySet) and not cls.needs_count(info, args):
+            return cls.resolve_uncounted_connection(connection, args, iterable)
+
         if isinstance(iterable, QuerySet):
             list_length = iterable.count()
             list_slice_length = (
@@ -149,9 +218,6 @@ class DjangoConnectionField(ConnectionField):
         # AssertionError
         after = min(get_offset_with_default(args.get("after"), -1) + 1, list_length)
 
-        if max_limit is not None and "first" not in args:
-            args["first"] = max_limit
-
         connection = connection_from_list_slice(
             iterable[after:],
             args,
@@ -166,6 +232,77 @@ class DjangoConnectionField(ConnectionField):
         connection.length = list_length
         return connection
 
+    @classmethod
+    def resolve_uncounted_connection(cls, connection, args, iterable):
+        """ Fetch one record past the page instead of counting the list, the
+            extra record only tells that there is a next page
+        """
+        after = get_offset_with_default(args.get("after"), -1) + 1
+        first = args["first"]
+        rows = list(iterable[after : after + first + 1])
+
+        # The list is known to end after the extra record at the earliest
+        list_length = after + len(rows)
+        connection = connection_from_list_slice(
+            rows,
+            args,
+            slice_start=after,
+            list_length=list_length,
+            list_slice_length=len(rows),
+            connection_type=connection,
+            edge_type=connection.Edge,
+            pageinfo_type=PageInfo,
+        )
+        connection.iterable = iterable
+        # Not counted
+        connection.length = None
+        return connection
+
+    @classmethod
+    def resolve_last_page_connection(cls, connection, args, iterable, info):
+        """ Fetch the ``last`` records in reverse order with a LIMIT instead
+            of skipping all the others with an OFFSET. The list is only
+            counted for the cursors, which are offsets from its start, or for
+            fields that could read its length.
+
+            Only used on ordered querysets without a max limit: the last
+            records of an unordered queryset are not the ones its forward
+            pages end with, and a max limit pages the ``last`` records
+            inside its ``first`` window instead of the whole list
+        """
+        last = args["last"]
+        rows = list(iterable.reverse()[: last + 1])
+        has_previous_page = len(rows) > last
+        rows = rows[:last]
+        rows.reverse()
+
+        counted = (
+            info is None
+            or cls.selects_length(info)
+            or is_field_selected(info, "edges", "cursor")
+            or is_field_selected(info, "pageInfo", "startCursor")
+            or is_field_selected(info, "pageInfo", "endCursor")
+        )
+        if counted:
+            list_length = iterable.count()
+        else:
+            # Only has_previous_page has to be right
+            list_length = len(rows) + int(has_previous_page)
+
+        connection = connection_from_list_slice(
+            rows,
+            args,
+            slice_start=max(list_length - len(rows), 0),
+            list_length=list_length,
+            list_slice_length=len(rows),
+            connection_type=connection,
+            edge_type=connection.Edge,
+            pageinfo_type=PageInfo,
+        )
+        connection.iterable = iterable
+        connection.length = list_length if counted else None
+        return connection
+
     @classmethod
     def connection_resolver(
         cls,
@@ -209,7 +346,7 @@ class DjangoConnectionField(ConnectionField):
         # but iterable might be promise
         iterable = queryset_resolver(connection, iterable, info, args)
         on_resolve = partial(
-            cls.resolve_connection, connection, args, max_limit=max_limit
+            cls.resolve_connection, connection, args, max_limit=max_limit, info=info
         )
 
         if Promise.is_thenable(iterable):
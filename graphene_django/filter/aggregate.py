@@ -0,0 +1,164 @@
+from collections import OrderedDict, namedtuple
+
+import graphene
+from django.db import models
+from django.db.models import Avg, Count, Max, Min, Sum
+from graphene.utils.str_converters import to_camel_case
+
+from ..utils.selection import get_sub_field_asts, get_sub_fields
+
+COUNT_ANNOTATION = "_graphene_count"
+AGGREGATE_ANNOTATION = "_graphene_{}_{}"
+
+NUMBER_FUNCTIONS = OrderedDict([("sum", Sum), ("avg", Avg)])
+VALUE_FUNCTIONS = OrderedDict([("min", Min), ("max", Max)])
+
+AggregateOptions = namedtuple(
+    "AggregateOptions", ["fields", "numeric_fields", "aggregate_type", "group_by_enum"]
+)
+
+
+def get_aggregate_model_fields(_type):
+    """ Map the whitelisted ``aggregate_fields`` of a DjangoObjectType to
+        their model field
+    """
+    opts = _type._meta.model._meta
+    fields = OrderedDict()
+    for name in _type._meta.aggregate_fields:
+        field = opts.get_field(name)
+        assert field.concrete and not field.many_to_many, (
+            "Cannot aggregate over `{}` on {}, only concrete fields and "
+            "foreign keys are supported."
+        ).format(name, _type.__name__)
+        fields[name] = field
+    return fields
+
+
+def get_value_type(field):
+    """ The nullable scalar an aggregated value of ``field`` is returned as """
+    from ..converter import convert_django_field
+
+    if field.is_relation:
+        # Foreign keys are aggregated over the column holding the key
+        field = field.target_field
+    return convert_django_field(field).get_type()
+
+
+def is_numeric(field):
+    return not field.is_relation and isinstance(
+        field, (models.IntegerField, models.FloatField, models.DecimalField)
+    )
+
+
+def get_type_aggregate(_type):
+    """ Aggregate object type and group by enum of a DjangoObjectType, or
+        None when it does not whitelist any ``aggregate_fields``
+    """
+    if not _type._meta.aggregate_fields:
+        return None
+
+    registry = _type._meta.registry
+    key = (_type, tuple(_type._meta.aggregate_fields))
+    aggregate = registry.get_aggregate(key)
+    if aggregate is not None:
+        return aggregate
+
+    fields = get_aggregate_model_fields(_type)
+    numeric_fields = [name for name, field in fields.items() if is_numeric(field)]
+    name = _type.__name__
+
+    values_type = type(
+        name + "AggregateValues",
+        (graphene.ObjectType,),
+        {field_name: get_value_type(field)() for field_name, field in fields.items()},
+    )
+    attrs = OrderedDict(
+        [
+            ("count", graphene.NonNull(graphene.Int)),
+            ("group", graphene.NonNull(values_type)),
+        ]
+    )
+    if numeric_fields:
+        numbers_type = type(
+            name + "AggregateNumbers",
+            (graphene.ObjectType,),
+            {field_name: graphene.Float() for field_name in numeric_fields},
+        )
+        for function in NUMBER_FUNCTIONS:
+            attrs[function] = graphene.NonNull(numbers_type)
+    for function in VALUE_FUNCTIONS:
+        attrs[function] = graphene.NonNull(values_type)
+
+    aggregate_type = type(name + "Aggregate", (graphene.ObjectType,), attrs)
+    group_by_enum = graphene.Enum(
+        name + "AggregateField",
+        [(to_camel_case(field_name), field_name) for field_name in fields],
+    )
+
+    aggregate = AggregateOptions(fields, numeric_fields, aggregate_type, group_by_enum)
+    registry.register_aggregate(key, aggregate)
+    return aggregate
+
+
+def get_selected_names(info, function):
+    """ GraphQL names of the fields selected under the ``function`` sub-field
+        of the aggregate being resolved
+    """
+    asts = get_sub_field_asts(info.field_asts, info.fragments, function)
+    return {
+        selections[0].name.value
+        for selections in get_sub_fields(asts, info.fragments).values()
+    }
+
+
+def aggregate_queryset(queryset, _type, info, group_by=None):
+    """ Compute the aggregates selected under the field being resolved over
+        ``queryset`` with a single ``aggregate()`` query, or a single
+        ``values().annotate()`` query when grouping
+    """
+    aggregate = get_type_aggregate(_type)
+    fields = aggregate.fields
+    auto_camelcase = getattr(info.schema, "auto_camelcase", True)
+    group_by = list(OrderedDict.fromkeys(group_by or ()))
+
+    annotations = OrderedDict([(COUNT_ANNOTATION, Count("*"))])
+    selected = []
+    functions = OrderedDict(NUMBER_FUNCTIONS)
+    functions.update(VALUE_FUNCTIONS)
+    for function, aggregate_class in functions.items():
+        graphql_names = get_selected_names(info, function)
+        candidates = aggregate.numeric_fields if function in NUMBER_FUNCTIONS else fields
+        for name in candidates:
+            graphql_name = to_camel_case(name) if auto_camelcase else name
+            if graphql_name not in graphql_names:
+                continue
+            alias = AGGREGATE_ANNOTATION.format(function, name)
+            annotations[alias] = aggregate_class(fields[name].attname)
+            selected.append((function, name, alias))
+
+    # The ordering would otherwise end up in the GROUP BY clause
+    queryset = queryset.order_by()
+    if group_by:
+        if queryset.query.distinct:
+            # Grouping the joined rows would count a row once per match of
+            # a to-many filter
+            queryset = queryset.model._base_manager.using(queryset.db).filter(
+                pk__in=queryset.values("pk")
+            )
+        columns = [fields[name].attname for name in group_by]
+        rows = queryset.values(*columns).annotate(**annotations).order_by(*columns)
+    else:
+        columns = []
+        rows = [queryset.aggregate(**annotations)]
+
+    results = []
+    for row in rows:
+        result = {function: {} for function in functions}
+        result["count"] = row[COUNT_ANNOTATION]
+        result["group"] = {
+            name: row[column] for name, column in zip(group_by, columns)
+        }
+        for function, name, alias in selected:
+            result[function][name] = row[alias]
+        results.append(result)
+    return results
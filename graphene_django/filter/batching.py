@@ -0,0 +1,133 @@
+import json
+from collections import OrderedDict
+from functools import partial
+
+from django.db import connections
+from django.db.models import F
+from graphene.types.resolver import attr_resolver, dict_or_attr_resolver
+from promise import Promise
+from promise.dataloader import DataLoader
+
+from ..compat import RowNumber, Window, supports_window_functions
+from .utils import get_order_by_expressions, get_related_lookup
+
+PARENT_ANNOTATION = "_graphene_parent"
+ROW_NUMBER_ANNOTATION = "_graphene_row_number"
+LOADERS_ATTR = "_graphene_inner_list_loaders"
+
+
+def is_default_resolver(resolver):
+    """ Whether ``resolver`` is graphene's plain attribute lookup, in which
+        case the related manager can be replaced by a batched query
+    """
+    return isinstance(resolver, partial) and resolver.func in (
+        attr_resolver,
+        dict_or_attr_resolver,
+    )
+
+
+def get_arguments_key(kwargs):
+    return json.dumps(kwargs, sort_keys=True, default=str)
+
+
+class InnerListLoader(DataLoader):
+    """ Load the nested list of every parent requested during one execution
+        pass with a single query per argument set
+    """
+
+    def __init__(self, field, info, kwargs):
+        # Only batch: rows must not outlive the execution that loaded them
+        super(InnerListLoader, self).__init__(cache=False)
+        self.field = field
+        self.info = info
+        self.kwargs = kwargs
+
+    def batch_load_fn(self, keys):
+        return Promise.resolve(self.load_lists(keys))
+
+    def load_lists(self, keys):
+        kwargs = dict(self.kwargs)
+        limit, offset = self.field.pop_page_args(self.field.inner_type, self.info, kwargs)
+        lookup = get_related_lookup(self.field.inner_field)
+
+        base_qs = self.field.get_queryset(self.field.inner_type, self.info, kwargs)
+        base_qs = self.field.optimize(base_qs, self.info)
+        qs = base_qs.filter(**{lookup + "__in": keys})
+
+        if not (limit or offset):
+            rows = qs.annotate(**{PARENT_ANNOTATION: F(lookup)})
+            parent_rows = [(getattr(row, PARENT_ANNOTATION), row) for row in rows]
+        elif supports_window_functions(connections[qs.db]):
+            parent_rows = self.load_windowed_rows(base_qs, qs, lookup, limit, offset)
+        else:
+            rows = qs.annotate(**{PARENT_ANNOTATION: F(lookup)})
+            parent_rows = OrderedDict()
+            for row in rows:
+                parent_rows.setdefault(getattr(row, PARENT_ANNOTATION), []).append(row)
+            parent_rows = [
+                (parent, row)
+                for parent, children in parent_rows.items()
+                for row in self.field.paginate(children, limit, offset)
+            ]
+
+        lists = OrderedDict((key, []) for key in keys)
+        for parent, row in parent_rows:
+            lists[parent].append(row)
+        return list(lists.values())
+
+    def load_windowed_rows(self, base_qs, qs, lookup, limit, offset):
+        """ Number the rows of each parent with ``ROW_NUMBER()`` and only keep
+            the ones inside the requested page
+        """
+        connection = connections[qs.db]
+        windowed = (
+            qs.annotate(
+                **{
+                    PARENT_ANNOTATION: F(lookup),
+                    ROW_NUMBER_ANNOTATION: Window(
+                        expression=RowNumber(),
+                        partition_by=[F(lookup)],
+                        order_by=get_order_by_expressions(qs),
+                    ),
+                }
+            )
+            .order_by()
+            .values_list("pk", PARENT_ANNOTATION, ROW_NUMBER_ANNOTATION)
+        )
+        sql, params = windowed.query.sql_with_params()
+
+        row_number = connection.ops.quote_name(ROW_NUMBER_ANNOTATION)
+        sql = "SELECT * FROM ({}) windowed WHERE {} > %s".format(sql, row_number)
+        params = params + (offset,)
+        if limit:
+            sql += " AND {} <= %s".format(row_number)
+            params += (offset + limit,)
+        sql += " ORDER BY {}".format(row_number)
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            page = cursor.fetchall()
+
+        objects = {}
+        if page:
+            objects = base_qs.filter(pk__in={pk for pk, _, _ in page})
+            objects = {obj.pk: obj for obj in objects}
+        return [(parent, objects[pk]) for pk, parent, _ in page if pk in objects]
+
+
+def get_inner_list_loader(field, info, kwargs):
+    """ Return the loader shared by every parent of ``field`` resolved with
+        the same arguments during this request
+    """
+    context = info.context
+    loaders = getattr(context, LOADERS_ATTR, None)
+    if loaders is None:
+        loaders = {}
+        setattr(context, LOADERS_ATTR, loaders)
+
+    # The selection node is part of the key since the optimizer loads the
+    # relations selected under it
+    key = (id(field), get_arguments_key(kwargs), info.field_asts[0])
+    if key not in loaders:
+        loaders[key] = InnerListLoader(field, info, kwargs)
+    return loaders[key]
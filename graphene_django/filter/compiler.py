@@ -0,0 +1,105 @@
+import copy
+
+from django import forms
+from django_filters import filters
+from django_filters.filterset import BaseFilterSet
+
+from ..settings import graphene_settings
+from .filterset import GlobalIDFilter, GlobalIDMultipleChoiceFilter
+
+# Filters whose form field only parses the value GraphQL already coerced
+COMPILED_FILTER_CLASSES = (
+    filters.BooleanFilter,
+    filters.CharFilter,
+    filters.DateFilter,
+    filters.DateTimeFilter,
+    filters.NumberFilter,
+    filters.TimeFilter,
+    filters.UUIDFilter,
+    GlobalIDFilter,
+    GlobalIDMultipleChoiceFilter,
+)
+
+
+def is_compilable(filterset_class, name, filter_field, argument):
+    """ Whether ``filter_field`` can be applied to the GraphQL argument
+        without going through the FilterSet form first
+    """
+    from ..forms.converter import convert_form_field
+
+    if (
+        name in filterset_class.declared_filters
+        or filter_field.method is not None
+        or type(filter_field) not in COMPILED_FILTER_CLASSES
+    ):
+        return False
+    # The argument is typed after the model field, which may not be what
+    # the filter's own form field expects for this lookup
+    return convert_form_field(filter_field.field).Argument().type == argument.type
+
+
+def clean_value(filter_field, value):
+    """ What the form field would still do to an already coerced value """
+    form_field = filter_field.field
+    if (
+        isinstance(form_field, forms.CharField)
+        and form_field.strip
+        and isinstance(value, str)
+    ):
+        return value.strip()
+    return value
+
+
+class CompiledFilterSet(object):
+    """ Apply the filters of a FilterSet class straight to the queryset.
+
+    django-filter builds a form out of every filter on each call only to
+    parse arguments that GraphQL already coerced. The built-in filters are
+    applied directly to the arguments present, the declared ones, ``method=``
+    filters and FilterSets customizing ``qs`` or ``filter_queryset`` still go
+    through the FilterSet.
+    """
+
+    def __init__(self, filterset_class, filtering_args):
+        self.filterset_class = filterset_class
+        self.filters = {}
+
+        if (
+            filterset_class.qs is not BaseFilterSet.qs
+            or filterset_class.filter_queryset is not BaseFilterSet.filter_queryset
+        ):
+            return
+
+        model = filterset_class._meta.model
+        for name, filter_field in filterset_class.base_filters.items():
+            argument = filtering_args.get(name)
+            if argument is None or not is_compilable(
+                filterset_class, name, filter_field, argument
+            ):
+                continue
+            # Bound the way FilterSet.__init__ binds its copies
+            filter_field = copy.deepcopy(filter_field)
+            filter_field.model = model
+            filter_field.parent = filterset_class
+            self.filters[name] = filter_field
+
+    def filter(self, queryset, data, request=None):
+        if not graphene_settings.FILTERSET_FAST_PATH:
+            return self.filterset_class(data=data, queryset=queryset, request=request).qs
+
+        compiled = {}
+        remaining = {}
+        for name, value in data.items():
+            if name in self.filters:
+                compiled[name] = value
+            else:
+                remaining[name] = value
+
+        if remaining:
+            queryset = self.filterset_class(
+                data=remaining, queryset=queryset, request=request
+            ).qs
+        for name, value in compiled.items():
+            filter_field = self.filters[name]
+            queryset = filter_field.filter(queryset, clean_value(filter_field, value))
+        return queryset
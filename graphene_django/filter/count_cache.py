@@ -0,0 +1,60 @@
+import hashlib
+
+from django.apps import apps
+from django.core.cache import caches
+from django.db import connections
+
+from ..settings import graphene_settings
+from .versions import get_table_versions
+
+COUNT_KEY = "graphene_django:count:{}"
+
+
+def get_cache():
+    return caches[graphene_settings.FILTER_FIELD_COUNT_CACHE_ALIAS]
+
+
+def get_queried_tables(sql, connection):
+    """ Tables of the installed models ``sql`` reads from, including the ones
+        of subqueries coming from the filters or the permission scope
+    """
+    tables = {
+        model._meta.db_table for model in apps.get_models(include_auto_created=True)
+    }
+    return sorted(
+        table for table in tables if connection.ops.quote_name(table) in sql
+    )
+
+
+def get_count_key(queryset):
+    """ Key of the count of ``queryset``: its SQL carries the model, the
+        filters and the permission scope, the versions of the tables it reads
+        from tell whether they changed since. None when the tables have
+        uncommitted writes
+    """
+    connection = connections[queryset.db]
+    sql, params = queryset.query.clone().get_compiler(queryset.db).as_sql()
+    versions = get_table_versions(get_queried_tables(sql, connection))
+    if versions is None:
+        return None
+
+    digest = hashlib.sha1()
+    for part in [queryset.db, sql, repr(params)] + versions:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return COUNT_KEY.format(digest.hexdigest())
+
+
+def cached_count(queryset):
+    """ ``queryset.count()``, cached until one of the tables it reads from is
+        written to through the ORM or the cache timeout expires
+    """
+    cache = get_cache()
+    key = get_count_key(queryset)
+    if key is None:
+        return queryset.count()
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, graphene_settings.FILTER_FIELD_COUNT_CACHE_TIMEOUT)
+    return count
@@ -0,0 +1,143 @@
+import base64
+import datetime
+import decimal
+import json
+import uuid
+
+from django.db import connections
+from django.db.models import F, Q
+from django.db.models.expressions import OrderBy
+from django.utils.dateparse import parse_date, parse_datetime, parse_time
+from graphql.error import GraphQLError
+
+from .utils import get_order_by_expressions
+
+CURSOR_ANNOTATION = "_graphene_cursor_{}"
+
+# Values without an exact JSON form are tagged with their type, datetimes
+# keep their microseconds so that seeking past a row never matches it again
+CURSOR_TYPES = {
+    "datetime": (datetime.datetime, datetime.datetime.isoformat, parse_datetime),
+    "date": (datetime.date, datetime.date.isoformat, parse_date),
+    "time": (datetime.time, datetime.time.isoformat, parse_time),
+    "timedelta": (
+        datetime.timedelta,
+        lambda value: [value.days, value.seconds, value.microseconds],
+        lambda value: datetime.timedelta(*value),
+    ),
+    "decimal": (decimal.Decimal, str, decimal.Decimal),
+    "uuid": (uuid.UUID, str, uuid.UUID),
+}
+
+
+def get_cursor_aliases(qs):
+    """ The cursor annotations of an ``annotate_cursor`` queryset """
+    return [order.expression.name for order in get_order_by_expressions(qs)]
+
+
+def annotate_cursor(qs):
+    """ Annotate every ordering expression of ``qs`` so that the cursor of a
+        row can be read from it, and order by those annotations
+    """
+    annotations = {}
+    order_by = []
+    for i, order in enumerate(get_order_by_expressions(qs)):
+        alias = CURSOR_ANNOTATION.format(i)
+        annotations[alias] = order.expression
+        order_by.append(
+            OrderBy(
+                F(alias),
+                descending=order.descending,
+                nulls_first=order.nulls_first,
+                nulls_last=order.nulls_last,
+            )
+        )
+    return qs.annotate(**annotations).order_by(*order_by)
+
+
+def encode_cursor_value(value):
+    for name, (cls, encode, _) in CURSOR_TYPES.items():
+        if isinstance(value, cls):
+            return {"type": name, "value": encode(value)}
+    return value
+
+
+def decode_cursor_value(value):
+    if not isinstance(value, dict):
+        return value
+    _, _, decode = CURSOR_TYPES[value["type"]]
+    decoded = decode(value["value"])
+    if decoded is None:
+        raise ValueError(value)
+    return decoded
+
+
+def encode_cursor(row, aliases):
+    values = [encode_cursor_value(getattr(row, alias)) for alias in aliases]
+    data = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor, aliases):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(aliases):
+            raise GraphQLError("Cursor `{}` does not match the ordering".format(cursor))
+        return [decode_cursor_value(value) for value in values]
+    except (TypeError, ValueError, KeyError, decimal.InvalidOperation):
+        raise GraphQLError("Invalid cursor `{}`".format(cursor))
+
+
+def nulls_come_first(order, connection):
+    """ Whether the NULL values of ``order`` are sorted before the others,
+        explicitly or by default on the backend of ``connection``
+    """
+    if order.nulls_first or order.nulls_last:
+        return bool(order.nulls_first)
+    nulls_largest = getattr(connection.features, "nulls_order_largest", False)
+    return order.descending == nulls_largest
+
+
+def get_after_q(alias, value, descending, nulls_first):
+    """ The rows sorted strictly after ``value`` on ``alias``, None when there
+        cannot be any
+    """
+    if value is None:
+        return Q(**{"{}__isnull".format(alias): False}) if nulls_first else None
+    lookup = "lt" if descending else "gt"
+    condition = Q(**{"{}__{}".format(alias, lookup): value})
+    if not nulls_first:
+        condition |= Q(**{"{}__isnull".format(alias): True})
+    return condition
+
+
+def get_equal_q(alias, value):
+    if value is None:
+        return Q(**{"{}__isnull".format(alias): True})
+    return Q(**{alias: value})
+
+
+def filter_by_cursor(qs, cursor, before=False):
+    """ Keep the rows of an ``annotate_cursor`` queryset that come after (or
+        before) ``cursor``, expanding the row-value comparison
+        ``(a, b, id) > (x, y, z)`` so that mixed directions and NULL values
+        are supported
+    """
+    orders = get_order_by_expressions(qs)
+    aliases = get_cursor_aliases(qs)
+    values = decode_cursor(cursor, aliases)
+    connection = connections[qs.db]
+
+    condition = Q()
+    equal = Q()
+    for alias, value, order in zip(aliases, values, orders):
+        after = get_after_q(
+            alias,
+            value,
+            order.descending != before,
+            nulls_come_first(order, connection) != before,
+        )
+        if after is not None:
+            condition |= equal & after
+        equal &= get_equal_q(alias, value)
+    return qs.filter(condition)
@@ -1,4 +1,5 @@
 import enum
+from collections import namedtuple
 from functools import partial
 import graphene
 from graphene.types.field import Field
@@ -6,28 +7,160 @@ from graphene_django.filter.utils import get_filtering_args_from_filterset, get_
 from graphene.utils.str_converters import to_snake_case, to_camel_case
 from graphql.error import GraphQLError
 from django.db.models.functions import Lower
-from django.db.models import F 
+from django.db import connections, router
+from django.db.models import Count, F
+from django.utils.functional import cached_property
 
+from ..compat import Window, supports_window_functions
+from ..export import get_export_window
 from ..fields import DjangoListField
+from ..settings import graphene_settings
 from ..utils import maybe_queryset
+from ..utils.selection import get_sub_field_asts, is_field_selected
+from .aggregate import aggregate_queryset, get_type_aggregate
+from .batching import get_inner_list_loader, is_default_resolver
+from .compiler import CompiledFilterSet
+from .count_cache import cached_count
+from .filterset import get_id_list_q
+from .cursor import annotate_cursor, encode_cursor, filter_by_cursor, get_cursor_aliases
+from .index_advisor import record_usage
+from .optimizer import get_prefetch_attr, optimize_queryset
+from .permissions import get_viewable, scope_queryset
+from .search import get_search_backend
+from .snapshot import get_snapshot_fingerprint, load_snapshot, take_snapshot
+from .versions import track_table_versions
 
 
 DEFAULT_ORDER = 'id'
+TOTAL_ANNOTATION = '_graphene_total'
+
+class Page():
+    '''
+    Rows of a DjangoFilterField page, only queried once resolved. One extra
+    row is fetched to know whether the list goes on past the page, and the
+    total is counted only when it is selected.
+
+    Pages before a cursor are fetched in reverse, their extra row tells
+    whether there is a previous page and the cursor row follows them.
+    '''
+    def __init__(self, queryset, limit, offset, count_queryset, reverse=False, window_total=False,
+                 count_cache=False, after_cursor=False):
+        self.queryset = queryset
+        self.limit = limit
+        self.offset = offset
+        self.count_queryset = count_queryset
+        self.reverse = reverse
+        self.window_total = window_total
+        self.count_cache = count_cache
+        self.after_cursor = after_cursor
+
+    @cached_property
+    def _fetched(self):
+        if self.limit:
+            rows = list(self.queryset[self.offset: self.offset + self.limit + 1])
+            has_more = len(rows) > self.limit
+            rows = rows[:self.limit]
+        else:
+            rows = list(self.queryset[self.offset:])
+            has_more = False
+        if self.reverse:
+            rows.reverse()
+        return rows, has_more
+
+    @property
+    def rows(self):
+        return self._fetched[0]
+
+    @property
+    def has_next_page(self):
+        if self.reverse:
+            return True
+        return self._fetched[1]
+
+    @property
+    def has_previous_page(self):
+        if self.reverse:
+            return self._fetched[1]
+        return bool(self.offset or self.after_cursor)
+
+    @cached_property
+    def total(self):
+        if self.window_total:
+            # Every row carries the COUNT(*) OVER () of the whole result, an
+            # empty page only tells the total when it is the first one
+            if self.rows:
+                return getattr(self.rows[0], TOTAL_ANNOTATION)
+            if not self.offset:
+                return 0
+        if self.count_cache:
+            return cached_count(self.count_queryset)
+        return self.count_queryset.count()
+
+
+class SnapshotPage(Page):
+    '''
+    Page sliced from the primary keys of a snapshot, its rows are fetched by
+    primary key. Rows deleted or out of the user's scope since the snapshot
+    was taken are left out.
+    '''
+    def __init__(self, queryset, ids, limit, offset, count_queryset, token):
+        super().__init__(queryset, limit, offset, count_queryset)
+        self.ids = ids
+        self.snapshot_token = token
+
+    @cached_property
+    def _fetched(self):
+        end = self.offset + self.limit if self.limit else len(self.ids)
+        ids = self.ids[self.offset: end]
+        model = self.queryset.model
+        rows = self.queryset.filter(
+            get_id_list_q(model, model._meta.pk.name, ids, self.queryset.db)
+        ).order_by()
+        rows_by_pk = {row.pk: row for row in rows}
+        rows = [rows_by_pk[pk] for pk in ids if pk in rows_by_pk]
+        return rows, len(self.ids) > end
+
+    @cached_property
+    def total(self):
+        return len(self.ids)
+
 
 class PageInfo(graphene.ObjectType):
-    def __init__(self, has_next_page, total, *args, **kwargs):
-        self._has_next_page = has_next_page
-        self._total = total
+    def __init__(self, page, cursor_aliases=(), *args, **kwargs):
+        self._page = page
+        self._cursor_aliases = cursor_aliases
         super().__init__(*args, **kwargs)
-    
+
     has_next_page = graphene.Boolean()
+    has_previous_page = graphene.Boolean()
     total = graphene.Int()
+    next_cursor = graphene.String()
+    previous_cursor = graphene.String()
+    snapshot_token = graphene.String()
 
     def resolve_has_next_page(self, info, **kwargs):
-        return self._has_next_page
-    
+        return self._page.has_next_page
+
+    def resolve_has_previous_page(self, info, **kwargs):
+        return self._page.has_previous_page
+
     def resolve_total(self, info, **kwargs):
-        return self._total 
+        return self._page.total
+
+    def resolve_next_cursor(self, info, **kwargs):
+        rows = self._page.rows
+        if not rows or not self._cursor_aliases:
+            return None
+        return encode_cursor(rows[-1], self._cursor_aliases)
+
+    def resolve_previous_cursor(self, info, **kwargs):
+        rows = self._page.rows
+        if not rows or not self._cursor_aliases:
+            return None
+        return encode_cursor(rows[0], self._cursor_aliases)
+
+    def resolve_snapshot_token(self, info, **kwargs):
+        return getattr(self._page, 'snapshot_token', None)
 
 
 class OrderingDirectionEnum(enum.Enum):
@@ -41,38 +174,86 @@ class OrderingModifierEnum(enum.Enum):
 OrderingDirectionEnumType = graphene.Enum.from_enum(OrderingDirectionEnum)
 OrderingModifierEnumType = graphene.Enum.from_enum(OrderingModifierEnum)
 
-class FilterBase():
-    def get_filter_args(self, _type, kwargs, inner_field=None):
-        self.filterset_class = get_filterset_class(
-            getattr(_type._meta, 'filterset_class', None),
-            model=_type._meta.model,
-            fields=_type._meta.filter_fields,
-        )
+FilteringOptions = namedtuple(
+    'FilteringOptions',
+    ['filterset_class', 'filtering_args', 'order_by_enum', 'order_by_input', 'compiled_filterset'],
+)
 
-        self.filtering_args = get_filtering_args_from_filterset(
-            self.filterset_class, _type)
-        kwargs.setdefault('args', {})
 
-        order_args = {to_camel_case(k): i for (i, k) in enumerate(set(_type._meta.order_fields + ['id']))}
+def freeze_filter_fields(filter_fields):
+    if isinstance(filter_fields, dict):
+        return tuple(sorted((k, tuple(v)) for k, v in filter_fields.items()))
+    return tuple(filter_fields or ())
 
-        if len(order_args.items()) == 0:
-            raise Exception(f'No ordering args found on {_type}')
 
-        order_by_enum = enum.Enum(
-            f'{_type}_{inner_field.model.__name__}_{inner_field.name}_OrderingFilter' if inner_field else f'{_type}OrderingFilter',
-            order_args
-        )
-        self.order_by_enum = order_by_enum
+def get_type_filtering(_type):
+    '''
+    FilterSet class, filtering arguments and ordering types of a
+    DjangoObjectType, shared by every field listing it.
+    '''
+    registry = _type._meta.registry
+    filterset_class = getattr(_type._meta, 'filterset_class', None)
+    key = (
+        _type,
+        filterset_class,
+        freeze_filter_fields(_type._meta.filter_fields),
+        tuple(_type._meta.order_fields),
+    )
+    filtering = registry.get_filtering(key)
+    if filtering is not None:
+        return filtering
+
+    filterset_class = get_filterset_class(
+        filterset_class,
+        model=_type._meta.model,
+        fields=_type._meta.filter_fields,
+    )
+    filtering_args = get_filtering_args_from_filterset(filterset_class, _type)
+
+    order_args = {to_camel_case(k): i for (i, k) in enumerate(set(_type._meta.order_fields + ['id']))}
+
+    if len(order_args.items()) == 0:
+        raise Exception(f'No ordering args found on {_type}')
+
+    order_by_enum = enum.Enum(f'{_type}OrderingFilter', order_args)
+
+    OrderByEnumObject = type(order_by_enum.__name__ + 'Object', (graphene.InputObjectType,), {
+        'field': graphene.Enum.from_enum(order_by_enum)(),
+        'direction': OrderingDirectionEnumType(default_value=OrderingDirectionEnum.ASC.value),
+        'modifiers': graphene.List(OrderingModifierEnumType, default_value=[]),
+    })
+
+    compiled_filterset = CompiledFilterSet(filterset_class, filtering_args)
+
+    filtering = FilteringOptions(
+        filterset_class, filtering_args, order_by_enum, OrderByEnumObject, compiled_filterset,
+    )
+    registry.register_filtering(key, filtering)
+    return filtering
+
 
-        OrderByEnumObject = type(order_by_enum.__name__ + 'Object', (graphene.InputObjectType,), {
-            'field': graphene.Enum.from_enum(order_by_enum)(),
-            'direction': OrderingDirectionEnumType(default_value=OrderingDirectionEnum.ASC.value),
-            'modifiers': graphene.List(OrderingModifierEnumType, default_value=[]),
-        })
+class FilterBase():
+    def get_filter_args(self, _type, kwargs, inner_field=None, cursors=False, snapshot=False):
+        filtering = get_type_filtering(_type)
+        self.filterset_class = filtering.filterset_class
+        self.filtering_args = filtering.filtering_args
+        self.order_by_enum = filtering.order_by_enum
+        self.compiled_filterset = filtering.compiled_filterset
+        OrderByEnumObject = filtering.order_by_input
 
+        kwargs.setdefault('args', {})
         kwargs['args']['order_by'] = graphene.List(OrderByEnumObject, default_value=[], name='orderBy').Argument()
         kwargs['args']['limit'] = graphene.Int(default_value=0, name='limit').Argument()
         kwargs['args']['offset'] = graphene.Int(default_value=0, name='offset').Argument()
+        if cursors:
+            kwargs['args']['after'] = graphene.String(name='after').Argument()
+            kwargs['args']['before'] = graphene.String(name='before').Argument()
+        if snapshot:
+            kwargs['args']['snapshot'] = graphene.Boolean(default_value=False, name='snapshot').Argument()
+            kwargs['args']['snapshot_token'] = graphene.String(name='snapshotToken').Argument()
+        if _type._meta.search_fields:
+            get_search_backend().register(_type._meta.model, _type._meta.search_fields)
+            kwargs['args']['search'] = graphene.String(name='search').Argument()
         kwargs['args'].update(self.filtering_args)
         return kwargs
 
@@ -100,26 +281,72 @@ class FilterBase():
             )
         return order_by
 
-    def filter(self, _type, info, kwargs):
-        limit = kwargs.pop('limit')
-        offset = kwargs.pop('offset')
+    def get_queryset(self, _type, info, kwargs, queryset=None):
         order_by_args = kwargs.pop('order_by')
+        search = kwargs.pop('search', None)
 
         filter_kwargs = {k: v
             for k, v in kwargs.items()
             if k in self.filtering_args
         }
 
-        user = info.context.user
-        permission = _type._meta.permission_class()
-        qs = permission.viewable(user, info=info)
-        qs = self.filterset_class(data=filter_kwargs, queryset=qs, request=info.context).qs
+        if queryset is None:
+            qs = get_viewable(_type, info)
+        else:
+            qs = scope_queryset(queryset, _type, info)
+        qs = self.compiled_filterset.filter(qs, filter_kwargs, request=info.context)
+        order_by = self.get_order_by(order_by_args)
+        record_usage(_type._meta.model, self.filterset_class, filter_kwargs, order_by)
+        search_order = []
+        if search:
+            qs, rank = get_search_backend().search(qs, _type._meta.search_fields, search)
+            # Ranked after the requested ordering, before the default one
+            if rank is not None:
+                search_order.append(rank.desc())
         qs = qs.order_by(
-            *self.get_order_by(order_by_args),
+            *order_by,
+            *search_order,
             DEFAULT_ORDER,
         )
+        return qs
+
+    def get_limit(self, _type, info, limit):
+        if limit < 0:
+            raise GraphQLError(
+                f"The `limit` of the `{info.field_name}` field cannot be negative."
+            )
+        max_limit = _type._meta.max_limit
+        if max_limit is None:
+            max_limit = graphene_settings.FILTER_FIELD_MAX_LIMIT
+        default_limit = _type._meta.default_limit
+        if default_limit is None:
+            default_limit = graphene_settings.FILTER_FIELD_DEFAULT_LIMIT
+
+        if not limit:
+            limit = default_limit or max_limit or 0
+        if max_limit and limit > max_limit:
+            raise GraphQLError(
+                f"Requesting {limit} records on the `{info.field_name}` field "
+                f"exceeds the `limit` of {max_limit} records."
+            )
+        return limit
+
+    def pop_page_args(self, _type, info, kwargs):
+        limit = self.get_limit(_type, info, kwargs.pop('limit'))
+        offset = kwargs.pop('offset')
+        if offset < 0:
+            raise GraphQLError(
+                f"The `offset` of the `{info.field_name}` field cannot be negative."
+            )
+        return limit, offset
 
-        qs = qs[offset: offset+limit] if limit else qs[offset:]
+    def paginate(self, qs, limit, offset):
+        return qs[offset: offset+limit] if limit else qs[offset:]
+
+    def filter(self, _type, info, kwargs):
+        limit, offset = self.pop_page_args(_type, info, kwargs)
+        qs = self.get_queryset(_type, info, kwargs)
+        qs = self.paginate(qs, limit, offset)
 
         return qs, limit
 
@@ -128,14 +355,25 @@ class DjangoFilterField(Field, FilterBase):
     '''
     Custom field to use django-filter with graphene object types (without relay).
     '''
-    def __init__(self, _type, *args, **kwargs):
-        kwargs = self.get_filter_args(_type, kwargs)
+    def __init__(self, _type, *args, window_total=None, count_cache=None, snapshot=None, **kwargs):
+        self.snapshot = (
+            graphene_settings.FILTER_FIELD_SNAPSHOT if snapshot is None else snapshot
+        )
+        kwargs = self.get_filter_args(_type, kwargs, cursors=True, snapshot=self.snapshot)
+        self.window_total = (
+            graphene_settings.FILTER_FIELD_WINDOW_TOTAL if window_total is None else window_total
+        )
+        self.count_cache = (
+            graphene_settings.FILTER_FIELD_COUNT_CACHE if count_cache is None else count_cache
+        )
+        if self.count_cache:
+            track_table_versions()
+        aggregate_options = get_type_aggregate(_type)
 
         class ListBase(graphene.ObjectType):
-            def __init__(self, type, queryset, has_next_page, total, *args, **kwargs):
-                self.queryset = queryset
-                self.has_next_page = has_next_page
-                self.total = total
+            def __init__(self, type, page, cursor_aliases=(), *args, **kwargs):
+                self.page = page
+                self.cursor_aliases = cursor_aliases
                 return super().__init__(*args, **kwargs)
             
             class Meta:
@@ -145,40 +383,158 @@ class DjangoFilterField(Field, FilterBase):
             page_info = graphene.NonNull(PageInfo)
 
             def resolve_objects(self, resolve_info, **kwargs):
-                return self.queryset
+                return self.page.rows
                 
             def resolve_page_info(self, resolve_info, **kwargs):
-                return PageInfo(has_next_page=self.has_next_page, total=self.total) 
-        
+                return PageInfo(page=self.page, cursor_aliases=self.cursor_aliases)
+
+            if aggregate_options is not None:
+                # Computed over the whole filtered queryset, not the page
+                aggregate = graphene.NonNull(
+                    graphene.List(graphene.NonNull(aggregate_options.aggregate_type)),
+                    group_by=graphene.List(graphene.NonNull(aggregate_options.group_by_enum)),
+                )
+
+                def resolve_aggregate(self, resolve_info, group_by=None, **kwargs):
+                    return aggregate_queryset(
+                        self.page.count_queryset, _type, resolve_info, group_by=group_by
+                    )
+
         self.of_type = ListBase
         self.inner_type = _type
         super().__init__(ListBase, *args, **kwargs)
 
     def field_resolver(self, root, info, *args, **kwargs):
-        qs, limit = self.filter(self.inner_type, info, kwargs)
+        limit, offset = self.pop_page_args(self.inner_type, info, kwargs)
+        after = kwargs.pop('after', None)
+        before = kwargs.pop('before', None)
+        snapshot = kwargs.pop('snapshot', False)
+        snapshot_token = kwargs.pop('snapshot_token', None)
+        export_window = get_export_window(info)
+        if export_window is not None:
+            # Exported a chunk at a time, seeking past the previous one
+            limit, offset = export_window.chunk_size, 0
+            after, before = export_window.cursor, None
+        elif snapshot or snapshot_token:
+            if after or before:
+                raise GraphQLError("Cannot page a snapshot with cursors")
+            return self.resolve_snapshot(info, kwargs, limit, offset, snapshot_token)
+
+        qs = self.get_queryset(self.inner_type, info, kwargs)
+        count_qs = qs
+        qs = optimize_queryset(
+            qs,
+            self.inner_type,
+            get_sub_field_asts(info.field_asts, info.fragments, 'objects'),
+            info,
+        )
 
-        total = qs.count()
-        has_next_page = total == limit
+        # Seek to the cursors on the ordering columns instead of skipping
+        # `offset` rows, the cursors of the page are read back from the rows
+        qs = annotate_cursor(qs)
+        cursor_aliases = get_cursor_aliases(qs)
+        if after:
+            qs = filter_by_cursor(qs, after)
+        if before:
+            qs = filter_by_cursor(qs, before, before=True).reverse()
+
+        # Read the total from the page query itself, unless the cursors
+        # narrowed it down or DISTINCT would be applied after the window
+        window_total = (
+            self.window_total
+            and not (after or before)
+            and not qs.query.distinct
+            and supports_window_functions(connections[qs.db])
+            and is_field_selected(info, 'pageInfo', 'total')
+        )
+        if window_total:
+            qs = qs.annotate(**{TOTAL_ANNOTATION: Window(Count('*'))})
 
-        return self.of_type(type=self.of_type, queryset=qs, has_next_page=has_next_page, total=total)
+        page = Page(
+            qs, limit, offset, count_qs,
+            reverse=bool(before), window_total=window_total, count_cache=self.count_cache,
+            after_cursor=bool(after),
+        )
+        if export_window is not None:
+            export_window.set_page(page, cursor_aliases)
+        return self.of_type(type=self.of_type, page=page, cursor_aliases=cursor_aliases)
+
+    def resolve_snapshot(self, info, kwargs, limit, offset, token):
+        '''
+        Page through the primary keys of the result stored on the first
+        request, later pages only fetch their own rows by primary key.
+        '''
+        fingerprint = get_snapshot_fingerprint(self.inner_type, info, kwargs)
+        qs = self.get_queryset(self.inner_type, info, kwargs)
+        if token:
+            ids = load_snapshot(token, fingerprint)
+        else:
+            token, ids = take_snapshot(qs, fingerprint)
+
+        rows_qs = optimize_queryset(
+            get_viewable(self.inner_type, info),
+            self.inner_type,
+            get_sub_field_asts(info.field_asts, info.fragments, 'objects'),
+            info,
+        )
+        page = SnapshotPage(rows_qs, ids, limit, offset, qs, token)
+        return self.of_type(type=self.of_type, page=page)
 
     def get_resolver(self, parent_resolver):
         return self.field_resolver
 
 
 class DjangoInnerListField(Field, FilterBase):
-    def __init__(self, _type, *args, inner_field=None, **kwargs):
+    def __init__(self, _type, *args, inner_field=None, batch=None, **kwargs):
         kwargs = self.get_filter_args(_type, kwargs, inner_field=inner_field)
         self.inner_type = _type
+        self.inner_field = inner_field
+        self.batch = (
+            graphene_settings.INNER_LIST_BATCH_LOADING if batch is None else batch
+        )
         super().__init__(graphene.NonNull(graphene.List(graphene.NonNull(_type))), *args, **kwargs)
 
     @property
     def model(self):
         return self.type.of_type._meta.node._meta.model
-    
+
+    def optimize(self, qs, info):
+        return optimize_queryset(qs, self.inner_type, info.field_asts, info)
+
     def list_resolver(self, resolver, root, info, **kwargs):
-        qs, limit = self.filter(self.inner_type, info, kwargs)
-        return maybe_queryset(resolver(root, info, **kwargs)) & qs
+        prefetched = getattr(root, get_prefetch_attr(info.path[-1]), None)
+        if prefetched is not None:
+            # Loaded by the optimizer of an enclosing field, which only
+            # prefetches lists without a page
+            return prefetched
+
+        # Validated before the lists of the other parents are loaded with it
+        limit, offset = self.pop_page_args(self.inner_type, info, dict(kwargs))
+        # Paged lists are not prefetched, their pages are cut per parent by
+        # the loader whether batching is enabled or not, where the database
+        # can number the rows of each parent
+        paged = (limit or offset) and supports_window_functions(
+            connections[router.db_for_read(self.inner_type._meta.model)]
+        )
+        if (
+            (self.batch or paged)
+            and self.inner_field is not None
+            and info.context is not None
+            and is_default_resolver(resolver)
+        ):
+            return get_inner_list_loader(self, info, kwargs).load(root.pk)
+
+        kwargs.pop('limit')
+        kwargs.pop('offset')
+        resolver_kwargs = {k: v
+            for k, v in kwargs.items()
+            if k not in ('order_by', 'search')
+        }
+        # The relation, the permission scope and the filters in one queryset
+        qs = maybe_queryset(resolver(root, info, **resolver_kwargs))
+        qs = self.get_queryset(self.inner_type, info, kwargs, queryset=qs)
+        qs = self.optimize(qs, info)
+        return self.paginate(qs, limit, offset)
 
     def get_resolver(self, parent_resolver):
         return partial(self.list_resolver, parent_resolver)
\ No newline at end of file
@@ -1,13 +1,27 @@
 import itertools
-
-from django.db import models
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.signals import request_finished
+from django.db import connections, models
+from django.db.models import Exists, OuterRef, Q
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.expressions import RawSQL
 from django_filters import Filter, MultipleChoiceFilter, VERSION
+from django_filters.conf import settings as django_filters_settings
 from django_filters.filterset import BaseFilterSet, FilterSet
 from django_filters.filterset import FILTER_FOR_DBFIELD_DEFAULTS
+from django_filters.utils import get_model_field
 
 from graphql_relay.node.node import from_global_id
 
+from ..compat import sqlite_has_json1
 from ..forms import GlobalIDFormField, GlobalIDMultipleChoiceField
+from ..settings import graphene_settings
+
+# Temporary table the ID lists are loaded into on SQLite without JSON1
+ID_LIST_TABLE = "graphene_id_list"
+id_lists = itertools.count()
 
 
 class GlobalIDFilter(Filter):
@@ -18,12 +32,148 @@ class GlobalIDFilter(Filter):
         return super(GlobalIDFilter, self).filter(qs, value)
 
 
+def get_id_list_q(model, field_name, ids, using):
+    """ Match ``field_name`` against a list of IDs: a plain ``IN`` list up to
+        ``ID_LIST_FILTER_THRESHOLD`` IDs, and above it a single parameter
+        expanded by the database (``json_each`` on SQLite, ``unnest`` on
+        PostgreSQL), a temporary table on SQLite without JSON1, or ``IN``
+        lists of at most the threshold joined with ``OR``
+    """
+    ids = list(ids)
+    lookup = field_name + "__in"
+    threshold = graphene_settings.ID_LIST_FILTER_THRESHOLD
+    if not threshold or len(ids) <= threshold:
+        return Q(**{lookup: ids})
+
+    connection = connections[using]
+    field = get_model_field(model, field_name)
+    # Relations are matched against the field they point to
+    field = getattr(field, "target_field", field)
+    if field is not None and connection.vendor in ("sqlite", "postgresql"):
+        values = [
+            field.get_db_prep_value(field.to_python(value), connection)
+            for value in ids
+        ]
+        if connection.vendor == "postgresql":
+            sql = "SELECT unnest(%s::{}[])".format(field.rel_db_type(connection))
+            return Q(**{lookup: RawSQL(sql, (values,))})
+        if sqlite_has_json1():
+            values = json.dumps(values, cls=DjangoJSONEncoder)
+            return Q(**{lookup: RawSQL("SELECT value FROM json_each(%s)", (values,))})
+        return get_id_table_q(lookup, values, connection)
+
+    q = Q()
+    for start in range(0, len(ids), threshold):
+        q |= Q(**{lookup: ids[start : start + threshold]})
+    return q
+
+
+def get_id_table_q(lookup, values, connection):
+    """ Match ``lookup`` against ``values`` loaded into a temporary table, a
+        chunk per statement, so that the filter itself binds none of them.
+        The rows are deleted at the end of the request
+    """
+    list_id = next(id_lists)
+    table = connection.ops.quote_name(ID_LIST_TABLE)
+    # Two parameters per row
+    chunk_size = max(connection.features.max_query_params // 2, 1)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TEMPORARY TABLE IF NOT EXISTS {} (list_id integer, value)".format(table)
+        )
+        for start in range(0, len(values), chunk_size):
+            chunk = values[start : start + chunk_size]
+            cursor.execute(
+                "INSERT INTO {} (list_id, value) VALUES {}".format(
+                    table, ", ".join(["(%s, %s)"] * len(chunk))
+                ),
+                [param for value in chunk for param in (list_id, value)],
+            )
+    setattr(connection, ID_LIST_TABLE, True)
+    sql = "SELECT value FROM {} WHERE list_id = %s".format(table)
+    return Q(**{lookup: RawSQL(sql, (list_id,))})
+
+
+def clear_id_tables(**kwargs):
+    for connection in connections.all():
+        if not getattr(connection, ID_LIST_TABLE, False):
+            continue
+        setattr(connection, ID_LIST_TABLE, False)
+        # Temporary tables are dropped with the connection
+        if connection.connection is not None:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "DELETE FROM {}".format(connection.ops.quote_name(ID_LIST_TABLE))
+                )
+
+
+request_finished.connect(clear_id_tables)
+
+
+def get_exists_subquery(model, field_name, ids, using):
+    """ Correlated ``EXISTS`` matching the rows of ``model`` related through
+        ``field_name`` to one of ``ids``, which unlike a JOIN does not repeat
+        a row once per related match
+    """
+    from .utils import get_related_lookup
+
+    field = get_model_field(model, field_name)
+    if (
+        LOOKUP_SEP not in field_name
+        and field is not None
+        and (field.many_to_many or field.one_to_many)
+    ):
+        # Go from the related rows back to the outer row
+        related_model = field.related_model
+        subquery = related_model._base_manager.filter(
+            **{get_related_lookup(field): OuterRef("pk")}
+        )
+        subquery = subquery.filter(
+            get_id_list_q(related_model, related_model._meta.pk.name, ids, using)
+        )
+    else:
+        subquery = model._base_manager.filter(pk=OuterRef("pk"))
+        subquery = subquery.filter(get_id_list_q(model, field_name, ids, using))
+    return Exists(subquery.values("pk"))
+
+
 class GlobalIDMultipleChoiceFilter(MultipleChoiceFilter):
     field_class = GlobalIDMultipleChoiceField
 
+    def use_exists(self):
+        """ Whether to-many relations are filtered with ``EXISTS`` subqueries,
+            see ``GrapheneFilterSetMixin.relation_filter_exists``
+        """
+        exists = getattr(getattr(self, "parent", None), "relation_filter_exists", None)
+        if exists is None:
+            exists = graphene_settings.RELATION_FILTER_EXISTS
+        return exists
+
     def filter(self, qs, value):
         gids = value # [from_global_id(v)[1] for v in value] don't use relay's id conversion
-        return super(GlobalIDMultipleChoiceFilter, self).filter(qs, gids)
+        if (
+            not gids
+            or self.lookup_expr != django_filters_settings.DEFAULT_LOOKUP_EXPR
+            or self.null_value in gids
+            or self.is_noop(qs, gids)
+        ):
+            return super(GlobalIDMultipleChoiceFilter, self).filter(qs, gids)
+
+        if self.use_exists():
+            method = self.get_method(qs)
+            if self.conjoined:
+                for gid in set(gids):
+                    qs = method(get_exists_subquery(qs.model, self.field_name, [gid], qs.db))
+                return qs
+            return method(get_exists_subquery(qs.model, self.field_name, set(gids), qs.db))
+
+        if self.conjoined:
+            return super(GlobalIDMultipleChoiceFilter, self).filter(qs, gids)
+
+        # One predicate for the whole list instead of one OR per ID
+        q = get_id_list_q(qs.model, self.field_name, set(gids), qs.db)
+        qs = self.get_method(qs)(q)
+        return qs.distinct() if self.distinct else qs
 
 
 GRAPHENE_FILTER_SET_OVERRIDES = {
@@ -46,6 +196,10 @@ class GrapheneFilterSetMixin(BaseFilterSet):
         )
     )
 
+    # Filter to-many relations with EXISTS subqueries instead of a JOIN and
+    # DISTINCT, None follows the RELATION_FILTER_EXISTS setting
+    relation_filter_exists = None
+
 
 # To support a Django 1.11 + Python 2.7 combination django-filter must be
 # < 2.x.x. To support the earlier version of django-filter, the
@@ -0,0 +1,274 @@
+import hashlib
+import json
+import random
+from collections import namedtuple
+
+from django.apps import apps
+from django.core.cache import caches
+from django.db import connections, models
+from django.db.models.functions import Lower
+from django_filters.constants import EMPTY_VALUES
+
+from ..settings import graphene_settings
+
+USAGE_KEY = "graphene_django:filter_usage:{}"
+USAGE_MODELS_KEY = "graphene_django:filter_usage_models"
+INDEX_NAME = "gd_{}_{}_idx"
+
+EQUALITY_LOOKUPS = ("exact", "in", "isnull")
+RANGE_LOOKUPS = ("gt", "gte", "lt", "lte", "range", "startswith")
+# Lookups only an index over LOWER(column) can serve
+LOWER_EQUALITY_LOOKUPS = ("iexact",)
+LOWER_RANGE_LOOKUPS = ("istartswith",)
+
+IndexColumn = namedtuple("IndexColumn", ["field", "lower"])
+IndexRequirement = namedtuple("IndexRequirement", ["equality", "tail"])
+Advice = namedtuple("Advice", ["model", "usage", "count", "columns", "name"])
+
+
+def get_cache():
+    return caches[graphene_settings.FILTER_USAGE_CACHE_ALIAS]
+
+
+def get_order_columns(order_by):
+    """ ``(field, lower)`` pairs of the ordering expressions of a filter field """
+    columns = []
+    for order in order_by:
+        expression = order.expression
+        lower = isinstance(expression, Lower)
+        if lower:
+            expression = expression.get_source_expressions()[0]
+        name = getattr(expression, "name", None)
+        if name is not None:
+            columns.append([name, lower])
+    return columns
+
+
+def get_filter_lookups(filterset_class, filter_kwargs):
+    """ ``(field, lookup)`` pairs of the filters applied with ``filter_kwargs``,
+        leaving out the ones whose columns are not known
+    """
+    lookups = []
+    for name, value in filter_kwargs.items():
+        filter_field = filterset_class.base_filters.get(name)
+        if (
+            value in EMPTY_VALUES
+            or filter_field is None
+            or filter_field.method is not None
+            or name in filterset_class.declared_filters
+        ):
+            continue
+        lookups.append([filter_field.field_name, filter_field.lookup_expr])
+    return sorted(lookups)
+
+
+def record_usage(model, filterset_class, filter_kwargs, order_by):
+    """ Count, for a sample of the calls, the filter and ordering combination
+        a filter field queried ``model`` with
+    """
+    rate = graphene_settings.FILTER_USAGE_SAMPLE_RATE
+    if not rate or random.random() >= rate:
+        return
+
+    usage = json.dumps(
+        {
+            "filters": get_filter_lookups(filterset_class, filter_kwargs),
+            "order": get_order_columns(order_by),
+        },
+        sort_keys=True,
+    )
+    cache = get_cache()
+    label = model._meta.label
+    key = USAGE_KEY.format(label)
+    counts = cache.get(key) or {}
+    counts[usage] = counts.get(usage, 0) + 1
+    cache.set(key, counts, timeout=None)
+
+    labels = cache.get(USAGE_MODELS_KEY) or []
+    if label not in labels:
+        cache.set(USAGE_MODELS_KEY, labels + [label], timeout=None)
+
+
+def get_usage():
+    """ Map each sampled model to the counts of its usages """
+    cache = get_cache()
+    usage = {}
+    for label in cache.get(USAGE_MODELS_KEY) or []:
+        counts = cache.get(USAGE_KEY.format(label))
+        if counts:
+            usage[apps.get_model(label)] = {
+                key: (json.loads(key), count) for key, count in counts.items()
+            }
+    return usage
+
+
+def clear_usage():
+    cache = get_cache()
+    labels = cache.get(USAGE_MODELS_KEY) or []
+    cache.delete_many([USAGE_KEY.format(label) for label in labels] + [USAGE_MODELS_KEY])
+
+
+def get_local_field(model, name):
+    """ The concrete field of ``model`` itself named ``name``, None for
+        lookups spanning relations
+    """
+    if name == "pk":
+        return model._meta.pk
+    try:
+        field = model._meta.get_field(name)
+    except Exception:
+        return None
+    return field if field.concrete else None
+
+
+def get_index_requirement(model, usage):
+    """ Columns an index has to start with for the database to both filter
+        and order ``usage`` with it: the equality filters in any order, then
+        one range filter or the ordering
+    """
+    equality = set()
+    ranges = []
+    for name, lookup in usage["filters"]:
+        field = get_local_field(model, name)
+        if field is None:
+            continue
+        if lookup in EQUALITY_LOOKUPS:
+            equality.add(IndexColumn(field.name, False))
+        elif lookup in LOWER_EQUALITY_LOOKUPS:
+            equality.add(IndexColumn(field.name, True))
+        elif lookup in RANGE_LOOKUPS:
+            ranges.append(IndexColumn(field.name, False))
+        elif lookup in LOWER_RANGE_LOOKUPS:
+            ranges.append(IndexColumn(field.name, True))
+
+    if ranges:
+        tail = [ranges[0]]
+    else:
+        tail = []
+        for name, lower in usage["order"]:
+            field = get_local_field(model, name)
+            if field is None:
+                break
+            column = IndexColumn(field.name, lower)
+            if column not in equality and column not in tail:
+                tail.append(column)
+    # The primary key is already the tie breaker of every ordering
+    while tail and not tail[-1].lower and tail[-1].field == model._meta.pk.name:
+        tail.pop()
+    return IndexRequirement(frozenset(equality), tuple(tail))
+
+
+def get_requirement_columns(requirement):
+    return sorted(requirement.equality) + list(requirement.tail)
+
+
+def is_covered(requirement, index):
+    size = len(requirement.equality)
+    return (
+        set(index[:size]) == requirement.equality
+        and tuple(index[size : size + len(requirement.tail)]) == requirement.tail
+    )
+
+
+def get_index_name(model, columns):
+    digest = hashlib.md5(json.dumps(columns).encode("utf-8")).hexdigest()[:8]
+    return INDEX_NAME.format(model._meta.model_name[:10], digest)
+
+
+def get_declared_indexes(model):
+    """ Column lists of the indexes declared on ``model`` """
+    opts = model._meta
+    indexes = []
+    for field in opts.concrete_fields:
+        if field.primary_key or field.unique or field.db_index:
+            indexes.append([IndexColumn(field.name, False)])
+    for fields in list(opts.unique_together) + list(opts.index_together):
+        indexes.append([IndexColumn(name, False) for name in fields])
+    for index in opts.indexes:
+        columns = [IndexColumn(name.lstrip("-"), False) for name in index.fields]
+        # Functional indexes, Django 3.2+
+        for expression in getattr(index, "expressions", ()):
+            expression = getattr(expression, "expression", expression)
+            if isinstance(expression, Lower):
+                source = expression.get_source_expressions()[0]
+                columns.append(IndexColumn(getattr(source, "name", None), True))
+            else:
+                columns.append(IndexColumn(None, False))
+        indexes.append(columns)
+    return indexes
+
+
+def get_database_indexes(model, using):
+    """ Column lists and names of the indexes the database has for ``model`` """
+    connection = connections[using]
+    fields = {field.column: field.name for field in model._meta.concrete_fields}
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, model._meta.db_table
+        )
+    indexes = []
+    for constraint in constraints.values():
+        if constraint["index"] or constraint["unique"] or constraint["primary_key"]:
+            # Expressions are not introspected, they are found by name
+            indexes.append(
+                [IndexColumn(fields.get(column), False) for column in constraint["columns"]]
+            )
+    return indexes, set(constraints)
+
+
+def advise(usage=None, using="default"):
+    """ Indexes missing for the sampled usage, most used first """
+    if usage is None:
+        usage = get_usage()
+
+    advice = []
+    for model, counts in usage.items():
+        indexes = get_declared_indexes(model)
+        database_indexes, names = get_database_indexes(model, using)
+        indexes += database_indexes
+
+        missing = []
+        for key, (model_usage, count) in sorted(counts.items(), key=lambda item: -item[1][1]):
+            requirement = get_index_requirement(model, model_usage)
+            columns = get_requirement_columns(requirement)
+            if not columns:
+                continue
+            name = get_index_name(model, columns)
+            if name in names or any(is_covered(requirement, index) for index in indexes):
+                continue
+            # An index suggested for a more used combination may serve it
+            if any(is_covered(requirement, other.columns) for other in missing):
+                continue
+            missing.append(Advice(model, model_usage, count, columns, name))
+        advice += missing
+    return advice
+
+
+def describe_columns(columns):
+    return ", ".join(
+        "LOWER({})".format(column.field) if column.lower else column.field
+        for column in columns
+    )
+
+
+def get_index_operation(model, columns, name, using="default"):
+    """ Migration operation creating the index over ``columns`` """
+    from django.db import migrations
+
+    if not any(column.lower for column in columns):
+        return migrations.AddIndex(
+            model_name=model._meta.model_name,
+            index=models.Index(fields=[column.field for column in columns], name=name),
+        )
+
+    quote_name = connections[using].ops.quote_name
+    expressions = []
+    for column in columns:
+        sql = quote_name(model._meta.get_field(column.field).column)
+        expressions.append("LOWER({})".format(sql) if column.lower else sql)
+    return migrations.RunSQL(
+        "CREATE INDEX {} ON {} ({})".format(
+            quote_name(name), quote_name(model._meta.db_table), ", ".join(expressions)
+        ),
+        reverse_sql="DROP INDEX {}".format(quote_name(name)),
+    )
@@ -0,0 +1,119 @@
+from django.db.models import Prefetch
+from graphene import Dynamic
+from graphene.utils.str_converters import to_camel_case
+from graphql.error import GraphQLError
+from graphql.execution.values import get_argument_values
+
+from ..utils import get_model_fields
+from ..utils.selection import get_sub_fields
+
+PREFETCH_ATTR_PREFIX = "_graphene_prefetch_"
+
+
+def get_prefetch_attr(response_key):
+    """ Attribute a prefetched nested list is stored under on its parent """
+    return PREFETCH_ATTR_PREFIX + response_key
+
+
+def get_graphql_fields(_type, info):
+    """ Map the GraphQL field names of a DjangoObjectType to their python
+        name and graphene field
+    """
+    auto_camelcase = getattr(info.schema, "auto_camelcase", True)
+    fields = {}
+    for name, field in _type._meta.fields.items():
+        graphql_name = getattr(field, "name", None) or (
+            to_camel_case(name) if auto_camelcase else name
+        )
+        fields[graphql_name] = (name, field)
+    return fields
+
+
+def optimize_queryset(queryset, _type, field_asts, info):
+    """ Add ``select_related`` for the to-one relations and ``Prefetch``
+        objects for the nested lists selected under ``field_asts``, so that
+        they are loaded with the queryset instead of once per row
+    """
+    select_related = []
+    prefetches = []
+    collect_related(_type, field_asts, info, "", select_related, prefetches)
+
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetches:
+        queryset = queryset.prefetch_related(*prefetches)
+    return queryset
+
+
+def collect_related(_type, field_asts, info, prefix, select_related, prefetches):
+    from .fields import DjangoInnerListField
+
+    registry = _type._meta.registry
+    model_fields = dict(get_model_fields(_type._meta.model))
+    graphql_fields = get_graphql_fields(_type, info)
+    graphql_type = info.schema.get_type(_type._meta.name)
+
+    for response_key, selections in get_sub_fields(field_asts, info.fragments).items():
+        graphql_name = selections[0].name.value
+        if graphql_name not in graphql_fields:
+            continue
+
+        name, field = graphql_fields[graphql_name]
+        model_field = model_fields.get(name)
+        # Custom resolvers may return anything, leave them alone
+        if (
+            model_field is None
+            or not model_field.is_relation
+            or hasattr(_type, "resolve_{}".format(name))
+        ):
+            continue
+
+        if isinstance(field, Dynamic):
+            field = field.get_type()
+        if field is None:
+            continue
+
+        if model_field.many_to_many or model_field.one_to_many:
+            if not isinstance(field, DjangoInnerListField):
+                continue
+
+            args = get_argument_values(
+                graphql_type.fields[graphql_name].args,
+                selections[0].arguments,
+                info.variable_values,
+            )
+            try:
+                limit, offset = field.pop_page_args(field.inner_type, info, args)
+            except GraphQLError:
+                # Left to the nested resolver, which reports the error on the
+                # path and with the name of its own field
+                continue
+            if limit or offset:
+                # Paged lists are paged per parent in the database by the
+                # batch loader instead of fetching every related row of every
+                # parent
+                continue
+
+            queryset = field.get_queryset(field.inner_type, info, args)
+            queryset = optimize_queryset(queryset, field.inner_type, selections, info)
+            prefetches.append(
+                Prefetch(
+                    prefix + name,
+                    queryset=queryset,
+                    to_attr=get_prefetch_attr(response_key),
+                )
+            )
+        else:
+            related_type = registry.get_type_for_model(model_field.related_model)
+            if related_type is None:
+                continue
+
+            select_related.append(prefix + name)
+            collect_related(
+                related_type,
+                selections,
+                info,
+                prefix + name + "__",
+                select_related,
+                prefetches,
+            )
@@ -0,0 +1,156 @@
+import hashlib
+
+from django.core.cache import caches
+
+from ..settings import graphene_settings
+from .filterset import get_id_list_q
+from .versions import get_model_tables, get_table_versions
+
+SCOPES_ATTR = "_graphene_permission_scopes"
+SCOPE_KEY = "graphene_django:permission_scope:{}"
+
+
+def get_scope_key(permission, user, info):
+    """ What the scope of ``permission`` depends on besides the database,
+        the user by default. A permission class scoping by something else
+        defines ``get_scope_key(user, info)``
+    """
+    get_key = getattr(permission, "get_scope_key", None)
+    if get_key is not None:
+        return get_key(user, info)
+    return getattr(user, "pk", None)
+
+
+def get_scope_dependencies(permission, user):
+    """ Models whose rows the scope of ``permission`` is computed from, set
+        with ``scope_dependencies`` or ``get_scope_dependencies(user)`` on the
+        permission class. None keeps the scope out of the shared cache
+    """
+    get_dependencies = getattr(permission, "get_scope_dependencies", None)
+    if get_dependencies is not None:
+        return get_dependencies(user)
+    return getattr(permission, "scope_dependencies", None)
+
+
+def get_shared_scope_key(permission, scope_key, tables):
+    versions = get_table_versions(tables)
+    if versions is None:
+        return None
+    permission_class = type(permission)
+    digest = hashlib.sha1()
+    parts = [permission_class.__module__, permission_class.__qualname__, repr(scope_key)]
+    for part in parts + versions:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return SCOPE_KEY.format(digest.hexdigest())
+
+
+def get_shared_scope(permission, model, user, info, scope_key, dependencies):
+    """ The scope cached across requests until one of ``dependencies`` is
+        written to, either as its query or, with ``cache_scope_ids = True`` on
+        the permission class, as the IDs it selects
+    """
+    cache = caches[graphene_settings.PERMISSION_SCOPE_CACHE_ALIAS]
+    cache_ids = getattr(permission, "cache_scope_ids", False)
+    tables = set()
+    for dependency in dependencies:
+        tables.update(get_model_tables(dependency))
+    if cache_ids:
+        # The IDs are only valid as long as the rows of the model are
+        tables.update(get_model_tables(model))
+
+    key = get_shared_scope_key(permission, scope_key, sorted(tables))
+    if key is None:
+        return permission.viewable(user, info=info)
+    cached = cache.get(key)
+    if cached is None:
+        qs = permission.viewable(user, info=info)
+        if cache_ids:
+            cached = ("ids", qs.db, list(qs.values_list("pk", flat=True)))
+        else:
+            # Pickling the query does not run it
+            cached = ("query", qs.db, qs.query)
+        cache.set(key, cached, graphene_settings.PERMISSION_SCOPE_CACHE_TIMEOUT)
+        return qs
+
+    kind, using, value = cached
+    qs = model._base_manager.using(using).all()
+    if kind == "ids":
+        return qs.filter(get_id_list_q(model, model._meta.pk.name, value, using))
+    qs.query = value
+    return qs
+
+
+def get_request_scopes(permission, info):
+    """ The scopes memoized on the request, None when they are not to be.
+        A permission class opts in with ``cache_scope = True``, or out with
+        ``cache_scope = False`` when ``PERMISSION_SCOPE_CACHE`` is on
+    """
+    cache_scope = getattr(permission, "cache_scope", None)
+    if cache_scope is None:
+        cache_scope = graphene_settings.PERMISSION_SCOPE_CACHE
+    if not cache_scope or info.context is None:
+        return None
+    scopes = getattr(info.context, SCOPES_ATTR, None)
+    if scopes is None:
+        scopes = {}
+        setattr(info.context, SCOPES_ATTR, scopes)
+    return scopes
+
+
+def get_viewable(_type, info):
+    """ The queryset ``_type``'s permission class lets the user see.
+
+    For permission classes opting in, the scope is computed once per
+    request and scope key, and shared across requests when enabled and the
+    permission class declares its dependencies. The rest of ``info`` is then
+    ignored: a scope depending on the arguments, the path or the request
+    must be part of the scope key.
+    """
+    permission = _type._meta.permission_class()
+    user = info.context.user
+    scopes = get_request_scopes(permission, info)
+    if scopes is None:
+        return permission.viewable(user, info=info)
+
+    scope_key = get_scope_key(permission, user, info)
+    key = (type(permission), _type._meta.model, scope_key)
+    if key not in scopes:
+        dependencies = get_scope_dependencies(permission, user)
+        if graphene_settings.PERMISSION_SCOPE_SHARED_CACHE and dependencies is not None:
+            scopes[key] = get_shared_scope(
+                permission, _type._meta.model, user, info, scope_key, dependencies
+            )
+        else:
+            scopes[key] = permission.viewable(user, info=info)
+    return scopes[key]
+
+
+def get_viewable_q(_type, info):
+    """ The scope of ``_type``'s permission class as a ``Q`` object, from its
+        ``viewable_q(user, info=None)``. None when it has no such method
+    """
+    permission = _type._meta.permission_class()
+    viewable_q = getattr(permission, "viewable_q", None)
+    if viewable_q is None:
+        return None
+    user = info.context.user
+    scopes = get_request_scopes(permission, info)
+    if scopes is None:
+        return viewable_q(user, info=info)
+
+    key = (type(permission), _type._meta.model, get_scope_key(permission, user, info), "q")
+    if key not in scopes:
+        scopes[key] = viewable_q(user, info=info)
+    return scopes[key]
+
+
+def scope_queryset(queryset, _type, info):
+    """ ``queryset`` narrowed down to what ``_type``'s permission class lets
+        the user see. Filtering with the ``Q`` of the scope keeps a single
+        flat query, intersecting with the scope queryset is the fallback
+    """
+    q = get_viewable_q(_type, info)
+    if q is None:
+        return queryset & get_viewable(_type, info)
+    return queryset.filter(q)
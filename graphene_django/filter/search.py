@@ -0,0 +1,329 @@
+import hashlib
+import operator
+import re
+from functools import reduce
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+from django.db.backends.utils import truncate_name
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.models.sql import Query
+
+from ..settings import graphene_settings
+
+FTS_TABLE = "{}_search_{}"
+SEARCH_VECTOR_ANNOTATION = "_graphene_search_vector"
+
+_backend = None
+
+
+class SearchBackend(object):
+    """ Full-text search of the ``search`` argument of filter fields.
+
+    ``search`` returns the queryset narrowed down to the rows matching the
+    query along with an expression ranking them, better matches higher, or
+    None when the backend does not rank.
+    """
+
+    def register(self, model, fields):
+        """ Called once per type declaring ``search_fields``, when the schema
+            is built
+        """
+
+    def create_tables(self, using=DEFAULT_DB_ALIAS, rebuild=False):
+        """ Create the tables the registered fields are searched through on
+            the ``using`` database, return the names of the ones created. Run
+            by the ``graphene_search_tables`` command
+        """
+        return []
+
+    def search(self, queryset, fields, query):
+        """ Return ``queryset`` narrowed down to the rows of ``fields``
+            matching ``query``, and the expression ranking them or None
+        """
+        raise NotImplementedError
+
+
+class SimpleSearchBackend(SearchBackend):
+    """ ``icontains`` on every field, unranked. Used by databases without a
+        dedicated backend.
+    """
+
+    def search(self, queryset, fields, query):
+        condition = reduce(
+            operator.or_, (Q(**{field + "__icontains": query}) for field in fields)
+        )
+        return queryset.filter(condition), None
+
+
+class PostgresSearchBackend(SearchBackend):
+    """ Match a ``SearchVector`` over the fields and rank with ``SearchRank``.
+
+    The vector is built with the text search ``config``, which makes it
+    IMMUTABLE: the ``graphene_search_tables`` command creates a GIN index
+    over the same expression, which keeps the match from scanning the table.
+    """
+
+    config = "english"
+
+    def __init__(self):
+        self.registered = set()
+
+    def register(self, model, fields):
+        self.registered.add((model, tuple(fields)))
+
+    def get_config(self):
+        if not self.config:
+            raise ImproperlyConfigured(
+                "{} needs a text search config, without one the search vector "
+                "cannot be indexed.".format(type(self).__name__)
+            )
+        return self.config
+
+    def get_vector(self, fields):
+        from django.contrib.postgres.search import SearchVector
+
+        return SearchVector(*fields, config=self.get_config())
+
+    def get_index(self, model, fields):
+        digest = hashlib.md5(",".join(fields).encode("utf-8")).hexdigest()[:6]
+        return FTS_TABLE.format(model._meta.db_table, digest)
+
+    def get_index_sql(self, model, fields, schema_editor):
+        """ The indexed expression, compiled by Django like the one the search
+            filters on so that the planner matches them
+        """
+        connection = schema_editor.connection
+        query = Query(model, alias_cols=False)
+        vector = self.get_vector(fields).resolve_expression(query)
+        sql, params = vector.as_sql(query.get_compiler(connection=connection), connection)
+        return sql % tuple(schema_editor.quote_value(param) for param in params)
+
+    def index_exists(self, connection, index):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_class WHERE relkind = 'i' AND relname = %s", [index]
+            )
+            return cursor.fetchone() is not None
+
+    def create_tables(self, using=DEFAULT_DB_ALIAS, rebuild=False):
+        """ Create the GIN index of every registered vector. The indexes are
+            kept up to date by PostgreSQL, ``rebuild`` has nothing to refill
+        """
+        connection = connections[using]
+        quote_name = connection.ops.quote_name
+        created = []
+        with connection.schema_editor() as schema_editor:
+            for model, fields in self.registered:
+                index = truncate_name(
+                    self.get_index(model, fields), connection.ops.max_name_length()
+                )
+                if self.index_exists(connection, index):
+                    continue
+                schema_editor.execute(
+                    "CREATE INDEX {} ON {} USING gin ({})".format(
+                        quote_name(index),
+                        quote_name(model._meta.db_table),
+                        self.get_index_sql(model, fields, schema_editor),
+                    ),
+                    params=None,
+                )
+                created.append(index)
+        return created
+
+    def search(self, queryset, fields, query):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        vector = self.get_vector(fields)
+        search_query = SearchQuery(query, config=self.get_config())
+        # Filtering through the annotation leaves the resolved vector in the
+        # WHERE clause, so the queryset can still be combined with &
+        queryset = queryset.annotate(**{SEARCH_VECTOR_ANNOTATION: vector})
+        queryset = queryset.filter(**{SEARCH_VECTOR_ANNOTATION: search_query})
+        return queryset, SearchRank(vector, search_query)
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """ Join an FTS5 shadow table and rank with its ``bm25`` rank.
+
+    The shadow table holds the fields of every row under its primary key. It
+    is created and filled by the ``graphene_search_tables`` command, along
+    with triggers keeping it in sync with every write to the model's table,
+    ``QuerySet.update()`` and ``bulk_create()`` included. Only the model's
+    own fields can be indexed, and its primary key must be an integer. Until
+    the table is created, the search falls back to ``icontains``.
+    """
+
+    def __init__(self):
+        self.registered = set()
+        # The shadow tables known to exist, per database alias. A missing
+        # table is looked up again, it can be created by another process
+        self.tables = {}
+
+    def get_table(self, model, fields):
+        digest = hashlib.md5(",".join(fields).encode("utf-8")).hexdigest()[:6]
+        return FTS_TABLE.format(model._meta.db_table, digest)
+
+    def register(self, model, fields):
+        self.registered.add((model, tuple(fields)))
+
+    def table_exists(self, connection, table):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [table]
+            )
+            return cursor.fetchone() is not None
+
+    def has_table(self, connection, table):
+        """ Whether ``table`` exists, only looked up until it does """
+        key = (connection.alias, table)
+        if key not in self.tables and self.table_exists(connection, table):
+            self.tables[key] = True
+        return key in self.tables
+
+    def create_tables(self, using=DEFAULT_DB_ALIAS, rebuild=False):
+        connection = connections[using]
+        quote_name = connection.ops.quote_name
+        created = []
+        with transaction.atomic(using=using):
+            for model, fields in self.registered:
+                table = self.get_table(model, fields)
+                exists = self.table_exists(connection, table)
+                if not exists:
+                    columns = ", ".join(quote_name(field) for field in fields)
+                    with connection.cursor() as cursor:
+                        cursor.execute(
+                            "CREATE VIRTUAL TABLE {} USING fts5({})".format(
+                                quote_name(table), columns
+                            )
+                        )
+                    created.append(table)
+                self.create_triggers(model, fields, using)
+                if rebuild or not exists:
+                    self.rebuild(model, fields, using)
+        for model, fields in self.registered:
+            self.tables[(using, self.get_table(model, fields))] = True
+        return created
+
+    def create_triggers(self, model, fields, using=DEFAULT_DB_ALIAS):
+        """ Mirror the inserts, updates and deletes of the model's table in
+            the shadow table
+        """
+        connection = connections[using]
+        quote_name = connection.ops.quote_name
+        opts = model._meta
+        table = self.get_table(model, fields)
+        pk = quote_name(opts.pk.column)
+        delete = "DELETE FROM {} WHERE rowid = old.{};".format(quote_name(table), pk)
+        insert = "INSERT INTO {} (rowid, {}) VALUES (new.{}, {});".format(
+            quote_name(table),
+            ", ".join(quote_name(field) for field in fields),
+            pk,
+            ", ".join(
+                "new." + quote_name(opts.get_field(field).column) for field in fields
+            ),
+        )
+        triggers = (
+            ("insert", "AFTER INSERT", insert),
+            ("update", "AFTER UPDATE", delete + " " + insert),
+            ("delete", "AFTER DELETE", delete),
+        )
+        with connection.cursor() as cursor:
+            for name, event, statements in triggers:
+                cursor.execute(
+                    "CREATE TRIGGER IF NOT EXISTS {} {} ON {} BEGIN {} END".format(
+                        quote_name("{}_{}".format(table, name)),
+                        event,
+                        quote_name(opts.db_table),
+                        statements,
+                    )
+                )
+
+    def rebuild(self, model, fields, using=DEFAULT_DB_ALIAS):
+        """ Refill the shadow table from the model's table """
+        connection = connections[using]
+        quote_name = connection.ops.quote_name
+        opts = model._meta
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM {}".format(quote_name(self.get_table(model, fields))))
+            cursor.execute(
+                "INSERT INTO {} (rowid, {}) SELECT {}, {} FROM {}".format(
+                    quote_name(self.get_table(model, fields)),
+                    ", ".join(quote_name(field) for field in fields),
+                    quote_name(opts.pk.column),
+                    ", ".join(quote_name(opts.get_field(field).column) for field in fields),
+                    quote_name(opts.db_table),
+                )
+            )
+
+    def get_match_query(self, query):
+        """ FTS5 query matching every word, the last one as a prefix, without
+            letting the FTS5 syntax through
+        """
+        words = re.findall(r"\w+", query)
+        if not words:
+            return None
+        terms = ['"{}"'.format(word) for word in words]
+        terms[-1] += "*"
+        return " ".join(terms)
+
+    def search(self, queryset, fields, query):
+        connection = connections[queryset.db]
+        table = self.get_table(queryset.model, fields)
+        if not self.has_table(connection, table):
+            return SimpleSearchBackend().search(queryset, fields, query)
+
+        match = self.get_match_query(query)
+        if match is None:
+            return queryset.none(), None
+
+        quote_name = connection.ops.quote_name
+        opts = queryset.model._meta
+        # Joined rather than matched in a subquery per row, so that the rank
+        # is read from the row of the match
+        queryset = queryset.extra(
+            tables=[table],
+            where=[
+                "{0}.rowid = {1}.{2}".format(
+                    quote_name(table), quote_name(opts.db_table), quote_name(opts.pk.column)
+                ),
+                "{0} MATCH %s".format(quote_name(table)),
+            ],
+            params=[match],
+        )
+        # bm25 ranks better matches lower
+        rank = RawSQL(
+            "-{}.rank".format(quote_name(table)), (), output_field=models.FloatField()
+        )
+        return queryset, rank
+
+
+class DatabaseSearchBackend(SearchBackend):
+    """ The backend of the database each queryset runs on """
+
+    backends = {
+        "postgresql": PostgresSearchBackend(),
+        "sqlite": SQLiteSearchBackend(),
+    }
+    default = SimpleSearchBackend()
+
+    def register(self, model, fields):
+        for backend in self.backends.values():
+            backend.register(model, fields)
+
+    def create_tables(self, using=DEFAULT_DB_ALIAS, rebuild=False):
+        vendor = connections[using].vendor
+        return self.backends.get(vendor, self.default).create_tables(using, rebuild)
+
+    def search(self, queryset, fields, query):
+        vendor = connections[queryset.db].vendor
+        return self.backends.get(vendor, self.default).search(queryset, fields, query)
+
+
+def get_search_backend():
+    global _backend
+    backend_class = graphene_settings.SEARCH_BACKEND
+    if _backend is None or type(_backend) is not backend_class:
+        _backend = backend_class()
+    return _backend
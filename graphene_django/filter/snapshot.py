@@ -0,0 +1,64 @@
+import hashlib
+import json
+import uuid
+
+from django.core.cache import caches
+from graphql.error import GraphQLError
+
+from ..settings import graphene_settings
+from .permissions import get_scope_key
+
+SNAPSHOT_KEY = "graphene_django:snapshot:{}"
+
+
+def get_cache():
+    return caches[graphene_settings.FILTER_FIELD_SNAPSHOT_CACHE_ALIAS]
+
+
+def get_snapshot_fingerprint(_type, info, kwargs):
+    """ What a snapshot was taken of: the type, the filtering and ordering
+        arguments and the permission scope of the user
+    """
+    permission = _type._meta.permission_class()
+    scope_key = get_scope_key(permission, info.context.user, info)
+    data = json.dumps(
+        [_type._meta.name, kwargs, repr(scope_key)], sort_keys=True, default=str
+    )
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+def take_snapshot(queryset, fingerprint):
+    """ Store the ordered primary keys of ``queryset``, return the token they
+        are stored under and the keys
+    """
+    max_size = graphene_settings.FILTER_FIELD_SNAPSHOT_MAX_SIZE
+    ids = queryset.values_list("pk", flat=True)
+    if max_size:
+        ids = ids[: max_size + 1]
+    ids = list(ids)
+    if max_size and len(ids) > max_size:
+        raise GraphQLError(
+            "Cannot take a snapshot of more than {} records".format(max_size)
+        )
+
+    token = uuid.uuid4().hex
+    get_cache().set(
+        SNAPSHOT_KEY.format(token),
+        {"fingerprint": fingerprint, "ids": ids},
+        graphene_settings.FILTER_FIELD_SNAPSHOT_TIMEOUT,
+    )
+    return token, ids
+
+
+def load_snapshot(token, fingerprint):
+    """ The primary keys stored under ``token``, taken with the same
+        arguments and scope
+    """
+    snapshot = get_cache().get(SNAPSHOT_KEY.format(token))
+    if snapshot is None:
+        raise GraphQLError("Snapshot `{}` does not exist or expired".format(token))
+    if snapshot["fingerprint"] != fingerprint:
+        raise GraphQLError(
+            "Snapshot `{}` was taken with other arguments".format(token)
+        )
+    return snapshot["ids"]
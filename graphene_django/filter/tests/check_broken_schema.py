@@ -0,0 +1,12 @@
+import graphene
+from graphene_django import DjangoObjectType
+from graphene_django.tests.models import Reporter
+
+
+class ReporterType(DjangoObjectType):
+    class Meta:
+        model = Reporter
+        filter_fields = ["first_name"]
+
+
+schema = graphene.Schema(query=ReporterType)
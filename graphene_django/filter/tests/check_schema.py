@@ -0,0 +1,24 @@
+import graphene
+from graphene_django import DjangoObjectType
+from graphene_django.filter import DjangoFilterField
+from graphene_django.tests.models import Reporter
+
+
+class ReporterPermission(object):
+    def viewable(self, user, info=None):
+        return Reporter.objects.all()
+
+
+class ReporterType(DjangoObjectType):
+    class Meta:
+        model = Reporter
+        permission_class = ReporterPermission
+        filter_fields = ["first_name"]
+        order_fields = ["first_name"]
+
+
+class Query(graphene.ObjectType):
+    reporters = DjangoFilterField(ReporterType)
+
+
+schema = graphene.Schema(query=Query)
@@ -0,0 +1,52 @@
+from datetime import date, datetime
+
+import pytest
+from django.test import RequestFactory
+
+from graphene_django.tests.models import Article, Film, Reporter
+
+
+class AllowAllPermission(object):
+    model = None
+
+    def viewable(self, user, info=None):
+        return self.model.objects.all()
+
+
+def permission_for(model, base=AllowAllPermission, **attrs):
+    """ Permission class of ``model`` deriving from ``base`` """
+    attrs["model"] = model
+    return type("{}Permission".format(model.__name__), (base,), attrs)
+
+
+def get_context():
+    request = RequestFactory().get("/graphql")
+    request.user = None
+    return request
+
+
+@pytest.fixture
+def reporters():
+    """ Three reporters, each in a film of their own and writing two
+        articles
+    """
+    reporters = []
+    for i in range(3):
+        reporter = Reporter.objects.create(
+            first_name="First {}".format(i),
+            last_name="Last {}".format(i),
+            email="r{}@example.com".format(i),
+        )
+        film = Film.objects.create()
+        film.reporters.add(reporter)
+        for j in range(2):
+            Article.objects.create(
+                headline="Headline {} {}".format(i, j),
+                pub_date=date(2020, 1, 1),
+                pub_date_time=datetime(2020, 1, 1),
+                reporter=reporter,
+                editor=reporter,
+                importance=j + 1,
+            )
+        reporters.append(reporter)
+    return reporters
@@ -0,0 +1,153 @@
+import json
+from collections import namedtuple
+from datetime import date, datetime
+
+import pytest
+from django.test import RequestFactory
+
+import graphene
+from graphql.error import GraphQLError
+
+from graphene_django import DjangoObjectType
+from graphene_django.export import ExportWindow
+from graphene_django.tests.models import Article, Reporter
+from graphene_django.utils import DJANGO_FILTER_INSTALLED
+from graphene_django.views import GraphQLExportView
+
+from .conftest import AllowAllPermission, permission_for
+
+pytestmark = []
+
+if DJANGO_FILTER_INSTALLED:
+    from graphene_django.filter import DjangoFilterField
+else:
+    pytestmark.append(
+        pytest.mark.skipif(
+            True, reason="django_filters not installed or not compatible"
+        )
+    )
+
+
+class ReporterPermission(AllowAllPermission):
+    def viewable(self, user, info=None):
+        return Reporter.objects.exclude(last_name="Hidden")
+
+
+def get_view(**kwargs):
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            permission_class = permission_for(Reporter, ReporterPermission)
+            filter_fields = {"first_name": ["icontains"]}
+            order_fields = ["first_name"]
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            permission_class = permission_for(Article)
+            filter_fields = ["headline"]
+            order_fields = ["importance", "pub_date_time"]
+
+    class Query(graphene.ObjectType):
+        reporters = DjangoFilterField(ReporterType)
+        articles = DjangoFilterField(ArticleType)
+        hello = graphene.String()
+
+    class Mutation(graphene.ObjectType):
+        noop = graphene.String()
+
+    schema = graphene.Schema(query=Query, mutation=Mutation)
+    return GraphQLExportView.as_view(schema=schema, **kwargs)
+
+
+def export(view, query):
+    request = RequestFactory().post(
+        "/export", json.dumps({"query": query}), content_type="application/json"
+    )
+    request.user = None
+    return view(request)
+
+
+def test_export_streams_filtered_objects_in_chunks(reporters, django_assert_num_queries):
+    Reporter.objects.create(first_name="First 9", last_name="Hidden", email="")
+    view = get_view(chunk_size=1)
+    query = """
+        query {
+            reporters(
+                firstName_Icontains: "first",
+                orderBy: [{field: firstName, direction: DESC}],
+                limit: 1
+            ) {
+                objects { firstName }
+            }
+        }
+    """
+    # Three chunks of one row, each fetching one row more
+    with django_assert_num_queries(3):
+        response = export(view, query)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in lines] == [
+        {"firstName": "First {}".format(i)} for i in (2, 1, 0)
+    ]
+
+
+def test_export_rejects_other_operations(reporters):
+    view = get_view()
+    response = export(view, "mutation { noop }")
+    assert response.status_code == 405
+
+    response = export(view, "query { hello }")
+    assert response.status_code == 400
+    assert "single DjangoFilterField" in response.content.decode()
+
+    response = export(view, "query { reporters { unknown } }")
+    assert response.status_code == 400
+
+
+@pytest.fixture
+def articles(reporters):
+    reporter = Reporter.objects.first()
+    for i in range(5):
+        Article.objects.create(
+            headline="Headline {}".format(i),
+            pub_date=date(2020, 1, 1),
+            pub_date_time=datetime(2020, 1, 1, 0, 0, 0, 999 - i),
+            reporter=reporter,
+            editor=reporter,
+            importance=None if i % 2 else i,
+        )
+
+
+@pytest.mark.parametrize(
+    "order_by, ordering",
+    [
+        ("{field: pubDateTime}", ("pub_date_time", "pk")),
+        ("{field: importance}", ("importance", "pk")),
+        ("{field: importance, direction: DESC}", ("-importance", "pk")),
+    ],
+)
+def test_export_pages_through_microseconds_and_nulls(articles, order_by, ordering):
+    view = get_view(chunk_size=2)
+    response = export(
+        view, "query { articles(orderBy: [%s]) { objects { headline } } }" % order_by
+    )
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"headline": headline}
+        for headline in Article.objects.order_by(*ordering).values_list(
+            "headline", flat=True
+        )
+    ]
+
+
+def test_export_window_stops_when_the_cursor_does_not_advance(reporters):
+    Page = namedtuple("Page", ["rows", "has_next_page"])
+    reporter = Reporter.objects.first()
+    window = ExportWindow(chunk_size=1)
+
+    window.set_page(Page([reporter], True), ["pk"])
+    assert window.advance()
+    window.set_page(Page([reporter], True), ["pk"])
+    with pytest.raises(GraphQLError):
+        window.advance()
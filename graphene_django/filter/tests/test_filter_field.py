@@ -0,0 +1,792 @@
+from datetime import date, datetime
+from io import StringIO
+
+import mock
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import transaction
+
+import graphene
+from graphene_django import DjangoObjectType
+from graphene_django.tests.models import Article, Film, Reporter
+from graphene_django.utils import DJANGO_FILTER_INSTALLED
+
+from .conftest import get_context, permission_for
+
+pytestmark = []
+
+if DJANGO_FILTER_INSTALLED:
+    from graphene_django.filter import DjangoFilterField
+    from graphene_django.filter.fields import get_type_filtering
+    from graphene_django.filter.search import DatabaseSearchBackend
+    from graphene_django.filter.versions import (
+        VERSION_KEY,
+        TableVersionBump,
+        get_cache,
+        get_table_versions,
+        has_uncommitted_writes,
+    )
+else:
+    pytestmark.append(
+        pytest.mark.skipif(
+            True, reason="django_filters not installed or not compatible"
+        )
+    )
+
+
+def get_schema(**reporter_options):
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            permission_class = permission_for(Reporter)
+            filter_fields = reporter_options.get(
+                "filter_fields", {"first_name": ["exact", "icontains"]}
+            )
+            order_fields = ["first_name"]
+            aggregate_fields = reporter_options.get("aggregate_fields")
+            max_limit = reporter_options.get("max_limit")
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            permission_class = permission_for(Article)
+            filter_fields = ["headline"]
+            order_fields = ["headline", "importance", "pub_date_time"]
+            aggregate_fields = ["importance", "pub_date", "reporter"]
+            search_fields = ["headline"]
+
+    class FilmType(DjangoObjectType):
+        class Meta:
+            model = Film
+            permission_class = permission_for(Film)
+            filter_fields = ["genre"]
+
+    class Query(graphene.ObjectType):
+        reporters = DjangoFilterField(ReporterType)
+        articles = DjangoFilterField(ArticleType)
+        all_reporters = graphene.List(ReporterType)
+
+        def resolve_all_reporters(self, info):
+            return Reporter.objects.order_by("pk")
+
+    return graphene.Schema(query=Query)
+
+
+def test_filtering_types_are_shared_per_object_type():
+    schema = get_schema()
+    reporter_type = schema.get_type("ReporterType")
+    film_type = schema.get_type("FilmType")
+
+    top_level = schema.get_query_type().fields["reporters"].args["orderBy"]
+    pets = reporter_type.fields["pets"].args["orderBy"]
+    reporters = film_type.fields["reporters"].args["orderBy"]
+    assert top_level.type.of_type is pets.type.of_type is reporters.type.of_type
+    assert top_level.type.of_type.name == "ReporterTypeOrderingFilterObject"
+    assert not [name for name in schema.get_type_map() if "_OrderingFilter" in name]
+
+
+def test_filter_field_filters_and_orders(reporters):
+    schema = get_schema()
+    result = schema.execute(
+        """
+        query {
+            reporters(firstName_Icontains: "first", orderBy: [{field: firstName, direction: DESC}]) {
+                objects { firstName }
+            }
+        }
+        """,
+        context_value=get_context(),
+    )
+    assert not result.errors
+    assert result.data["reporters"]["objects"] == [
+        {"firstName": "First 2"},
+        {"firstName": "First 1"},
+        {"firstName": "First 0"},
+    ]
+
+
+def test_filter_field_applies_builtin_filters_without_form(reporters):
+    schema = get_schema()
+    filtering = get_type_filtering(schema.get_type("ReporterType").graphene_type)
+    compiled = filtering.compiled_filterset
+    assert set(compiled.filters) == {"first_name", "first_name__icontains"}
+
+    with mock.patch.object(
+        filtering.filterset_class, "__init__", side_effect=AssertionError
+    ):
+        result = schema.execute(
+            'query { reporters(firstName_Icontains: " first 1 ") { objects { firstName } } }',
+            context_value=get_context(),
+        )
+    assert not result.errors
+    assert result.data["reporters"]["objects"] == [{"firstName": "First 1"}]
+
+
+def test_filter_field_prefetches_selected_relations(
+    reporters, django_assert_num_queries
+):
+    schema = get_schema()
+    query = """
+        query {
+            reporters {
+                objects {
+                    firstName
+                    films { id }
+                    ...ReporterArticles
+                }
+            }
+        }
+        fragment ReporterArticles on ReporterType {
+            latest: articles(orderBy: [{field: headline, direction: DESC}], limit: 1) {
+                headline
+                reporter { firstName }
+            }
+            articles { headline }
+        }
+    """
+    # reporters, films and articles, then the latest article of every
+    # reporter numbered by ROW_NUMBER() and fetched joined to its reporter
+    with django_assert_num_queries(5) as captured:
+        result = schema.execute(query, context_value=get_context())
+
+    assert not result.errors
+    assert "ROW_NUMBER()" in captured.captured_queries[3]["sql"]
+    first = result.data["reporters"]["objects"][0]
+    assert first["films"] == [{"id": str(reporters[0].films.get().pk)}]
+    assert first["latest"] == [
+        {"headline": "Headline 0 1", "reporter": {"firstName": "First 0"}}
+    ]
+    assert first["articles"] == [
+        {"headline": "Headline 0 0"},
+        {"headline": "Headline 0 1"},
+    ]
+
+
+def test_filter_field_counts_total_only_when_selected(
+    reporters, django_assert_num_queries
+):
+    schema = get_schema()
+    query = "query { reporters(limit: 2) { objects { firstName } pageInfo { hasNextPage } } }"
+    with django_assert_num_queries(1):
+        result = schema.execute(query, context_value=get_context())
+    assert not result.errors
+    assert len(result.data["reporters"]["objects"]) == 2
+    assert result.data["reporters"]["pageInfo"] == {"hasNextPage": True}
+
+    query = "query { reporters(limit: 2, offset: 2) { pageInfo { hasNextPage total } } }"
+    with django_assert_num_queries(2):
+        result = schema.execute(query, context_value=get_context())
+    assert not result.errors
+    assert result.data["reporters"]["pageInfo"] == {"hasNextPage": False, "total": 3}
+
+
+def test_filter_field_reads_total_from_window(
+    graphene_settings, reporters, django_assert_num_queries
+):
+    graphene_settings.FILTER_FIELD_WINDOW_TOTAL = True
+    schema = get_schema()
+    query = """
+        query Reporters($offset: Int) {
+            reporters(limit: 2, offset: $offset) {
+                objects { firstName }
+                pageInfo { total }
+            }
+        }
+    """
+    with django_assert_num_queries(1):
+        result = schema.execute(query, context_value=get_context())
+    assert not result.errors
+    assert result.data["reporters"]["pageInfo"] == {"total": 3}
+
+    # An empty page past the first one falls back to counting
+    with django_assert_num_queries(2):
+        result = schema.execute(
+            query, variable_values={"offset": 5}, context_value=get_context()
+        )
+    assert not result.errors
+    assert result.data["reporters"] == {"objects": [], "pageInfo": {"total": 3}}
+
+
+def test_filter_field_caches_total_until_table_changes(
+    graphene_settings, reporters, commit, django_assert_num_queries
+):
+    graphene_settings.FILTER_FIELD_COUNT_CACHE = True
+    caches[graphene_settings.FILTER_FIELD_COUNT_CACHE_ALIAS].clear()
+    schema = get_schema()
+    query = "query { reporters(limit: 1) { pageInfo { total } } }"
+
+    def get_total():
+        result = schema.execute(query, context_value=get_context())
+        assert not result.errors
+        return result.data["reporters"]["pageInfo"]["total"]
+
+    commit()
+    with django_assert_num_queries(1):
+        assert get_total() == 3
+    with django_assert_num_queries(0):
+        assert get_total() == 3
+
+    Reporter.objects.create(first_name="First 3", last_name="Last 3", email="")
+    commit()
+    with django_assert_num_queries(1):
+        assert get_total() == 4
+
+    # Counts over other filters and tables are cached apart
+    result = schema.execute(
+        'query { reporters(firstName: "First 3") { pageInfo { total } } }',
+        context_value=get_context(),
+    )
+    assert result.data["reporters"]["pageInfo"]["total"] == 1
+
+
+def test_filter_field_does_not_cache_uncommitted_totals(
+    graphene_settings, reporters, commit, django_assert_num_queries
+):
+    graphene_settings.FILTER_FIELD_COUNT_CACHE = True
+    caches[graphene_settings.FILTER_FIELD_COUNT_CACHE_ALIAS].clear()
+    schema = get_schema()
+    query = "query { reporters(limit: 1) { pageInfo { total } } }"
+
+    def get_total():
+        result = schema.execute(query, context_value=get_context())
+        assert not result.errors
+        return result.data["reporters"]["pageInfo"]["total"]
+
+    def get_version():
+        return get_table_versions([Reporter._meta.db_table])
+
+    commit()
+    assert get_total() == 3
+    version = get_version()
+    with transaction.atomic():
+        Reporter.objects.create(first_name="First 3", last_name="Last 3", email="")
+        # Other threads keep reading the committed total under the same
+        # version, this one counts its own write without caching it
+        assert get_cache().get(VERSION_KEY.format(Reporter._meta.db_table)) == version[0]
+        assert get_version() is None
+        with django_assert_num_queries(1):
+            assert get_total() == 4
+        with django_assert_num_queries(1):
+            assert get_total() == 4
+
+    commit()
+    assert get_version() != version
+    with django_assert_num_queries(1):
+        assert get_total() == 4
+    with django_assert_num_queries(0):
+        assert get_total() == 4
+
+
+def test_table_versions_are_bumped_once_per_atomic_block(
+    graphene_settings, commit
+):
+    graphene_settings.FILTER_FIELD_COUNT_CACHE = True
+    commit()
+    reporters_table = Reporter._meta.db_table
+    articles_table = Article._meta.db_table
+    version = get_table_versions([reporters_table])
+
+    def get_bumps():
+        return [
+            callback[1]
+            for callback in transaction.get_connection().run_on_commit
+            if isinstance(callback[1], TableVersionBump)
+        ]
+
+    with transaction.atomic():
+        for i in range(10):
+            Reporter.objects.create(first_name=str(i), last_name="", email="")
+        assert len(get_bumps()) == 1
+
+        try:
+            with transaction.atomic():
+                Film.objects.create()
+                assert len(get_bumps()) == 2
+                raise ValueError
+        except ValueError:
+            pass
+        # The bump of the rolled back savepoint is dropped with its writes
+        assert len(get_bumps()) == 1
+        assert not has_uncommitted_writes([Film._meta.db_table])
+        assert has_uncommitted_writes([reporters_table])
+
+        Reporter.objects.create(first_name="10", last_name="", email="")
+        assert len(get_bumps()) == 1
+        assert not has_uncommitted_writes([articles_table])
+
+    commit()
+    assert not has_uncommitted_writes([reporters_table])
+    assert get_table_versions([reporters_table]) not in (None, version)
+
+
+def test_filter_field_enforces_max_limit(reporters):
+    schema = get_schema(max_limit=2)
+    result = schema.execute(
+        "query { reporters { objects { firstName } } }", context_value=get_context()
+    )
+    assert not result.errors
+    assert len(result.data["reporters"]["objects"]) == 2
+
+    result = schema.execute(
+        "query { reporters(limit: 3) { objects { firstName } } }",
+        context_value=get_context(),
+    )
+    assert result.errors
+    assert "exceeds the `limit` of 2 records" in str(result.errors[0])
+
+
+@pytest.mark.parametrize("page", ["limit: -1", "offset: -1"])
+def test_filter_field_rejects_negative_pages(reporters, page):
+    schema = get_schema()
+    for query in (
+        "query { reporters(%s) { objects { firstName } } }",
+        "query { allReporters { articles(%s) { headline } } }",
+    ):
+        result = schema.execute(query % page, context_value=get_context())
+        assert result.errors
+        assert "cannot be negative" in str(result.errors[0])
+
+    # Reported by the nested field, not by the one prefetching it
+    result = schema.execute(
+        "query { reporters { objects { articles(%s) { headline } } } }" % page,
+        context_value=get_context(),
+    )
+    assert "of the `articles` field" in str(result.errors[0])
+    assert result.errors[0].path == ["reporters", "objects", 0, "articles"]
+
+
+def test_filter_field_max_limit_bounds_inner_lists(
+    graphene_settings, reporters, django_assert_num_queries
+):
+    graphene_settings.FILTER_FIELD_MAX_LIMIT = 1
+    schema = get_schema(max_limit=3)
+    # reporters, then one article of every reporter, still loaded for all
+    # of them at once
+    with django_assert_num_queries(3) as captured:
+        result = schema.execute(
+            "query { reporters { objects { articles { headline } } } }",
+            context_value=get_context(),
+        )
+    assert not result.errors
+    assert "ROW_NUMBER()" in captured.captured_queries[1]["sql"]
+    assert result.data["reporters"]["objects"] == [
+        {"articles": [{"headline": "Headline {} 0".format(i)}]} for i in range(3)
+    ]
+
+
+def test_filter_field_default_limit_covers_inner_lists(graphene_settings, reporters):
+    graphene_settings.FILTER_FIELD_DEFAULT_LIMIT = 1
+    schema = get_schema()
+    result = schema.execute(
+        "query { reporters { objects { articles { headline } } } }",
+        context_value=get_context(),
+    )
+    assert not result.errors
+    assert result.data["reporters"]["objects"] == [
+        {"articles": [{"headline": "Headline 0 0"}]}
+    ]
+
+
+def test_filter_field_selects_related_foreign_keys(
+    reporters, django_assert_num_queries
+):
+    schema = get_schema()
+    # articles joined to their reporter
+    with django_assert_num_queries(1):
+        result = schema.execute(
+            "query { articles(limit: 2) { objects { reporter { firstName } } } }",
+            context_value=get_context(),
+        )
+    assert not result.errors
+    assert result.data["articles"]["objects"] == [
+        {"reporter": {"firstName": "First 0"}},
+        {"reporter": {"firstName": "First 0"}},
+    ]
+
+
+def test_filter_field_aggregates_filtered_queryset(
+    reporters, django_assert_num_queries
+):
+    schema = get_schema()
+    query = """
+        query {
+            articles(headline: "Headline 1 1", limit: 1) {
+                aggregate {
+                    count
+                    sum { importance }
+                    max { pubDate }
+                }
+            }
+        }
+    """
+    with django_assert_num_queries(1):
+        result = schema.execute(query, context_value=get_context())
+    assert not result.errors
+    assert result.data["articles"]["aggregate"] == [
+        {"count": 1, "sum": {"importance": 2.0}, "max": {"pubDate": "2020-01-01"}}
+    ]
+
+
+def test_filter_field_aggregates_distinct_groups(reporters):
+    schema = get_schema(
+        filter_fields={"films": ["exact"]}, aggregate_fields=["last_name"]
+    )
+    reporter = reporters[0]
+    films = [Film.objects.create(), Film.objects.create()]
+    for film in films:
+        film.reporters.add(reporter)
+
+    # Joined to both films, the reporter is still counted once per group
+    result = schema.execute(
+        """
+        query Reporters($films: [ID]) {
+            reporters(films: $films) {
+                aggregate { count }
+                groups: aggregate(groupBy: [lastName]) { group { lastName } count }
+            }
+        }
+        """,
+        variable_values={"films": [str(film.pk) for film in films]},
+        context_value=get_context(),
+    )
+    assert not result.errors
+    assert result.data["reporters"] == {
+        "aggregate": [{"count": 1}],
+        "groups": [{"group": {"lastName": reporter.last_name}, "count": 1}],
+    }
+
+
+def test_filter_field_aggregates_groups(reporters, django_assert_num_queries):
+    schema = get_schema()
+    query = """
+        query {
+            articles(limit: 1) {
+                aggregate(groupBy: [reporter]) {
+                    group { reporter }
+                    count
+                    avg { importance }
+                    min { importance }
+                }
+            }
+        }
+    """
+    with django_assert_num_queries(1):
+        result = schema.execute(query, context_value=get_context())
+    assert not result.errors
+    assert result.data["articles"]["aggregate"] == [
+        {
+            "group": {"reporter": reporter.pk},
+            "count": 2,
+            "avg": {"importance": 1.5},
+            "min": {"importance": 1},
+        }
+        for reporter in reporters
+    ]
+
+
+@pytest.fixture
+def search_tables():
+    yield DatabaseSearchBackend.backends["sqlite"]
+    # Dropped with the test transaction
+    DatabaseSearchBackend.backends["sqlite"].tables.clear()
+
+
+def test_filter_field_searches_ranked(
+    reporters, search_tables, django_assert_num_queries
+):
+    schema = get_schema()
+    reporter = reporters[0]
+
+    def create(headline):
+        return Article.objects.create(
+            headline=headline,
+            pub_date=date(2020, 1, 1),
+            pub_date_time=datetime(2020, 1, 1),
+            reporter=reporter,
+            editor=reporter,
+        )
+
+    def search(arguments):
+        result = schema.execute(
+            "query { articles(%s) { objects { headline } } }" % arguments,
+            context_value=get_context(),
+        )
+        assert not result.errors
+        return [row["headline"] for row in result.data["articles"]["objects"]]
+
+    create("Ranking search results with graphene and django")
+    create("Graphene filters")
+    article = create("Unrelated")
+
+    # Unranked until the table is created, searching does not create it and
+    # looks the table up again
+    with django_assert_num_queries(2):
+        assert search('search: "graphene"') == [
+            "Ranking search results with graphene and django",
+            "Graphene filters",
+        ]
+    assert search('search: "graphene django"') == []
+    out = StringIO()
+    call_command("graphene_search_tables", stdout=out)
+    assert "Created tests_article_search_" in out.getvalue()
+
+    # One query, the existence of the table is not looked up again
+    with django_assert_num_queries(1):
+        assert search('search: "graphene django"') == [
+            "Ranking search results with graphene and django"
+        ]
+    assert search('search: "graphene"') == [
+        "Graphene filters",
+        "Ranking search results with graphene and django",
+    ]
+    # Prefix of the last word, combined with filters and orderBy
+    assert search('search: "Grap", headline: "Graphene filters"') == ["Graphene filters"]
+    assert search('search: "graphene", orderBy: [{field: headline, direction: DESC}]') == [
+        "Ranking search results with graphene and django",
+        "Graphene filters",
+    ]
+
+    # Kept in sync with the table, by writes sending no signals as well
+    article.headline = "Graphene search"
+    article.save()
+    assert search('search: "graphene search"') == [
+        "Graphene search",
+        "Ranking search results with graphene and django",
+    ]
+    Article.objects.filter(pk=article.pk).update(headline="Renamed zebra")
+    assert search('search: "zebra"') == ["Renamed zebra"]
+    assert search('search: "graphene search"') == [
+        "Ranking search results with graphene and django"
+    ]
+    Article.objects.bulk_create(
+        [
+            Article(
+                headline="Bulk zebra",
+                pub_date=date(2020, 1, 1),
+                pub_date_time=datetime(2020, 1, 1),
+                reporter=reporter,
+                editor=reporter,
+            )
+        ]
+    )
+    assert search('search: "zebra"') == ["Renamed zebra", "Bulk zebra"]
+    article.delete()
+    assert search('search: "zebra"') == ["Bulk zebra"]
+    assert search('search: "\\"*("') == []
+
+
+@pytest.fixture
+def batch_loading(graphene_settings):
+    graphene_settings.INNER_LIST_BATCH_LOADING = True
+
+
+def test_inner_list_batches_parents(
+    batch_loading, reporters, django_assert_num_queries
+):
+    schema = get_schema()
+    # reporters and the films of every reporter
+    with django_assert_num_queries(2):
+        result = schema.execute(
+            "query { allReporters { firstName films { id } } }",
+            context_value=get_context(),
+        )
+    assert not result.errors
+    assert [reporter["films"] for reporter in result.data["allReporters"]] == [
+        [{"id": str(reporter.films.get().pk)}] for reporter in reporters
+    ]
+
+
+def test_inner_list_batches_paginate_each_parent(
+    batch_loading, reporters, django_assert_num_queries
+):
+    schema = get_schema()
+    query = """
+        query {
+            reporters {
+                objects {
+                    articles(orderBy: [{field: headline, direction: DESC}], limit: 1, offset: 1) {
+                        headline
+                    }
+                }
+            }
+        }
+    """
+    # reporters, windowed article ids and the articles themselves
+    with django_assert_num_queries(3):
+        result = schema.execute(query, context_value=get_context())
+    assert not result.errors
+    assert result.data["reporters"]["objects"] == [
+        {"articles": [{"headline": "Headline {} 0".format(i)}]} for i in range(3)
+    ]
+
+
+def test_inner_list_paginates_without_batching(reporters):
+    schema = get_schema()
+    result = schema.execute(
+        "query { allReporters { articles(limit: 1) { headline } } }",
+        context_value=get_context(),
+    )
+    assert not result.errors
+    assert result.data["allReporters"] == [
+        {"articles": [{"headline": "Headline {} 0".format(i)}]} for i in range(3)
+    ]
+
+
+def test_filter_field_pages_with_cursors(reporters):
+    schema = get_schema()
+    query = """
+        query Reporters($after: String, $before: String) {
+            reporters(
+                orderBy: [{field: firstName, direction: DESC, modifiers: [CASE_INSENSITIVE]}],
+                limit: 1,
+                after: $after,
+                before: $before
+            ) {
+                objects { firstName }
+                pageInfo { nextCursor previousCursor hasNextPage hasPreviousPage }
+            }
+        }
+    """
+
+    def get_page(**variables):
+        result = schema.execute(
+            query, variable_values=variables, context_value=get_context()
+        )
+        assert not result.errors
+        return result.data["reporters"]
+
+    def page_flags(page):
+        return page["pageInfo"]["hasPreviousPage"], page["pageInfo"]["hasNextPage"]
+
+    first = get_page()
+    assert first["objects"] == [{"firstName": "First 2"}]
+    assert page_flags(first) == (False, True)
+
+    second = get_page(after=first["pageInfo"]["nextCursor"])
+    assert second["objects"] == [{"firstName": "First 1"}]
+    assert page_flags(second) == (True, True)
+
+    third = get_page(after=second["pageInfo"]["nextCursor"])
+    assert third["objects"] == [{"firstName": "First 0"}]
+    assert page_flags(third) == (True, False)
+
+    assert get_page(after=third["pageInfo"]["nextCursor"])["objects"] == []
+
+    # Paging back, the rows from the cursor on follow the page
+    previous = get_page(before=third["pageInfo"]["previousCursor"])
+    assert previous["objects"] == [{"firstName": "First 1"}]
+    assert page_flags(previous) == (True, True)
+
+    first_again = get_page(before=previous["pageInfo"]["previousCursor"])
+    assert first_again["objects"] == [{"firstName": "First 2"}]
+    assert page_flags(first_again) == (False, True)
+
+
+def page_articles(schema, order_by):
+    query = """
+        query Articles($after: String) {
+            articles(orderBy: [%s], limit: 1, after: $after) {
+                objects { headline }
+                pageInfo { nextCursor hasNextPage }
+            }
+        }
+    """ % order_by
+    headlines = []
+    after = None
+    for _ in range(Article.objects.count() + 1):
+        result = schema.execute(
+            query, variable_values={"after": after}, context_value=get_context()
+        )
+        assert not result.errors, result.errors
+        page = result.data["articles"]
+        headlines += [article["headline"] for article in page["objects"]]
+        if not page["pageInfo"]["hasNextPage"]:
+            return headlines
+        after = page["pageInfo"]["nextCursor"]
+    raise AssertionError("Paging did not end: {}".format(headlines))
+
+
+def test_filter_field_pages_with_cursors_over_microseconds(reporters):
+    for i, article in enumerate(Article.objects.order_by("pk")):
+        article.pub_date_time = datetime(2020, 1, 1, 0, 0, 0, 999 - i)
+        article.save()
+    schema = get_schema()
+    headlines = page_articles(schema, "{field: pubDateTime}")
+    assert headlines == list(
+        Article.objects.order_by("pub_date_time").values_list("headline", flat=True)
+    )
+
+
+@pytest.mark.parametrize("direction", ["ASC", "DESC"])
+def test_filter_field_pages_with_cursors_over_nulls(reporters, direction):
+    Article.objects.filter(headline__endswith="0").update(importance=None)
+    schema = get_schema()
+    headlines = page_articles(
+        schema, "{field: importance, direction: %s}" % direction
+    )
+    order = "importance" if direction == "ASC" else "-importance"
+    assert headlines == list(
+        Article.objects.order_by(order, "pk").values_list("headline", flat=True)
+    )
+
+
+def test_filter_field_rejects_foreign_cursors(reporters):
+    schema = get_schema()
+    result = schema.execute(
+        'query { reporters(after: "not a cursor") { objects { firstName } } }',
+        context_value=get_context(),
+    )
+    assert result.errors
+    assert "Invalid cursor" in str(result.errors[0])
+
+
+def test_filter_field_pages_through_snapshot(
+    graphene_settings, reporters, django_assert_num_queries
+):
+    graphene_settings.FILTER_FIELD_SNAPSHOT = True
+    schema = get_schema()
+    query = """
+        query Reporters($offset: Int, $token: String, $name: String) {
+            reporters(
+                orderBy: [{field: firstName, direction: DESC}],
+                firstName_Icontains: $name,
+                limit: 2,
+                offset: $offset,
+                snapshot: true,
+                snapshotToken: $token
+            ) {
+                objects { firstName }
+                pageInfo { total hasNextPage snapshotToken }
+            }
+        }
+    """
+
+    def get_page(**variables):
+        variables.setdefault("name", "first")
+        return schema.execute(query, variable_values=variables, context_value=get_context())
+
+    # The IDs, then the rows of the page
+    with django_assert_num_queries(2):
+        result = get_page()
+    assert not result.errors
+    first = result.data["reporters"]
+    assert first["objects"] == [{"firstName": "First 2"}, {"firstName": "First 1"}]
+    assert first["pageInfo"]["total"] == 3
+    assert first["pageInfo"]["hasNextPage"]
+    token = first["pageInfo"]["snapshotToken"]
+
+    # Rows written since do not shift the snapshot
+    Reporter.objects.create(first_name="First 9", last_name="Last 9", email="")
+    with django_assert_num_queries(1):
+        result = get_page(offset=2, token=token)
+    assert not result.errors
+    assert result.data["reporters"] == {
+        "objects": [{"firstName": "First 0"}],
+        "pageInfo": {"total": 3, "hasNextPage": False, "snapshotToken": token},
+    }
+
+    result = get_page(offset=2, token=token, name="First 0")
+    assert "other arguments" in str(result.errors[0])
+    result = get_page(token="expired")
+    assert "does not exist" in str(result.errors[0])
@@ -0,0 +1,158 @@
+import mock
+import pytest
+from django.core.signals import request_finished
+from django.db import connection
+
+from graphene_django.filter.utils import get_filtering_args_from_filterset
+from graphene_django.tests.models import Film, Reporter
+from graphene_django.utils import DJANGO_FILTER_INSTALLED
+
+pytestmark = []
+
+if DJANGO_FILTER_INSTALLED:
+    import django_filters
+
+    from graphene_django.filter.compiler import CompiledFilterSet
+    from graphene_django.filter.filterset import (
+        custom_filterset_factory,
+        get_id_list_q,
+        setup_filterset,
+    )
+else:
+    pytestmark.append(
+        pytest.mark.skipif(
+            True, reason="django_filters not installed or not compatible"
+        )
+    )
+
+pytestmark.append(pytest.mark.django_db)
+
+
+@pytest.fixture
+def pet_owners(reporters):
+    """ The shared reporters and a fourth one, the first and the third
+        having the next one as a pet
+    """
+    reporters = reporters + [
+        Reporter.objects.create(first_name="First 3", last_name="Last 3", email="")
+    ]
+    reporters[0].pets.add(reporters[1])
+    reporters[2].pets.add(reporters[3])
+    return reporters
+
+
+def filter_by_pets(ids):
+    filterset_class = custom_filterset_factory(Reporter, fields=["pets"])
+    filterset = filterset_class(
+        data={"pets": [str(pk) for pk in ids]}, queryset=Reporter.objects.all()
+    )
+    return filterset.qs.order_by("pk")
+
+
+def test_id_list_filter_uses_in_list_below_threshold(pet_owners):
+    qs = filter_by_pets([pet_owners[1].pk, pet_owners[3].pk])
+    assert "json_each" not in str(qs.query)
+    assert list(qs) == [pet_owners[0], pet_owners[2]]
+
+
+def test_id_list_filter_expands_single_parameter_above_threshold(
+    graphene_settings, pet_owners
+):
+    graphene_settings.ID_LIST_FILTER_THRESHOLD = 1
+    qs = filter_by_pets([pet_owners[1].pk, pet_owners[3].pk])
+    assert "json_each" in str(qs.query)
+    assert list(qs) == [pet_owners[0], pet_owners[2]]
+
+
+def test_id_list_filter_splits_in_lists_on_other_databases(graphene_settings):
+    graphene_settings.ID_LIST_FILTER_THRESHOLD = 2
+    with mock.patch.object(connection, "vendor", "oracle"):
+        q = get_id_list_q(Reporter, "pk", [1, 2, 3], connection.alias)
+    assert q.connector == "OR"
+    assert q.children == [("pk__in", [1, 2]), ("pk__in", [3])]
+
+
+def test_id_list_filter_loads_a_table_without_json1(pet_owners):
+    ids = [pet_owners[3].pk] + list(range(10 ** 6, 10 ** 6 + 50000))
+    with mock.patch(
+        "graphene_django.filter.filterset.sqlite_has_json1", return_value=False
+    ):
+        qs = filter_by_pets(ids)
+    _, params = qs.query.sql_with_params()
+    assert len(params) == 1
+    assert list(qs) == [pet_owners[2]]
+
+    # Emptied once the request is over
+    request_finished.send(sender=None)
+    assert list(qs.all()) == []
+
+
+def test_id_list_filter_sends_large_lists_as_one_parameter(pet_owners):
+    ids = [pet_owners[3].pk] + list(range(10 ** 6, 10 ** 6 + 50000))
+    qs = filter_by_pets(ids)
+    _, params = qs.query.sql_with_params()
+    assert len(params) == 1
+    assert list(qs) == [pet_owners[2]]
+
+
+def test_relation_filter_exists_keeps_rows_unique(graphene_settings, pet_owners):
+    graphene_settings.RELATION_FILTER_EXISTS = True
+    pet_owners[0].pets.add(pet_owners[3])
+    qs = filter_by_pets([pet_owners[1].pk, pet_owners[3].pk])
+    sql = str(qs.query)
+    assert "EXISTS" in sql and "DISTINCT" not in sql
+    assert list(qs) == [pet_owners[0], pet_owners[2]]
+    assert qs.count() == 2
+
+
+def test_relation_filter_exists_per_filterset(reporters):
+    class FilmFilterSet(django_filters.FilterSet):
+        relation_filter_exists = True
+
+        class Meta:
+            model = Film
+            fields = ["reporters"]
+
+    FilmFilterSet = setup_filterset(FilmFilterSet)
+
+    films = [Film.objects.create() for _ in range(2)]
+    films[0].reporters.add(*reporters[:2])
+    films[1].reporters.add(reporters[2])
+    # Leaving out the film of each reporter
+    queryset = Film.objects.filter(pk__in=[film.pk for film in films])
+
+    filterset = FilmFilterSet(
+        data={"reporters": [str(r.pk) for r in reporters[:2]]}, queryset=queryset
+    )
+    assert "EXISTS" in str(filterset.qs.query)
+    assert list(filterset.qs) == [films[0]]
+
+    filterset = FilmFilterSet(
+        data={"reporters": [str(reporters[0].pk)]},
+        queryset=queryset.exclude(pk=films[0].pk),
+    )
+    assert list(filterset.qs) == []
+
+
+def test_compiled_filterset_falls_back_for_declared_filters(pet_owners):
+    class ReporterFilterSet(django_filters.FilterSet):
+        name = django_filters.CharFilter(method="filter_name")
+
+        class Meta:
+            model = Reporter
+            fields = ["last_name", "pets"]
+
+        def filter_name(self, qs, name, value):
+            return qs.filter(first_name=value)
+
+    filterset_class = setup_filterset(ReporterFilterSet)
+    compiled = CompiledFilterSet(
+        filterset_class, get_filtering_args_from_filterset(filterset_class, None)
+    )
+    assert set(compiled.filters) == {"last_name", "pets"}
+
+    qs = compiled.filter(
+        Reporter.objects.all(),
+        {"name": "First 0", "pets": [str(pet_owners[1].pk)], "last_name": ""},
+    )
+    assert list(qs) == [pet_owners[0]]
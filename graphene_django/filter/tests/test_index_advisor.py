@@ -0,0 +1,146 @@
+import sys
+
+import pytest
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from six import StringIO
+
+import graphene
+from graphene_django import DjangoObjectType
+from graphene_django.checks import check_order_fields_indexes
+from graphene_django.tests.models import Reporter
+from graphene_django.utils import DJANGO_FILTER_INSTALLED
+
+from .conftest import get_context, permission_for
+
+pytestmark = []
+
+if DJANGO_FILTER_INSTALLED:
+    from graphene_django.filter import DjangoFilterField
+    from graphene_django.filter.index_advisor import (
+        IndexColumn,
+        advise,
+        get_index_operation,
+    )
+else:
+    pytestmark.append(
+        pytest.mark.skipif(
+            True, reason="django_filters not installed or not compatible"
+        )
+    )
+
+pytestmark.append(pytest.mark.django_db)
+
+
+def get_schema():
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            permission_class = permission_for(Reporter)
+            filter_fields = ["last_name"]
+            order_fields = ["first_name", "id"]
+
+    class Query(graphene.ObjectType):
+        reporters = DjangoFilterField(ReporterType)
+
+    return graphene.Schema(query=Query)
+
+
+@pytest.fixture
+def sample_usage(graphene_settings):
+    graphene_settings.FILTER_USAGE_SAMPLE_RATE = 1
+    caches[graphene_settings.FILTER_USAGE_CACHE_ALIAS].clear()
+
+
+def run_query(schema, order_by):
+    result = schema.execute(
+        'query { reporters(lastName: "Doe", orderBy: %s) { objects { id } } }'
+        % order_by,
+        context_value=get_context(),
+    )
+    assert not result.errors
+
+
+def test_advise_reports_missing_composite_index(sample_usage):
+    schema = get_schema()
+    run_query(schema, "[{field: firstName}]")
+    run_query(schema, "[{field: firstName}]")
+    # Covered by the primary key
+    run_query(schema, "[{field: id}]")
+
+    (advice,) = advise()
+    assert advice.model is Reporter
+    assert advice.count == 2
+    assert advice.columns == [
+        IndexColumn("last_name", False),
+        IndexColumn("first_name", False),
+    ]
+    assert advice.name.startswith("gd_reporter_")
+
+    out = StringIO()
+    call_command("graphene_filter_indexes", stdout=out)
+    assert (
+        "tests.Reporter: 2 sampled queries filtering on last_name__exact ordered "
+        "by first_name miss an index on (last_name, first_name)"
+    ) in out.getvalue()
+
+    # The test app has no migrations to add the index to
+    with pytest.raises(CommandError):
+        call_command("graphene_filter_indexes", write_migrations=True, stdout=StringIO())
+
+    call_command("graphene_filter_indexes", clear=True, stdout=StringIO())
+    assert advise() == []
+
+
+def test_advise_reports_functional_index(sample_usage):
+    schema = get_schema()
+    run_query(schema, "[{field: firstName, modifiers: [CASE_INSENSITIVE]}]")
+
+    (advice,) = advise()
+    assert advice.columns == [
+        IndexColumn("last_name", False),
+        IndexColumn("first_name", True),
+    ]
+    operation = get_index_operation(Reporter, advice.columns, advice.name)
+    assert operation.sql == 'CREATE INDEX "{}" ON "tests_reporter" ("last_name", LOWER("first_name"))'.format(
+        advice.name
+    )
+
+
+def test_check_warns_about_order_fields_without_index():
+    schema = get_schema()
+    reporter_type = schema.get_type("ReporterType").graphene_type
+
+    warnings = check_order_fields_indexes()
+    assert [warning.id for warning in warnings] == ["graphene_django.W001"]
+    assert warnings[0].obj is reporter_type
+    assert "`first_name`" in warnings[0].msg
+
+
+def test_check_command_imports_the_schema(graphene_settings):
+    module = "graphene_django.filter.tests.check_schema"
+    sys.modules.pop(module, None)
+    graphene_settings.__dict__.pop("SCHEMA", None)
+    graphene_settings._user_settings = dict(
+        graphene_settings.user_settings, SCHEMA=module + ".schema"
+    )
+
+    out = StringIO()
+    call_command("check", stdout=out, stderr=out)
+    assert "graphene_django.W001" in out.getvalue()
+    assert "`ReporterType` can be ordered by `first_name`" in out.getvalue()
+
+
+def test_check_command_survives_a_broken_schema(graphene_settings):
+    module = "graphene_django.filter.tests.check_broken_schema"
+    sys.modules.pop(module, None)
+    graphene_settings.__dict__.pop("SCHEMA", None)
+    graphene_settings._user_settings = dict(
+        graphene_settings.user_settings, SCHEMA=module + ".schema"
+    )
+
+    # No permission_class, the types cannot be built
+    out = StringIO()
+    call_command("check", stdout=out, stderr=out)
+    assert "graphene_django.W002" in out.getvalue()
+    assert "permission_class" in out.getvalue()
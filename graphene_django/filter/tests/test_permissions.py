@@ -0,0 +1,160 @@
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+
+import graphene
+from graphene_django import DjangoObjectType
+from graphene_django.tests.models import Article, Reporter
+from graphene_django.utils import DJANGO_FILTER_INSTALLED
+
+from .conftest import AllowAllPermission, get_context, permission_for
+
+pytestmark = []
+
+if DJANGO_FILTER_INSTALLED:
+    from graphene_django.filter import DjangoFilterField
+else:
+    pytestmark.append(
+        pytest.mark.skipif(
+            True, reason="django_filters not installed or not compatible"
+        )
+    )
+
+
+def get_schema(calls, **permission_attrs):
+    class CountingPermission(AllowAllPermission):
+        def viewable(self, user, info=None):
+            calls.append(self.model)
+            return super(CountingPermission, self).viewable(user, info=info)
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            permission_class = permission_for(
+                Reporter, CountingPermission, **permission_attrs
+            )
+            filter_fields = ["first_name"]
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            permission_class = permission_for(
+                Article, CountingPermission, **permission_attrs
+            )
+            filter_fields = ["headline"]
+
+    class Query(graphene.ObjectType):
+        reporters = DjangoFilterField(ReporterType)
+        all_reporters = graphene.List(ReporterType)
+
+        def resolve_all_reporters(self, info):
+            return Reporter.objects.order_by("pk")
+
+    return graphene.Schema(query=Query)
+
+
+QUERY = "query { reporters { objects { articles { headline } } } }"
+
+
+def test_scope_is_computed_once_per_request(reporters):
+    calls = []
+    schema = get_schema(calls, cache_scope=True)
+    # The articles of every reporter are resolved apart
+    query = "query { allReporters { articles { headline } } }"
+    result = schema.execute(query, context_value=get_context())
+    assert not result.errors
+    assert result.data["allReporters"] == [
+        {"articles": [{"headline": "Headline {} {}".format(i, j)} for j in range(2)]}
+        for i in range(3)
+    ]
+    assert calls == [Article]
+
+    schema.execute(query, context_value=get_context())
+    assert calls == [Article] * 2
+
+
+def test_scope_cache_is_opt_in(graphene_settings, reporters):
+    query = "query { allReporters { articles { headline } } }"
+    calls = []
+    schema = get_schema(calls)
+    schema.execute(query, context_value=get_context())
+    assert calls == [Article] * 3
+
+    graphene_settings.PERMISSION_SCOPE_CACHE = True
+    calls = []
+    schema = get_schema(calls)
+    schema.execute(query, context_value=get_context())
+    assert calls == [Article]
+
+    calls = []
+    schema = get_schema(calls, cache_scope=False)
+    schema.execute(query, context_value=get_context())
+    assert calls == [Article] * 3
+
+
+@pytest.mark.parametrize("cache_scope_ids", [False, True])
+def test_scope_is_shared_until_dependencies_change(
+    graphene_settings, reporters, commit, cache_scope_ids
+):
+    graphene_settings.PERMISSION_SCOPE_SHARED_CACHE = True
+    caches[graphene_settings.PERMISSION_SCOPE_CACHE_ALIAS].clear()
+    calls = []
+    schema = get_schema(
+        calls,
+        cache_scope=True,
+        scope_dependencies=[Reporter],
+        cache_scope_ids=cache_scope_ids,
+    )
+
+    def get_headlines():
+        result = schema.execute(QUERY, context_value=get_context())
+        assert not result.errors
+        return [
+            article["headline"]
+            for reporter in result.data["reporters"]["objects"]
+            for article in reporter["articles"]
+        ]
+
+    commit()
+    headlines = ["Headline {} {}".format(i, j) for i in range(3) for j in range(2)]
+    assert get_headlines() == headlines
+    assert get_headlines() == headlines
+    assert calls == [Reporter, Article]
+
+    reporters[0].save()
+    commit()
+    assert get_headlines() == headlines
+    # Saving a reporter gives the Reporter table a new version
+    assert calls == [Reporter, Article] * 2
+
+
+def test_nested_scope_is_applied_as_a_filter(reporters):
+    calls = []
+
+    def viewable_q(self, user, info=None):
+        return ~Q(headline__startswith="Headline 1")
+
+    schema = get_schema(calls, cache_scope=True, viewable_q=viewable_q)
+    query = 'query { allReporters { articles(headline: "Headline 0 0") { headline } } }'
+    with CaptureQueriesContext(connection) as queries:
+        result = schema.execute(query, context_value=get_context())
+    assert not result.errors
+    assert result.data["allReporters"] == [
+        {"articles": [{"headline": "Headline 0 0"}]},
+        {"articles": []},
+        {"articles": []},
+    ]
+    assert calls == []
+    # The relation, the scope and the filters without a subquery
+    assert all(query["sql"].count("SELECT") == 1 for query in queries)
+
+    result = schema.execute(
+        "query { allReporters { articles { headline } } }", context_value=get_context()
+    )
+    assert [
+        article["headline"]
+        for reporter in result.data["allReporters"]
+        for article in reporter["articles"]
+    ] == ["Headline 0 0", "Headline 0 1", "Headline 2 0", "Headline 2 1"]
@@ -1,5 +1,8 @@
 import six
 
+from django.db import models
+from django.db.models import F
+from django.db.models.expressions import OrderBy
 from django_filters.utils import get_model_field
 from .filterset import custom_filterset_factory, setup_filterset
 
@@ -45,3 +48,26 @@ def get_filterset_class(filterset_class, **meta):
         # return it
         return setup_filterset(filterset_class)
     return custom_filterset_factory(**meta)
+
+
+def get_order_by_expressions(qs):
+    """ The ordering of a queryset as a list of ``OrderBy`` expressions """
+    expressions = []
+    for order in qs.query.order_by:
+        if isinstance(order, six.string_types):
+            descending = order.startswith("-")
+            order = OrderBy(F(order.lstrip("-")), descending=descending)
+        expressions.append(order)
+    return expressions
+
+
+def get_related_lookup(field):
+    """ The lookup going from the related model of a to-many ``field`` back
+        to the model the field is declared on
+    """
+    if isinstance(field, models.ManyToManyField):
+        if field.remote_field.symmetrical:
+            return field.name
+        return field.related_query_name()
+    # ManyToOneRel and ManyToManyRel
+    return field.field.name
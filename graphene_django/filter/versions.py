@@ -0,0 +1,153 @@
+import uuid
+
+from django.core.cache import caches
+from django.db import connections, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from ..settings import graphene_settings
+
+VERSION_KEY = "graphene_django:table_version:{}"
+
+M2M_ACTIONS = ("post_add", "post_remove", "post_clear")
+
+PENDING_BUMPS_ATTR = "_graphene_table_version_bumps"
+
+_tracking = False
+
+
+def track_table_versions():
+    """ Bump table versions on writes from now on, for caches enabled on a
+        single field rather than through the settings
+    """
+    global _tracking
+    _tracking = True
+
+
+def is_tracking():
+    return (
+        _tracking
+        or graphene_settings.FILTER_FIELD_COUNT_CACHE
+        or graphene_settings.PERMISSION_SCOPE_SHARED_CACHE
+    )
+
+
+def get_cache():
+    return caches[graphene_settings.TABLE_VERSION_CACHE_ALIAS]
+
+
+def get_model_tables(model):
+    """ Tables written to when saving or deleting an instance of ``model`` """
+    return [
+        parent._meta.db_table for parent in [model] + model._meta.get_parent_list()
+    ]
+
+
+def bump_table_versions(tables):
+    """ Give ``tables`` new versions, which drops every entry cached over them """
+    # A fresh token rather than an increment: evicting a version from the
+    # cache must not bring back entries cached under an older one
+    get_cache().set_many(
+        {VERSION_KEY.format(table): uuid.uuid4().hex for table in tables},
+        timeout=None,
+    )
+
+
+class TableVersionBump(object):
+    """ Bump of the versions of ``tables`` once the transaction writing to
+        them is committed, shared by every write of the same atomic block
+    """
+
+    def __init__(self, tables):
+        self.tables = set(tables)
+        self.pending = True
+
+    def __call__(self):
+        self.pending = False
+        bump_table_versions(self.tables)
+
+
+def get_pending_bumps(connection):
+    """ The bumps queued on ``connection``, by the savepoints they were
+        queued in
+    """
+    pending = getattr(connection, PENDING_BUMPS_ATTR, None)
+    # Committing, rolling back or rolling back to a savepoint replaces the
+    # list of callbacks, the bumps left in the new one are looked up again
+    if pending is None or pending[0] is not connection.run_on_commit:
+        bumps = {}
+        for callback in connection.run_on_commit:
+            if isinstance(callback[1], TableVersionBump):
+                bumps[frozenset(callback[0])] = callback[1]
+        pending = (connection.run_on_commit, bumps)
+        setattr(connection, PENDING_BUMPS_ATTR, pending)
+    return pending[1]
+
+
+def bump_table_versions_on_commit(tables, using):
+    """ Bump the versions of ``tables`` once the write is committed, a read
+        until then would cache the old rows under the new versions
+    """
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        bump_table_versions(tables)
+        return
+
+    # One bump per atomic block, a savepoint rolled back drops its own
+    bumps = get_pending_bumps(connection)
+    key = frozenset(connection.savepoint_ids)
+    bump = bumps.get(key)
+    if bump is not None and bump.pending:
+        bump.tables.update(tables)
+    else:
+        bumps[key] = TableVersionBump(tables)
+        transaction.on_commit(bumps[key], using=using)
+
+
+def has_uncommitted_writes(tables):
+    """ Whether the transactions of this thread wrote to ``tables``, their
+        rows are then only seen by this thread
+    """
+    tables = set(tables)
+    for connection in connections.all():
+        if not connection.in_atomic_block:
+            continue
+        for bump in get_pending_bumps(connection).values():
+            if bump.pending and bump.tables & tables:
+                return True
+    return False
+
+
+def get_table_versions(tables):
+    """ The current versions of ``tables``, None when this thread has
+        uncommitted writes to one of them and must not use the caches
+    """
+    if has_uncommitted_writes(tables):
+        return None
+    cache = get_cache()
+    keys = [VERSION_KEY.format(table) for table in tables]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate_model_tables(sender, using, **kwargs):
+    if is_tracking():
+        bump_table_versions_on_commit(get_model_tables(sender), using)
+
+
+def invalidate_m2m_tables(sender, action, instance, model, using, **kwargs):
+    if is_tracking() and action in M2M_ACTIONS:
+        bump_table_versions_on_commit(
+            set(get_model_tables(sender))
+            | set(get_model_tables(type(instance)))
+            | set(get_model_tables(model)),
+            using,
+        )
+
+
+post_save.connect(invalidate_model_tables, dispatch_uid="graphene_django_table_versions_save")
+post_delete.connect(invalidate_model_tables, dispatch_uid="graphene_django_table_versions_delete")
+m2m_changed.connect(invalidate_m2m_tables, dispatch_uid="graphene_django_table_versions_m2m")
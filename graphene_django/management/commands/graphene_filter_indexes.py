@@ -0,0 +1,122 @@
+import os
+from collections import OrderedDict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, migrations
+from django.db.migrations.autodetector import MigrationAutodetector
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.writer import MigrationWriter
+
+from graphene_django.filter.index_advisor import (
+    advise,
+    clear_usage,
+    describe_columns,
+    get_index_operation,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the indexes missing for the filter and orderBy combinations "
+        "sampled from filter fields (see FILTER_USAGE_SAMPLE_RATE)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "app_labels",
+            nargs="*",
+            help="Only report the models of these apps",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to introspect the existing indexes of (default: default)",
+        )
+        parser.add_argument(
+            "--write-migrations",
+            dest="write_migrations",
+            default=False,
+            action="store_true",
+            help="Write a migration adding the missing indexes to each app",
+        )
+        parser.add_argument(
+            "--clear",
+            dest="clear",
+            default=False,
+            action="store_true",
+            help="Forget the sampled usage",
+        )
+
+    def handle(self, *app_labels, **options):
+        if options["clear"]:
+            clear_usage()
+            self.stdout.write("Cleared the sampled filter usage")
+            return
+
+        advice = [
+            item
+            for item in advise(using=options["database"])
+            if not app_labels or item.model._meta.app_label in app_labels
+        ]
+        if not advice:
+            self.stdout.write("No missing index for the sampled filter usage")
+            return
+
+        per_app = OrderedDict()
+        for item in advice:
+            self.stdout.write(
+                "{}: {} sampled queries filtering on {} ordered by {} "
+                "miss an index on ({})".format(
+                    item.model._meta.label,
+                    item.count,
+                    self.describe_filters(item.usage["filters"]),
+                    self.describe_order(item.usage["order"]),
+                    describe_columns(item.columns),
+                )
+            )
+            per_app.setdefault(item.model._meta.app_label, []).append(item)
+
+        if options["write_migrations"]:
+            for app_label, items in per_app.items():
+                self.write_migration(app_label, items, options["database"])
+
+    def describe_filters(self, filters):
+        return ", ".join("{}__{}".format(*lookup) for lookup in filters) or "nothing"
+
+    def describe_order(self, order):
+        return (
+            ", ".join(
+                "LOWER({})".format(name) if lower else name for name, lower in order
+            )
+            or "id"
+        )
+
+    def write_migration(self, app_label, items, using):
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+        if app_label in loader.unmigrated_apps:
+            raise CommandError(
+                "App '{}' has no migrations to add the indexes to".format(app_label)
+            )
+
+        leaves = loader.graph.leaf_nodes(app_label)
+        number = 1
+        if leaves:
+            number = (MigrationAutodetector.parse_number(leaves[-1][1]) or 0) + 1
+
+        migration = migrations.Migration(
+            "{:04d}_graphene_filter_indexes".format(number), app_label
+        )
+        migration.dependencies = leaves
+        migration.operations = [
+            get_index_operation(item.model, item.columns, item.name, using=using)
+            for item in items
+        ]
+
+        writer = MigrationWriter(migration)
+        with open(writer.path, "w") as migration_file:
+            migration_file.write(writer.as_string())
+        self.stdout.write(
+            "Wrote {}, review it before running migrate".format(
+                os.path.relpath(writer.path)
+            )
+        )
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, DatabaseError
+
+from graphene_django.filter.search import get_search_backend
+from graphene_django.settings import graphene_settings
+
+
+class Command(BaseCommand):
+    help = (
+        "Create and fill the tables and indexes the search_fields of the schema "
+        "are searched through (see SEARCH_BACKEND)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to create the tables on (default: default)",
+        )
+        parser.add_argument(
+            "--rebuild",
+            dest="rebuild",
+            default=False,
+            action="store_true",
+            help="Refill the existing tables as well",
+        )
+
+    def handle(self, **options):
+        # The search fields are registered while the schema is built
+        graphene_settings.SCHEMA
+        try:
+            created = get_search_backend().create_tables(
+                using=options["database"], rebuild=options["rebuild"]
+            )
+        except DatabaseError as e:
+            raise CommandError("Could not create the search tables: {}".format(e))
+        for table in created:
+            self.stdout.write("Created {}".format(table))
+        if not created:
+            self.stdout.write("No search table to create")
@@ -0,0 +1,96 @@
+import hashlib
+import json
+
+import six
+from django.core.cache import caches
+from graphql.error import GraphQLError
+
+from .settings import graphene_settings
+
+PERSISTED_QUERY_KEY = "graphene_django:persisted_query:{}"
+PERSISTED_QUERY_VERSION = 1
+
+
+class PersistedQueryError(GraphQLError):
+    """ Error of the automatic persisted queries protocol, reported with its
+        ``code`` in the ``extensions`` of the error
+    """
+
+    message = None
+    code = None
+    status_code = 400
+
+    def __init__(self, message=None):
+        super(PersistedQueryError, self).__init__(
+            message or self.message, extensions={"code": self.code}
+        )
+
+
+class PersistedQueryNotFound(PersistedQueryError):
+    """ The hash is not known, the client sends the query with it next """
+
+    message = "PersistedQueryNotFound"
+    code = "PERSISTED_QUERY_NOT_FOUND"
+    status_code = 200
+
+
+class PersistedQueryNotSupported(PersistedQueryError):
+    """ Persisted queries are disabled, the client stops sending hashes """
+
+    message = "PersistedQueryNotSupported"
+    code = "PERSISTED_QUERY_NOT_SUPPORTED"
+    status_code = 200
+
+
+class PersistedQueryInvalid(PersistedQueryError):
+    code = "BAD_REQUEST"
+
+
+def get_cache():
+    return caches[graphene_settings.PERSISTED_QUERIES_CACHE_ALIAS]
+
+
+def get_persisted_query_hash(extensions):
+    """ The ``sha256Hash`` of the ``persistedQuery`` extension, None when the
+        request has none
+    """
+    if isinstance(extensions, six.string_types):
+        try:
+            extensions = json.loads(extensions)
+        except ValueError:
+            raise PersistedQueryInvalid("Extensions are invalid JSON.")
+    persisted_query = (extensions or {}).get("persistedQuery")
+    if not persisted_query:
+        return None
+    if persisted_query.get("version") != PERSISTED_QUERY_VERSION:
+        raise PersistedQueryInvalid("Unsupported persisted query version.")
+    sha256_hash = persisted_query.get("sha256Hash")
+    if not isinstance(sha256_hash, six.string_types):
+        raise PersistedQueryInvalid("Persisted query hash is missing.")
+    return sha256_hash.lower()
+
+
+def resolve_persisted_query(query, extensions):
+    """ The query of a request: the one sent, stored under its hash when
+        persisted queries are enabled, or the one stored under the hash sent
+        instead of it
+    """
+    sha256_hash = get_persisted_query_hash(extensions)
+    if sha256_hash is None:
+        return query
+    if not graphene_settings.PERSISTED_QUERIES:
+        if query:
+            return query
+        raise PersistedQueryNotSupported()
+
+    key = PERSISTED_QUERY_KEY.format(sha256_hash)
+    if query:
+        if hashlib.sha256(query.encode("utf-8")).hexdigest() != sha256_hash:
+            raise PersistedQueryInvalid("provided sha does not match query")
+        get_cache().set(key, query, graphene_settings.PERSISTED_QUERIES_TIMEOUT)
+        return query
+
+    query = get_cache().get(key)
+    if query is None:
+        raise PersistedQueryNotFound()
+    return query
@@ -2,6 +2,8 @@ class Registry(object):
     def __init__(self):
         self._registry = {}
         self._field_registry = {}
+        self._filtering_registry = {}
+        self._aggregate_registry = {}
 
     def register(self, cls):
         from .types import DjangoObjectType
@@ -27,6 +29,18 @@ class Registry(object):
     def get_converted_field(self, field):
         return self._field_registry.get(field)
 
+    def register_filtering(self, key, filtering):
+        self._filtering_registry[key] = filtering
+
+    def get_filtering(self, key):
+        return self._filtering_registry.get(key)
+
+    def register_aggregate(self, key, aggregate):
+        self._aggregate_registry[key] = aggregate
+
+    def get_aggregate(self, key):
+        return self._aggregate_registry.get(key)
+
 
 registry = None
 
@@ -41,13 +41,65 @@ DEFAULTS = {
     "DJANGO_CHOICE_FIELD_ENUM_CUSTOM_NAME": None,
     # Use a separate path for handling subscriptions.
     "SUBSCRIPTION_PATH": None,
+    # Load nested lists of all parents with one query per argument set
+    "INNER_LIST_BATCH_LOADING": False,
+    # Read DjangoFilterField totals from a COUNT(*) OVER () on the page query
+    "FILTER_FIELD_WINDOW_TOTAL": False,
+    # Page size of DjangoFilterFields and nested lists when no limit is given
+    "FILTER_FIELD_DEFAULT_LIMIT": None,
+    # Largest limit DjangoFilterFields and nested lists accept
+    "FILTER_FIELD_MAX_LIMIT": None,
+    # Cache DjangoFilterField totals until a table they count is written to
+    "FILTER_FIELD_COUNT_CACHE": False,
+    "FILTER_FIELD_COUNT_CACHE_ALIAS": "default",
+    "FILTER_FIELD_COUNT_CACHE_TIMEOUT": 300,
+    # Cache the table versions the cached counts and scopes are checked against
+    "TABLE_VERSION_CACHE_ALIAS": "default",
+    # Largest ID list filtered with a plain IN (...) of bind parameters
+    "ID_LIST_FILTER_THRESHOLD": 500,
+    # Filter to-many relations with EXISTS subqueries instead of JOIN + DISTINCT
+    "RELATION_FILTER_EXISTS": False,
+    # Apply built-in filters straight to the queryset, without the FilterSet form
+    "FILTERSET_FAST_PATH": True,
+    # Share of filter field calls whose filters and ordering are recorded
+    # for the graphene_filter_indexes command
+    "FILTER_USAGE_SAMPLE_RATE": 0,
+    "FILTER_USAGE_CACHE_ALIAS": "default",
+    # Backend of the `search` argument of types declaring `search_fields`
+    "SEARCH_BACKEND": "graphene_django.filter.search.DatabaseSearchBackend",
+    # Compute the permission_class scope once per request, user and type for
+    # classes not setting cache_scope, which ignores the rest of `info`
+    "PERMISSION_SCOPE_CACHE": False,
+    # Share the scopes of permission classes declaring their dependencies
+    # across requests
+    "PERMISSION_SCOPE_SHARED_CACHE": False,
+    "PERMISSION_SCOPE_CACHE_ALIAS": "default",
+    "PERMISSION_SCOPE_CACHE_TIMEOUT": 300,
+    # Let DjangoFilterFields page through a stored list of the result's IDs
+    "FILTER_FIELD_SNAPSHOT": False,
+    "FILTER_FIELD_SNAPSHOT_CACHE_ALIAS": "default",
+    "FILTER_FIELD_SNAPSHOT_TIMEOUT": 600,
+    # Largest result a snapshot is taken of
+    "FILTER_FIELD_SNAPSHOT_MAX_SIZE": 10000,
+    # Rows GraphQLExportView reads and writes out at a time
+    "EXPORT_CHUNK_SIZE": 1000,
+    # Number of parsed and validated documents GraphQLView keeps, 0 disables
+    # the cache
+    "DOCUMENT_CACHE_SIZE": 1000,
+    # Accept the hashes of automatic persisted queries in place of the queries
+    "PERSISTED_QUERIES": False,
+    "PERSISTED_QUERIES_CACHE_ALIAS": "default",
+    "PERSISTED_QUERIES_TIMEOUT": None,
+    # Threads of the pool shared by the batch views of the process, 0 runs
+    # the entries of a batch in turn
+    "BATCH_MAX_WORKERS": 0,
 }
 
 if settings.DEBUG:
     DEFAULTS["MIDDLEWARE"] += ("graphene_django.debug.DjangoDebugMiddleware",)
 
 # List of settings that may be in string import notation.
-IMPORT_STRINGS = ("MIDDLEWARE", "SCHEMA")
+IMPORT_STRINGS = ("MIDDLEWARE", "SCHEMA", "SEARCH_BACKEND")
 
 
 def perform_import(val, setting_name):
@@ -1,6 +1,8 @@
 import datetime
 from django.db.models import Count
+from django.db.models.query import QuerySet
 
+import mock
 import pytest
 
 from graphene import List, NonNull, ObjectType, Schema, String
@@ -375,3 +377,49 @@ class TestDjangoListField:
                 {"firstName": "Debra", "articles": []},
             ]
         }
+
+    def test_chunked_list_field_streams_rows(self):
+        class ReporterPermission(object):
+            def viewable(self, user, info=None):
+                return ReporterModel.objects.all()
+
+        class Reporter(DjangoObjectType):
+            class Meta:
+                model = ReporterModel
+                fields = ("first_name",)
+                permission_class = ReporterPermission
+                filter_fields = ["first_name"]
+
+        class Query(ObjectType):
+            reporters = DjangoListField(Reporter, chunk_size=2)
+            prefetched_reporters = DjangoListField(Reporter, chunk_size=2)
+
+            def resolve_reporters(self, info):
+                return ReporterModel.objects.order_by("pk")
+
+            def resolve_prefetched_reporters(self, info):
+                return ReporterModel.objects.order_by("pk").prefetch_related("pets")
+
+        schema = Schema(query=Query)
+        for name in ("Tara", "Debra", "Ann"):
+            ReporterModel.objects.create(first_name=name, last_name="West")
+
+        with mock.patch.object(
+            QuerySet, "iterator", autospec=True, side_effect=QuerySet.iterator
+        ) as iterator:
+            result = schema.execute("query { reporters { firstName } }")
+            assert not result.errors
+            assert result.data == {
+                "reporters": [
+                    {"firstName": "Tara"},
+                    {"firstName": "Debra"},
+                    {"firstName": "Ann"},
+                ]
+            }
+            assert iterator.call_args[1] == {"chunk_size": 2}
+
+            iterator.reset_mock()
+            result = schema.execute("query { prefetchedReporters { firstName } }")
+            assert not result.errors
+            assert len(result.data["prefetchedReporters"]) == 3
+            assert not iterator.called
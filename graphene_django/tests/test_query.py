@@ -1314,3 +1314,149 @@ def test_should_preserve_annotations():
         }
     }
     assert result.data == expected, str(result.data)
+
+
+def get_reporter_connection_schema():
+    class ReporterPermission(object):
+        def viewable(self, user, info=None):
+            return Reporter.objects.all()
+
+    class ReporterNode(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            permission_class = ReporterPermission
+            filter_fields = ["first_name"]
+
+    class ReporterConnection(graphene.relay.Connection):
+        total_count = graphene.Int()
+
+        class Meta:
+            node = ReporterNode
+
+        def resolve_total_count(self, info):
+            return self.length
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            permission_class = ReporterPermission
+            filter_fields = ["first_name"]
+            connection = ReporterConnection
+            skip_registry = True
+
+    class Query(graphene.ObjectType):
+        all_reporters = DjangoConnectionField(ReporterType)
+
+        def resolve_all_reporters(self, info, **args):
+            return Reporter.objects.order_by("pk")
+
+    return graphene.Schema(query=Query)
+
+
+def test_connection_skips_count_when_length_is_not_selected(
+    django_assert_num_queries,
+):
+    Reporter.objects.bulk_create([Reporter(**kwargs) for kwargs in REPORTERS])
+
+    schema = get_reporter_connection_schema()
+    query = """
+        query AllReporters($after: String) {
+            allReporters(first: 4, after: $after) {
+                pageInfo { hasNextPage endCursor }
+                edges { node { firstName } }
+            }
+        }
+    """
+
+    # first + 1 rows, no COUNT(*)
+    with django_assert_num_queries(1) as captured:
+        result = schema.execute(query)
+    assert not result.errors
+    assert "COUNT" not in captured.captured_queries[0]["sql"]
+    assert len(result.data["allReporters"]["edges"]) == 4
+    assert result.data["allReporters"]["pageInfo"]["hasNextPage"]
+
+    end_cursor = result.data["allReporters"]["pageInfo"]["endCursor"]
+    with django_assert_num_queries(1):
+        result = schema.execute(query, variable_values={"after": end_cursor})
+    assert not result.errors
+    assert len(result.data["allReporters"]["edges"]) == len(REPORTERS) - 4
+    assert not result.data["allReporters"]["pageInfo"]["hasNextPage"]
+
+    # Fields reading the length still get the count
+    with django_assert_num_queries(2):
+        result = schema.execute(
+            "query { allReporters(first: 2) { totalCount edges { cursor } } }"
+        )
+    assert not result.errors
+    assert result.data["allReporters"]["totalCount"] == len(REPORTERS)
+
+
+def test_connection_fetches_last_records_in_reverse(
+    django_assert_num_queries, graphene_settings
+):
+    graphene_settings.RELAY_CONNECTION_MAX_LIMIT = None
+    Reporter.objects.bulk_create([Reporter(**kwargs) for kwargs in REPORTERS])
+    schema = get_reporter_connection_schema()
+
+    result = schema.execute(
+        "query { allReporters(first: 10) { edges { cursor node { firstName } } } }"
+    )
+    assert not result.errors
+    forward_edges = result.data["allReporters"]["edges"]
+
+    query = """
+        query {
+            allReporters(last: 2) {
+                pageInfo { hasPreviousPage hasNextPage startCursor }
+                edges { cursor node { firstName } }
+            }
+        }
+    """
+    # The reversed page and the count the cursors are offsets from
+    with django_assert_num_queries(2) as captured:
+        result = schema.execute(query)
+    assert not result.errors
+    assert not any("OFFSET" in query["sql"] for query in captured.captured_queries)
+    assert result.data["allReporters"] == {
+        "pageInfo": {
+            "hasPreviousPage": True,
+            "hasNextPage": False,
+            "startCursor": forward_edges[-2]["cursor"],
+        },
+        "edges": forward_edges[-2:],
+    }
+
+    with django_assert_num_queries(1):
+        result = schema.execute(
+            "query { allReporters(last: 10) { pageInfo { hasPreviousPage } "
+            "edges { node { firstName } } } }"
+        )
+    assert not result.errors
+    assert not result.data["allReporters"]["pageInfo"]["hasPreviousPage"]
+    assert [edge["node"] for edge in result.data["allReporters"]["edges"]] == [
+        edge["node"] for edge in forward_edges
+    ]
+
+
+def test_connection_pages_last_records_inside_max_limit(graphene_settings):
+    graphene_settings.RELAY_CONNECTION_MAX_LIMIT = 4
+    Reporter.objects.bulk_create([Reporter(**kwargs) for kwargs in REPORTERS])
+    schema = get_reporter_connection_schema()
+
+    result = schema.execute("query { allReporters { edges { cursor } } }")
+    assert not result.errors
+    forward_edges = result.data["allReporters"]["edges"]
+    assert len(forward_edges) == 4
+
+    # The last records of the first max limit ones, not of the whole list
+    result = schema.execute(
+        "query { allReporters(last: 2) { pageInfo { hasPreviousPage } "
+        "edges { cursor } } }"
+    )
+    assert not result.errors
+    assert result.data["allReporters"] == {
+        "pageInfo": {"hasPreviousPage": True},
+        "edges": forward_edges[-2:],
+    }
@@ -1,6 +1,22 @@
+import hashlib
 import json
+import threading
+import traceback
 
+import mock
 import pytest
+from graphql import get_default_backend
+from graphql.error import GraphQLError
+from graphql.validation import validate
+
+from django.core.cache import caches
+from django.test import RequestFactory
+from django.utils import timezone, translation
+
+import graphene
+
+from ..document_cache import get_document_cache
+from ..views import GraphQLView, get_batch_executor
 
 try:
     from urllib import urlencode
@@ -558,3 +574,224 @@ def test_passes_request_into_context_request(client):
 
     assert response.status_code == 200
     assert response_json(response) == {"data": {"request": "testing"}}
+
+
+@pytest.fixture
+def document_cache():
+    cache = get_document_cache()
+    cache.clear()
+    return cache
+
+
+def test_caches_documents(client, document_cache):
+    for _ in range(2):
+        response = client.get(url_string(query="{test}"))
+        assert response.status_code == 200
+        assert response_json(response) == {"data": {"test": "Hello World"}}
+
+    info = document_cache.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+
+def test_caches_validation_and_syntax_errors(client, document_cache):
+    with mock.patch(
+        "graphene_django.document_cache.validate", wraps=validate
+    ) as validate_mock:
+        for _ in range(2):
+            response = client.get(url_string(query="{unknown}"))
+            assert response.status_code == 400
+            assert "Cannot query field" in response_json(response)["errors"][0]["message"]
+    assert validate_mock.call_count == 1
+
+    for _ in range(2):
+        response = client.get(url_string(query="syntaxerror"))
+        assert response.status_code == 400
+    assert document_cache.cache_info().hits == 2
+
+
+def test_document_cache_raises_fresh_errors(document_cache):
+    from .schema_view import schema
+
+    backend = get_default_backend()
+    errors = []
+    for _ in range(3):
+        with pytest.raises(GraphQLError) as exc_info:
+            document_cache.get_document(backend, schema, "syntaxerror")
+        errors.append(exc_info.value)
+    assert len(set(map(id, errors))) == 3
+    assert len({len(traceback.extract_tb(e.__traceback__)) for e in errors}) == 1
+    assert errors[0].message == errors[2].message
+    assert errors[0].locations == errors[2].locations
+
+
+def test_document_cache_evicts_least_recently_used(
+    client, graphene_settings, document_cache
+):
+    graphene_settings.DOCUMENT_CACHE_SIZE = 2
+    cache = get_document_cache()
+    for who in ("a", "b", "a", "c", "a", "b"):
+        client.get(url_string(query='{test(who: "%s")}' % who))
+    # "b" was evicted by "c", "a" was kept by its uses
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 4, 2)
+
+
+@pytest.fixture
+def persisted_queries(graphene_settings):
+    graphene_settings.PERSISTED_QUERIES = True
+    caches[graphene_settings.PERSISTED_QUERIES_CACHE_ALIAS].clear()
+
+
+def persisted_query_extensions(query):
+    sha256_hash = hashlib.sha256(query.encode("utf-8")).hexdigest()
+    return {"persistedQuery": {"version": 1, "sha256Hash": sha256_hash}}
+
+
+def test_persisted_query_is_registered_then_sent_as_hash(client, persisted_queries):
+    query = "{test}"
+    extensions = json.dumps(persisted_query_extensions(query))
+
+    response = client.get(url_string(extensions=extensions))
+    assert response.status_code == 200
+    assert response_json(response) == {
+        "errors": [
+            {
+                "message": "PersistedQueryNotFound",
+                "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"},
+            }
+        ]
+    }
+
+    response = client.post(
+        url_string(),
+        j(query=query, extensions=persisted_query_extensions(query)),
+        "application/json",
+    )
+    assert response_json(response) == {"data": {"test": "Hello World"}}
+
+    response = client.get(url_string(extensions=extensions))
+    assert response.status_code == 200
+    assert response_json(response) == {"data": {"test": "Hello World"}}
+
+
+def test_persisted_query_rejects_hash_mismatch(client, persisted_queries):
+    response = client.post(
+        url_string(),
+        j(query="{test}", extensions=persisted_query_extensions("{other}")),
+        "application/json",
+    )
+    assert response.status_code == 400
+    assert response_json(response)["errors"][0]["message"] == (
+        "provided sha does not match query"
+    )
+
+
+def test_persisted_query_not_supported_when_disabled(client):
+    extensions = json.dumps(persisted_query_extensions("{test}"))
+    response = client.get(url_string(extensions=extensions))
+    assert response_json(response)["errors"][0]["message"] == (
+        "PersistedQueryNotSupported"
+    )
+
+    # The query is run when it is sent along
+    response = client.get(url_string(query="{test}", extensions=extensions))
+    assert response_json(response) == {"data": {"test": "Hello World"}}
+
+
+# Tests run in a transaction, which batches fall back to running in turn in
+@mock.patch("graphene_django.views.in_atomic_block", return_value=False)
+def test_batch_entries_run_concurrently_in_order(in_atomic_block):
+    barrier = threading.Barrier(2, timeout=5)
+    events = []
+
+    class Query(graphene.ObjectType):
+        wait = graphene.String(name=graphene.String())
+
+        def resolve_wait(self, info, name):
+            # Both queries of a run have to be in flight at once
+            barrier.wait()
+            events.append(name)
+            info.context.resolved = name
+            return name
+
+    class Mutation(graphene.ObjectType):
+        write = graphene.String()
+
+        def resolve_write(self, info):
+            events.append("write")
+            return threading.current_thread().name
+
+    schema = graphene.Schema(query=Query, mutation=Mutation)
+    view = GraphQLView.as_view(schema=schema, batch=True, batch_workers=4)
+    batch = [
+        {"id": 1, "query": '{wait(name: "a")}'},
+        {"id": 2, "query": '{wait(name: "b")}'},
+        {"id": 3, "query": "mutation {write}"},
+        {"id": 4, "query": '{wait(name: "c")}'},
+        {"id": 5, "query": '{wait(name: "d")}'},
+    ]
+    request = RequestFactory().post(
+        "/graphql", json.dumps(batch), content_type="application/json"
+    )
+    response = view(request)
+
+    assert [entry["id"] for entry in response_json(response)] == [1, 2, 3, 4, 5]
+    assert [entry["data"] for entry in response_json(response)] == [
+        {"wait": "a"},
+        {"wait": "b"},
+        {"write": threading.current_thread().name},
+        {"wait": "c"},
+        {"wait": "d"},
+    ]
+    # The mutation runs alone, between the queries around it
+    assert set(events[:2]) == {"a", "b"}
+    assert events[2] == "write"
+    assert set(events[3:]) == {"c", "d"}
+    # Every entry got its own request
+    assert not hasattr(request, "resolved")
+
+
+def get_thread_state_view():
+    class Query(graphene.ObjectType):
+        state = graphene.List(graphene.String)
+
+        def resolve_state(self, info):
+            return [
+                threading.current_thread().name,
+                translation.get_language(),
+                timezone.get_current_timezone_name(),
+                info.context.user.username,
+                str(info.context.user is info.context._original_user),
+            ]
+
+    schema = graphene.Schema(query=Query)
+    return GraphQLView.as_view(schema=schema, batch=True, batch_workers=2)
+
+
+def post_state_batch(view):
+    request = RequestFactory().post(
+        "/graphql",
+        json.dumps([{"id": i, "query": "{state}"} for i in range(3)]),
+        content_type="application/json",
+    )
+    request.user = request._original_user = mock.Mock(username="alice")
+    with translation.override("fr"), timezone.override("Europe/Paris"):
+        response = view(request)
+    return [entry["data"]["state"] for entry in response_json(response)]
+
+
+@mock.patch("graphene_django.views.in_atomic_block", return_value=False)
+def test_batch_entries_keep_the_request_state(in_atomic_block):
+    states = post_state_batch(get_thread_state_view())
+    for thread_name, *state in states:
+        assert thread_name.startswith("graphene-batch")
+        # Every entry got its own copy of the user
+        assert state == ["fr", "Europe/Paris", "alice", "False"]
+    # The pool is shared by the batches of the process
+    assert get_batch_executor(2) is get_batch_executor(2)
+
+
+@pytest.mark.django_db
+def test_batch_entries_run_in_turn_inside_transactions():
+    states = post_state_batch(get_thread_state_view())
+    assert {state[0] for state in states} == {threading.current_thread().name}
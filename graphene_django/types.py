@@ -140,6 +140,10 @@ class DjangoObjectTypeOptions(ObjectTypeOptions):
 
     filter_fields = ()
     filterset_class = None
+    default_limit = None  # type: int
+    max_limit = None  # type: int
+    aggregate_fields = ()
+    search_fields = ()
 
 
 class DjangoObjectType(ObjectType):
@@ -149,6 +153,10 @@ class DjangoObjectType(ObjectType):
         model=None,
         permission_class=None,
         order_fields=None,
+        default_limit=None,
+        max_limit=None,
+        aggregate_fields=None,
+        search_fields=None,
         registry=None,
         skip_registry=False,
         only_fields=None,  # deprecated in favour of `fields`
@@ -245,6 +253,10 @@ class DjangoObjectType(ObjectType):
         _meta.connection = connection
         _meta.filterset_class = filterset_class
         _meta.order_fields = order_fields if order_fields else ['id']
+        _meta.default_limit = default_limit
+        _meta.max_limit = max_limit
+        _meta.aggregate_fields = tuple(aggregate_fields or ())
+        _meta.search_fields = tuple(search_fields or ())
 
         interfaces = (DjangoNode, )
         _meta.permission_class = permission_class
@@ -1,3 +1,4 @@
+from .selection import get_sub_fields, is_field_selected
 from .testing import GraphQLTestCase
 from .utils import (
     DJANGO_FILTER_INSTALLED,
@@ -17,5 +18,7 @@ __all__ = [
     "camelize",
     "is_valid_django_model",
     "import_single_dispatch",
+    "get_sub_fields",
+    "is_field_selected",
     "GraphQLTestCase",
 ]
@@ -0,0 +1,91 @@
+from graphql_relay.connection.arrayconnection import (
+    get_offset_with_default,
+    offset_to_cursor,
+)
+from graphql_relay.connection.connectiontypes import Connection, Edge, PageInfo
+
+
+class SlotEdge(object):
+    """ Edge of a connection holding only its node and offset, the cursor is
+        encoded when it is read
+    """
+
+    __slots__ = ("node", "offset")
+
+    def __init__(self, node, offset):
+        self.node = node
+        self.offset = offset
+
+    @property
+    def cursor(self):
+        return offset_to_cursor(self.offset)
+
+
+def has_plain_edges(edge_type):
+    """ Whether the edges are plain ``node`` and ``cursor`` pairs, which can
+        be built as ``SlotEdge`` instead of ``edge_type`` instances
+    """
+    fields = getattr(getattr(edge_type, "_meta", None), "fields", None)
+    return fields is not None and set(fields) == {"node", "cursor"}
+
+
+def connection_from_list_slice(
+    list_slice,
+    args=None,
+    connection_type=None,
+    edge_type=None,
+    pageinfo_type=None,
+    slice_start=0,
+    list_length=0,
+    list_slice_length=None,
+):
+    """ ``graphql_relay``'s ``connection_from_list_slice``, with the same
+        output, building ``SlotEdge`` edges for plain edge types and the page
+        info from the offsets rather than from the edges
+    """
+    connection_type = connection_type or Connection
+    edge_type = edge_type or Edge
+    pageinfo_type = pageinfo_type or PageInfo
+
+    args = args or {}
+
+    before = args.get("before")
+    after = args.get("after")
+    first = args.get("first")
+    last = args.get("last")
+    if list_slice_length is None:
+        list_slice_length = len(list_slice)
+    slice_end = slice_start + list_slice_length
+    before_offset = get_offset_with_default(before, list_length)
+    after_offset = get_offset_with_default(after, -1)
+
+    start_offset = max(slice_start - 1, after_offset, -1) + 1
+    end_offset = min(slice_end, before_offset, list_length)
+    if isinstance(first, int):
+        end_offset = min(end_offset, start_offset + first)
+    if isinstance(last, int):
+        start_offset = max(start_offset, end_offset - last)
+
+    # If supplied slice is too large, trim it down before mapping over it
+    nodes = list_slice[
+        max(start_offset - slice_start, 0) : list_slice_length - (slice_end - end_offset)
+    ]
+    if has_plain_edges(edge_type):
+        edges = [SlotEdge(node, start_offset + i) for i, node in enumerate(nodes)]
+    else:
+        edges = [
+            edge_type(node=node, cursor=offset_to_cursor(start_offset + i))
+            for i, node in enumerate(nodes)
+        ]
+
+    lower_bound = after_offset + 1 if after else 0
+    upper_bound = before_offset if before else list_length
+    return connection_type(
+        edges=edges,
+        page_info=pageinfo_type(
+            start_cursor=offset_to_cursor(start_offset) if edges else None,
+            end_cursor=offset_to_cursor(start_offset + len(edges) - 1) if edges else None,
+            has_previous_page=isinstance(last, int) and start_offset > lower_bound,
+            has_next_page=isinstance(first, int) and end_offset < upper_bound,
+        ),
+    )
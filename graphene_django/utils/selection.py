@@ -0,0 +1,69 @@
+from collections import OrderedDict
+
+from graphql.language import ast
+
+
+def get_response_key(field_ast):
+    """ The key a field is returned under: its alias, or its name """
+    return field_ast.alias.value if field_ast.alias else field_ast.name.value
+
+
+def iter_selected_fields(selections, fragments):
+    """ Yield the field nodes of a list of selections, expanding inline
+        fragments and fragment spreads along the way
+    """
+    for selection in selections:
+        if isinstance(selection, ast.Field):
+            yield selection
+        elif isinstance(selection, ast.FragmentSpread):
+            fragment = fragments.get(selection.name.value)
+            if fragment is not None:
+                for field_ast in iter_selected_fields(
+                    fragment.selection_set.selections, fragments
+                ):
+                    yield field_ast
+        elif isinstance(selection, ast.InlineFragment):
+            for field_ast in iter_selected_fields(
+                selection.selection_set.selections, fragments
+            ):
+                yield field_ast
+
+
+def get_sub_fields(field_asts, fragments):
+    """ Group the sub-fields selected under ``field_asts`` by response key,
+        so that aliased selections of the same field stay apart while
+        duplicated selections (through fragments) are merged
+    """
+    sub_fields = OrderedDict()
+    for field_ast in field_asts:
+        if not field_ast.selection_set:
+            continue
+        for sub_field in iter_selected_fields(
+            field_ast.selection_set.selections, fragments
+        ):
+            sub_fields.setdefault(get_response_key(sub_field), []).append(sub_field)
+    return sub_fields
+
+
+def get_sub_field_asts(field_asts, fragments, name):
+    """ Return every node selecting the field ``name`` below ``field_asts``,
+        whatever its alias
+    """
+    return [
+        sub_field
+        for sub_fields in get_sub_fields(field_asts, fragments).values()
+        for sub_field in sub_fields
+        if sub_field.name.value == name
+    ]
+
+
+def is_field_selected(info, *path):
+    """ Check whether the field path (GraphQL names, e.g. ``"pageInfo",
+        "total"``) is selected below the field being resolved
+    """
+    field_asts = info.field_asts
+    for name in path:
+        field_asts = get_sub_field_asts(field_asts, info.fragments, name)
+        if not field_asts:
+            return False
+    return True
@@ -0,0 +1,91 @@
+import pytest
+from graphql_relay.connection.arrayconnection import (
+    connection_from_list_slice as relay_connection_from_list_slice,
+    offset_to_cursor,
+)
+
+import graphene
+from graphene.relay import Connection, PageInfo
+
+from ..connection import SlotEdge, connection_from_list_slice
+
+
+class Letter(graphene.ObjectType):
+    value = graphene.String()
+
+
+class LetterConnection(Connection):
+    class Meta:
+        node = Letter
+
+
+LETTERS = list("abcdefgh")
+
+
+def as_data(connection):
+    page_info = connection.page_info
+    return {
+        "edges": [(edge.node, edge.cursor) for edge in connection.edges],
+        "page_info": (
+            page_info.start_cursor,
+            page_info.end_cursor,
+            page_info.has_previous_page,
+            page_info.has_next_page,
+        ),
+    }
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        {},
+        {"first": 3},
+        {"first": 20},
+        {"last": 2},
+        {"first": 2, "after": offset_to_cursor(2)},
+        {"last": 2, "before": offset_to_cursor(6)},
+        {"first": 3, "after": offset_to_cursor(6)},
+        {"first": 0},
+    ],
+)
+@pytest.mark.parametrize("slice_start", [0, 2])
+def test_connection_from_list_slice_matches_graphql_relay(args, slice_start):
+    kwargs = dict(
+        args=args,
+        connection_type=LetterConnection,
+        edge_type=LetterConnection.Edge,
+        pageinfo_type=PageInfo,
+        slice_start=slice_start,
+        list_length=len(LETTERS),
+    )
+    letters = LETTERS[slice_start:]
+    connection = connection_from_list_slice(letters, **kwargs)
+    assert all(isinstance(edge, SlotEdge) for edge in connection.edges)
+    assert as_data(connection) == as_data(
+        relay_connection_from_list_slice(letters, **kwargs)
+    )
+
+
+def test_connection_from_list_slice_keeps_custom_edges():
+    class ScoredLetterConnection(Connection):
+        class Meta:
+            node = Letter
+
+        class Edge:
+            score = graphene.Int()
+
+    connection = connection_from_list_slice(
+        LETTERS,
+        {"first": 2},
+        connection_type=ScoredLetterConnection,
+        edge_type=ScoredLetterConnection.Edge,
+        pageinfo_type=PageInfo,
+        list_length=len(LETTERS),
+    )
+    assert all(
+        isinstance(edge, ScoredLetterConnection.Edge) for edge in connection.edges
+    )
+    assert [edge.cursor for edge in connection.edges] == [
+        offset_to_cursor(0),
+        offset_to_cursor(1),
+    ]
@@ -1,11 +1,17 @@
+import copy
 import inspect
 import json
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import six
-from django.http import HttpResponse, HttpResponseNotAllowed
+from django.db import close_old_connections, connections
+from django.http import HttpResponse, HttpResponseNotAllowed, StreamingHttpResponse
 from django.http.response import HttpResponseBadRequest
 from django.shortcuts import render
+from django.urls import get_urlconf, set_urlconf
+from django.utils import timezone, translation
 from django.utils.decorators import method_decorator
 from django.views.generic import View
 from django.views.decorators.csrf import ensure_csrf_cookie
@@ -17,6 +23,9 @@ from graphql.execution import ExecutionResult
 from graphql.type.schema import GraphQLSchema
 from graphql.execution.middleware import MiddlewareManager
 
+from .document_cache import get_document_cache
+from .export import EXPORT_WINDOW_ATTR, ExportWindow
+from .persisted_queries import PersistedQueryError, resolve_persisted_query
 from .settings import graphene_settings
 
 
@@ -43,6 +52,31 @@ def get_accepted_content_types(request):
     )
 
 
+_batch_executors = {}
+_batch_executors_lock = threading.Lock()
+
+
+def get_batch_executor(max_workers):
+    """ The pool of ``max_workers`` threads shared by the batch views of the
+        process, so that concurrent batches do not add up threads and
+        database connections
+    """
+    with _batch_executors_lock:
+        executor = _batch_executors.get(max_workers)
+        if executor is None:
+            executor = _batch_executors[max_workers] = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="graphene-batch"
+            )
+        return executor
+
+
+def in_atomic_block():
+    """ Whether the request runs in a transaction, which the threads of a
+        batch would not be part of
+    """
+    return any(connection.in_atomic_block for connection in connections.all())
+
+
 def instantiate_middleware(middlewares):
     for middleware in middlewares:
         if inspect.isclass(middleware):
@@ -82,6 +116,8 @@ class GraphQLView(View):
     root_value = None
     pretty = False
     batch = False
+    batch_workers = None
+    batch_serial_mutations = True
     subscription_path = None
 
     def __init__(
@@ -95,6 +131,8 @@ class GraphQLView(View):
         batch=False,
         backend=None,
         subscription_path=None,
+        batch_workers=None,
+        batch_serial_mutations=None,
     ):
         if not schema:
             schema = graphene_settings.SCHEMA
@@ -116,6 +154,12 @@ class GraphQLView(View):
         self.pretty = self.pretty or pretty
         self.graphiql = self.graphiql or graphiql
         self.batch = self.batch or batch
+        if batch_workers is not None:
+            self.batch_workers = batch_workers
+        elif self.batch_workers is None:
+            self.batch_workers = graphene_settings.BATCH_MAX_WORKERS
+        if batch_serial_mutations is not None:
+            self.batch_serial_mutations = batch_serial_mutations
         self.backend = backend
         if subscription_path is None:
             self.subscription_path = graphene_settings.SUBSCRIPTION_PATH
@@ -138,6 +182,14 @@ class GraphQLView(View):
     def get_backend(self, request):
         return self.backend
 
+    def get_document(self, request, query):
+        """ The document of ``query``, from the document cache when enabled """
+        backend = self.get_backend(request)
+        cache = get_document_cache()
+        if cache is None:
+            return backend.document_from_string(self.schema, query)
+        return cache.get_document(backend, self.schema, query)
+
     @method_decorator(ensure_csrf_cookie)
     def dispatch(self, request, *args, **kwargs):
         try:
@@ -170,7 +222,7 @@ class GraphQLView(View):
                 )
 
             if self.batch:
-                responses = [self.get_response(request, entry) for entry in data]
+                responses = self.get_batch_responses(request, data)
                 result = "[{}]".format(
                     ",".join([response[0] for response in responses])
                 )
@@ -194,8 +246,110 @@ class GraphQLView(View):
             )
             return response
 
+    def get_batch_responses(self, request, data):
+        """ The responses of the entries of a batch, in their order.
+
+        With ``batch_workers``, the entries run on the pool of as many threads
+        shared by the process, each with its own copy of the request and the
+        language, timezone and urlconf of the request. Mutations run one at
+        a time, after the entries before them and before the entries after
+        them, unless ``batch_serial_mutations`` is False. Batches of requests
+        running in a transaction, as with ``ATOMIC_REQUESTS``, run in turn.
+        """
+        if not self.batch_workers or len(data) < 2 or in_atomic_block():
+            return [self.get_response(request, entry) for entry in data]
+
+        pool = get_batch_executor(self.batch_workers)
+        state = (translation.get_language(), timezone.get_current_timezone(), get_urlconf())
+        responses = [None] * len(data)
+        for concurrent, indexes in self.get_batch_segments(request, data):
+            if not concurrent:
+                for i in indexes:
+                    responses[i] = self.get_response(
+                        self.get_entry_request(request), data[i]
+                    )
+                continue
+            futures = [
+                (
+                    i,
+                    pool.submit(
+                        self.get_thread_response,
+                        self.get_entry_request(request),
+                        data[i],
+                        *state
+                    ),
+                )
+                for i in indexes
+            ]
+            for i, future in futures:
+                responses[i] = future.result()
+        return responses
+
+    def get_entry_request(self, request):
+        """ The copy of ``request`` an entry of a batch runs with, with its own
+            ``META`` and user. The session is shared so that the changes of
+            every entry are saved with the response.
+        """
+        entry_request = copy.copy(request)
+        entry_request.META = request.META.copy()
+        user = getattr(request, "user", None)
+        if user is not None:
+            # Load a lazy user here rather than once per thread, copying it
+            # then copies the user it wraps
+            getattr(user, "pk", None)
+            entry_request.user = entry_request._cached_user = copy.copy(user)
+        session = getattr(request, "session", None)
+        if session is not None:
+            session.keys()
+        return entry_request
+
+    def get_batch_segments(self, request, data):
+        """ Split the entries of a batch into runs that can be executed
+            concurrently and single mutations
+        """
+        segments = []
+        for i, entry in enumerate(data):
+            concurrent = not (
+                self.batch_serial_mutations and self.is_mutation(request, entry)
+            )
+            if concurrent and segments and segments[-1][0]:
+                segments[-1][1].append(i)
+            else:
+                segments.append((concurrent, [i]))
+        return segments
+
+    def is_mutation(self, request, data):
+        try:
+            query, _, operation_name, _ = self.get_graphql_params(request, data)
+            document = self.get_document(request, query)
+        except Exception:
+            # Reported by the execution
+            return False
+        return document.get_operation_type(operation_name) == "mutation"
+
+    def get_thread_response(self, request, data, language, tz, urlconf):
+        # The connections of the thread are kept for CONN_MAX_AGE like the
+        # ones of request threads
+        close_old_connections()
+        set_urlconf(urlconf)
+        try:
+            with translation.override(language), timezone.override(tz):
+                return self.get_response(request, data)
+        finally:
+            set_urlconf(None)
+            close_old_connections()
+
     def get_response(self, request, data, show_graphiql=False):
-        query, variables, operation_name, id = self.get_graphql_params(request, data)
+        try:
+            query, variables, operation_name, id = self.get_graphql_params(
+                request, data
+            )
+        except PersistedQueryError as e:
+            response = {"errors": [self.format_error(e)]}
+            if self.batch:
+                response["id"] = data.get("id")
+                response["status"] = e.status_code
+            return self.json_encode(request, response), e.status_code
 
         execution_result = self.execute_graphql_request(
             request, data, query, variables, operation_name, show_graphiql
@@ -283,8 +437,7 @@ class GraphQLView(View):
             raise HttpError(HttpResponseBadRequest("Must provide query string."))
 
         try:
-            backend = self.get_backend(request)
-            document = backend.document_from_string(self.schema, query)
+            document = self.get_document(request, query)
         except Exception as e:
             return ExecutionResult(errors=[e], invalid=True)
 
@@ -350,6 +503,8 @@ class GraphQLView(View):
         query = request.GET.get("query") or data.get("query")
         variables = request.GET.get("variables") or data.get("variables")
         id = request.GET.get("id") or data.get("id")
+        extensions = request.GET.get("extensions") or data.get("extensions")
+        query = resolve_persisted_query(query, extensions)
 
         if variables and isinstance(variables, six.text_type):
             try:
@@ -375,3 +530,148 @@ class GraphQLView(View):
         meta = request.META
         content_type = meta.get("CONTENT_TYPE", meta.get("HTTP_CONTENT_TYPE", ""))
         return content_type.split(";", 1)[0].lower()
+
+
+class GraphQLExportView(GraphQLView):
+    """ Stream the objects of the ``DjangoFilterField`` a query selects as
+        newline delimited JSON, one object per line.
+
+    The query is executed once per chunk of ``chunk_size`` rows, each chunk
+    seeking past the last row of the previous one on the requested ordering,
+    so the filters, ordering, permissions and middleware are applied as for
+    ``GraphQLView`` while only one chunk is held in memory. The requested
+    ``limit``, ``offset`` and cursors are ignored. An error in a later chunk
+    ends the stream with an ``{"errors": [...]}`` line.
+    """
+
+    chunk_size = None
+
+    def __init__(self, chunk_size=None, **kwargs):
+        super(GraphQLExportView, self).__init__(**kwargs)
+        self.chunk_size = (
+            chunk_size or self.chunk_size or graphene_settings.EXPORT_CHUNK_SIZE
+        )
+
+    def get_context(self, request):
+        context = super(GraphQLExportView, self).get_context(request)
+        setattr(context, EXPORT_WINDOW_ATTR, getattr(request, EXPORT_WINDOW_ATTR))
+        return context
+
+    @method_decorator(ensure_csrf_cookie)
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            if request.method.lower() not in ("get", "post"):
+                raise HttpError(
+                    HttpResponseNotAllowed(
+                        ["GET", "POST"], "GraphQL only supports GET and POST requests."
+                    )
+                )
+
+            data = self.parse_body(request)
+            try:
+                query, variables, operation_name, id = self.get_graphql_params(
+                    request, data
+                )
+            except PersistedQueryError as e:
+                return HttpResponse(
+                    status=e.status_code,
+                    content=self.json_encode(request, {"errors": [self.format_error(e)]}),
+                    content_type="application/json",
+                )
+            self.check_query(request, query, operation_name)
+
+            window = ExportWindow(self.chunk_size)
+            setattr(request, EXPORT_WINDOW_ATTR, window)
+            execution_result = self.execute_graphql_request(
+                request, data, query, variables, operation_name
+            )
+            if execution_result.errors or execution_result.invalid:
+                response = {
+                    "errors": [self.format_error(e) for e in execution_result.errors]
+                }
+                return HttpResponse(
+                    status=400 if execution_result.invalid else 200,
+                    content=self.json_encode(request, response),
+                    content_type="application/json",
+                )
+            if window.page is None or self.get_objects(execution_result) is None:
+                raise HttpError(
+                    HttpResponseBadRequest(
+                        "An export query must select a single DjangoFilterField."
+                    )
+                )
+
+            return StreamingHttpResponse(
+                self.stream(
+                    request, data, query, variables, operation_name, execution_result
+                ),
+                content_type="application/x-ndjson",
+            )
+
+        except HttpError as e:
+            response = e.response
+            response["Content-Type"] = "application/json"
+            response.content = self.json_encode(
+                request, {"errors": [self.format_error(e)]}
+            )
+            return response
+
+    def check_query(self, request, query, operation_name):
+        """ Only export queries, mutations would run once per chunk """
+        if not query:
+            raise HttpError(HttpResponseBadRequest("Must provide query string."))
+        try:
+            document = self.get_document(request, query)
+        except Exception:
+            # Reported by the execution
+            return
+        operation_type = document.get_operation_type(operation_name)
+        if operation_type and operation_type != "query":
+            raise HttpError(
+                HttpResponseNotAllowed(
+                    ["GET", "POST"],
+                    "Can only export the result of a query, not a {}.".format(
+                        operation_type
+                    ),
+                )
+            )
+
+    def stream(self, request, data, query, variables, operation_name, execution_result):
+        window = getattr(request, EXPORT_WINDOW_ATTR)
+        while True:
+            if execution_result.errors or execution_result.invalid:
+                yield self.encode_line(
+                    {"errors": [self.format_error(e) for e in execution_result.errors]}
+                )
+                return
+
+            for row in self.get_objects(execution_result):
+                yield self.encode_line(row)
+            # Let the rows of the chunk go before fetching the next one
+            execution_result = None
+
+            try:
+                if not window.advance():
+                    return
+            except GraphQLError as e:
+                yield self.encode_line({"errors": [self.format_error(e)]})
+                return
+            execution_result = self.execute_graphql_request(
+                request, data, query, variables, operation_name
+            )
+
+    @staticmethod
+    def get_objects(execution_result):
+        """ The ``objects`` of the single field of the result, None for other
+            results
+        """
+        if len(execution_result.data) != 1:
+            return None
+        (result,) = execution_result.data.values()
+        if not isinstance(result, dict):
+            return None
+        return result.get("objects")
+
+    @staticmethod
+    def encode_line(data):
+        return json.dumps(data, separators=(",", ":")) + "\n"